@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the import time of the public packages.
+
+Each scenario runs in a fresh interpreter under ``python -X importtime``,
+and the cumulative times of the top-level imports it reports are summed.
+The median of several runs is printed, along with whether the scenario
+loaded the clients and ``grpc.experimental.aio``.
+
+``-X importtime`` does not report modules loaded through
+:func:`importlib.import_module`, as lazy exports are, although it does
+report everything they import: only the time spent in their own bodies is
+missing. Usage::
+
+    python benchmarks/import_time.py [RUNS]
+"""
+
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = (
+    ("types only", "from google.cloud.notebooks import Instance"),
+    ("path helper", "from google.cloud.notebooks import NotebookServiceClient"),
+    (
+        "everything",
+        "from google.cloud.notebooks import NotebookServiceClient, "
+        "NotebookServiceAsyncClient",
+    ),
+)
+
+WATCHED = (
+    "google.cloud.notebooks_v1beta1.services.notebook_service.client",
+    "google.cloud.notebooks_v1beta1.services.notebook_service.async_client",
+    "grpc.experimental.aio",
+)
+
+# Print which watched modules were loaded.
+PROBE = "\nimport sys\nprint(*(m for m in {0!r} if m in sys.modules))".format(WATCHED)
+
+
+def import_time(code):
+    """Return the import time in microseconds, and the watched modules loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + PROBE],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    total = 0
+    modules = set(result.stdout.split())
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # Nested imports are indented; only count the top level ones.
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("{0:<12} {1:>10}  {2}".format("scenario", "median ms", "loaded"))
+    for label, code in SCENARIOS:
+        times = []
+        for _ in range(runs):
+            total, modules = import_time(code)
+            times.append(total)
+        loaded = [name.rsplit(".", 1)[-1] for name in WATCHED if name in modules]
+        print(
+            "{0:<12} {1:>10.1f}  {2}".format(
+                label, statistics.median(times) / 1000, ", ".join(loaded) or "-"
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
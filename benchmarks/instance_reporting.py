@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the RPCs and CPU time of many agents reporting instance info.
+
+Simulates AGENTS on-VM agents ticking ROUNDS times, five simulated seconds
+apart, against a local gRPC server started in a subprocess. At every tick
+each agent reads its full metadata, of which CHANGE_RATE of the agents
+have a changed value. A naive agent calls ``report_instance_info`` at
+every tick; the other uses :class:`~.reporting.InstanceReporter` with a
+one-minute heartbeat. Usage::
+
+    python benchmarks/instance_reporting.py [AGENTS] [ROUNDS]
+"""
+
+import concurrent.futures
+import random
+import subprocess
+import sys
+import time
+import types
+
+import grpc
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import reporting
+from google.cloud.notebooks_v1beta1.services.notebook_service.transports import (
+    NotebookServiceGrpcTransport,
+)
+from google.longrunning import operations_pb2
+
+METHOD = "/google.cloud.notebooks.v1beta1.NotebookService/ReportInstanceInfo"
+TICK = 5.0
+CHANGE_RATE = 0.05
+WORKERS = 32
+
+
+def serve():
+    """Run a server answering ReportInstanceInfo, printing its port."""
+    response = operations_pb2.Operation(name="operations/report", done=True)
+    handler = grpc.method_handlers_generic_handler(
+        "google.cloud.notebooks.v1beta1.NotebookService",
+        {
+            "ReportInstanceInfo": grpc.unary_unary_rpc_method_handler(
+                lambda request, context: response,
+                request_deserializer=lambda data: data,
+                response_serializer=operations_pb2.Operation.SerializeToString,
+            )
+        },
+    )
+    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS))
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    print(port, flush=True)
+    sys.stdin.read()
+    server.stop(None)
+
+
+def metadata(agent, version):
+    return {
+        "agent": "notebooks-agent/1.0",
+        "jupyter_version": "2.2.9",
+        "kernel_count": str(version % 4),
+        "last_activity": str(version),
+        "hostname": "nb-{0}".format(agent),
+    }
+
+
+def simulate(client, agents, rounds, use_reporter):
+    rng = random.Random(0)
+    versions = [0] * agents
+    now = [0.0]
+    # Simulated time for the reporters only.
+    reporting.time = types.SimpleNamespace(monotonic=lambda: now[0])
+    reporters = [
+        reporting.InstanceReporter(
+            client,
+            "projects/p/locations/l/instances/nb-{0}".format(agent),
+            "vm-{0}".format(agent),
+            min_interval=TICK,
+            heartbeat=60.0,
+        )
+        for agent in range(agents)
+    ]
+
+    def tick(agent):
+        current = metadata(agent, versions[agent])
+        if use_reporter:
+            reporters[agent].update(current)
+            reporters[agent].report()
+        else:
+            client.report_instance_info(
+                request={
+                    "name": reporters[agent]._name,
+                    "vm_id": "vm-{0}".format(agent),
+                    "metadata": current,
+                }
+            )
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        for _ in range(rounds):
+            for agent in rng.sample(range(agents), int(agents * CHANGE_RATE)):
+                versions[agent] += 1
+            list(executor.map(tick, range(agents)))
+            now[0] += TICK
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    if use_reporter:
+        return sum(reporter.sent for reporter in reporters), cpu, wall
+    return agents * rounds, cpu, wall
+
+
+def main():
+    if sys.argv[1:] == ["--serve"]:
+        return serve()
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    try:
+        port = int(server.stdout.readline())
+        channel = grpc.insecure_channel("127.0.0.1:{0}".format(port))
+        client = NotebookServiceClient(
+            transport=NotebookServiceGrpcTransport(channel=channel)
+        )
+        print("{0} agents, {1} ticks".format(agents, rounds))
+        print(
+            "{0:<10} {1:>8} {2:>12} {3:>10}".format(
+                "agent", "RPCs", "client CPU", "wall"
+            )
+        )
+        for label, use_reporter in (("naive", False), ("reporter", True)):
+            sent, cpu, wall = simulate(client, agents, rounds, use_reporter)
+            print(
+                "{0:<10} {1:>8} {2:>10.2f} s {3:>8.2f} s".format(label, sent, cpu, wall)
+            )
+        channel.close()
+    finally:
+        server.stdin.close()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare the resident size of full ``Instance`` objects and summaries.
+
+Usage::
+
+    python benchmarks/instance_summary_memory.py [COUNT]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import summary
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+
+
+def make_page(count):
+    """Build a serialized ``ListInstancesResponse`` resembling a real fleet."""
+    instances = []
+    for i in range(count):
+        instances.append(
+            instance.Instance(
+                name="projects/p/locations/us-central1-a/instances/nb-{0}".format(i),
+                state=instance.Instance.State.ACTIVE,
+                machine_type="n1-standard-{0}".format(4 << (i % 3)),
+                service_account="notebooks@p.iam.gserviceaccount.com",
+                network="projects/p/global/networks/default",
+                subnet="projects/p/regions/us-central1/subnetworks/default",
+                vm_image=environment.VmImage(
+                    project="deeplearning-platform-release",
+                    image_family="tf2-latest-gpu",
+                ),
+                labels={"team": "team-{0}".format(i % 20), "env": "prod"},
+                metadata={
+                    "proxy-mode": "service_account",
+                    "framework": "TensorFlow:2.3",
+                    "owner": "user-{0}@example.com".format(i),
+                },
+                post_startup_script="gs://bucket/startup.sh",
+                proxy_uri="{0}-dot-us-central1.notebooks.googleusercontent.com".format(
+                    i
+                ),
+                boot_disk_size_gb=100,
+                data_disk_size_gb=100,
+                create_time=timestamp.Timestamp(seconds=1600000000 + i),
+                update_time=timestamp.Timestamp(seconds=1600000000 + i),
+            )
+        )
+    response = service.ListInstancesResponse(instances=instances)
+    return service.ListInstancesResponse.serialize(response)
+
+
+def measure(build, data):
+    gc.collect()
+    tracemalloc.start()
+    result = build(data)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def full_instances(data):
+    response = service.ListInstancesResponse.deserialize(data)
+    return list(response.instances)
+
+
+def summaries(data):
+    return list(summary.summarize(data))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    data = make_page(count)
+
+    full, full_size = measure(full_instances, data)
+    del full
+    compact, compact_size = measure(summaries, data)
+    del compact
+
+    print("instances:          {0}".format(count))
+    print("full Instance:      {0:10.1f} MiB".format(full_size / 2**20))
+    print("InstanceSummary:    {0:10.1f} MiB".format(compact_size / 2**20))
+    print("ratio:              {0:10.1f}x".format(full_size / compact_size))
+
+
+if __name__ == "__main__":
+    main()
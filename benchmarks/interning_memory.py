@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the memory saved by interning strings of decoded pages.
+
+The fixture is split into pages that are decoded independently, as they
+would be when iterating a pager. Usage::
+
+    python benchmarks/interning_memory.py [COUNT] [PAGE_SIZE]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import interning
+from google.cloud.notebooks_v1beta1.services.notebook_service import summary
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf.internal import api_implementation  # type: ignore
+
+
+def make_pages(count, page_size):
+    pages = []
+    for start in range(0, count, page_size):
+        instances = [
+            instance.Instance(
+                name="projects/p/locations/us-central1-a/instances/nb-{0}".format(i),
+                machine_type="n1-standard-{0}".format(4 << (i % 3)),
+                service_account="notebooks@p.iam.gserviceaccount.com",
+                network="projects/p/global/networks/default",
+                subnet="projects/p/regions/us-central1/subnetworks/default",
+                vm_image=environment.VmImage(
+                    project="deeplearning-platform-release",
+                    image_family="tf2-latest-gpu",
+                ),
+                labels={"team": "team-{0}".format(i % 20), "env": "prod"},
+            )
+            for i in range(start, min(start + page_size, count))
+        ]
+        pages.append(
+            service.ListInstancesResponse.serialize(
+                service.ListInstancesResponse(instances=instances)
+            )
+        )
+    return pages
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    pages = make_pages(count, page_size)
+
+    def plain():
+        return [service.ListInstancesResponse.deserialize(p) for p in pages]
+
+    def interned():
+        deserialize = interning.deserializer(
+            service.ListInstancesResponse, interning.InternTable()
+        )
+        return [deserialize(p) for p in pages]
+
+    def summaries():
+        table = interning.InternTable()
+        return list(summary.summarize(pages, intern=table))
+
+    print("protobuf runtime:   {0}".format(api_implementation.Type()))
+    print("instances:          {0} in pages of {1}".format(count, page_size))
+    for label, build in (
+        ("plain decode", plain),
+        ("interned decode", interned),
+        ("interned summaries", summaries),
+    ):
+        result, size = measure(build)
+        del result
+        print("{0:20}{1:10.1f} MiB".format(label + ":", size / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the cost of assembling the request metadata of one call.
+
+Each call needs a routing header for its resource name and the
+``x-goog-api-client`` header of the client info. The names cycle through a
+small set, as in a loop polling a few instances. Usage::
+
+    python benchmarks/metadata_assembly.py [NAMES] [CALLS]
+"""
+
+import itertools
+import sys
+import timeit
+
+from google.api_core import gapic_v1  # type: ignore
+from google.cloud.notebooks_v1beta1.services.notebook_service import routing
+from google.cloud.notebooks_v1beta1.services.notebook_service import version
+
+
+def uncached(names, client_info):
+    for name in names:
+        metadata = tuple(()) + (
+            gapic_v1.routing_header.to_grpc_metadata((("name", name),)),
+        )
+        [client_info.to_grpc_metadata()]
+    return metadata
+
+
+def cached(names, client_info):
+    for name in names:
+        metadata = tuple(()) + (routing.routing_metadata("name", name),)
+        [client_info.to_grpc_metadata()]
+    return metadata
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    names = list(
+        itertools.islice(
+            itertools.cycle(
+                "projects/my-project/locations/us-central1-a/instances/nb-{0}".format(i)
+                for i in range(count)
+            ),
+            calls,
+        )
+    )
+    cases = (
+        ("before", uncached, gapic_v1.client_info.ClientInfo()),
+        ("after", cached, version.client_info()),
+    )
+    for label, assemble, client_info in cases:
+        best = min(
+            timeit.repeat(lambda: assemble(names, client_info), number=1, repeat=5)
+        )
+        print("{0:<7} {1:.2f} us/call".format(label, best / calls * 1e6))
+
+
+if __name__ == "__main__":
+    main()
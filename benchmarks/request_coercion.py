@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the cost of coercing the request argument of a client method.
+
+Compares constructing a new message, as the clients used to, with
+:func:`~.coercion.coerce` for each kind of request argument. Usage::
+
+    python benchmarks/request_coercion.py [CALLS]
+"""
+
+import sys
+import timeit
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import coercion
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+NAME = "projects/my-project/locations/us-central1-a/instances/nb-0"
+
+
+def requests():
+    yield "GetInstanceRequest", service.GetInstanceRequest, (
+        ("message", service.GetInstanceRequest(name=NAME)),
+        ("raw pb2", service.GetInstanceRequest.pb()(name=NAME)),
+        ("dict", {"name": NAME}),
+    )
+    create = service.CreateInstanceRequest(
+        parent="projects/my-project/locations/us-central1-a",
+        instance_id="nb-0",
+        instance=instance.Instance(
+            machine_type="n1-standard-4",
+            labels={"team": "ml-{0}".format(i) for i in range(20)},
+        ),
+    )
+    yield "CreateInstanceRequest", service.CreateInstanceRequest, (
+        ("message", create),
+        ("raw pb2", service.CreateInstanceRequest.pb(create)),
+    )
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("{0:<22} {1:<8} {2:>10} {3:>10}".format("type", "argument", "copy", "coerce"))
+    for type_name, message_type, arguments in requests():
+        for label, request in arguments:
+            copy = min(
+                timeit.repeat(lambda: message_type(request), number=calls, repeat=5)
+            )
+            coerce = min(
+                timeit.repeat(
+                    lambda: coercion.coerce(message_type, request),
+                    number=calls,
+                    repeat=5,
+                )
+            )
+            print(
+                "{0:<22} {1:<8} {2:>7.2f} us {3:>7.2f} us".format(
+                    type_name, label, copy / calls * 1e6, coerce / calls * 1e6
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the cost of building and serializing create_instance requests.
+
+Compares building a full :class:`~.service.CreateInstanceRequest` and
+serializing it, as the transports do, with a
+:class:`~.templates.RequestTemplate` varying only the instance ID. Usage::
+
+    python benchmarks/request_templates.py [CALLS]
+"""
+
+import sys
+import timeit
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+PARENT = "projects/my-project/locations/us-central1-a"
+
+
+def body():
+    return instance.Instance(
+        machine_type="n1-standard-8",
+        vm_image=environment.VmImage(
+            project="deeplearning-platform-release", image_family="tf2-latest-cpu"
+        ),
+        post_startup_script="gs://my-bucket/scripts/startup.sh",
+        service_account="notebooks@my-project.iam.gserviceaccount.com",
+        boot_disk_size_gb=150,
+        network="projects/my-project/global/networks/default",
+        subnet="projects/my-project/regions/us-central1/subnetworks/default",
+        labels={"label-{0}".format(i): "value-{0}".format(i) for i in range(32)},
+        metadata={"key-{0}".format(i): "x" * 64 for i in range(16)},
+    )
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    shared = body()
+    serialize = service.CreateInstanceRequest.serialize
+    send = templates.serializer(service.CreateInstanceRequest)
+    template = templates.RequestTemplate(
+        service.CreateInstanceRequest, parent=PARENT, instance=shared
+    )
+
+    def full():
+        return serialize(
+            service.CreateInstanceRequest(
+                parent=PARENT, instance_id="nb-0", instance=shared
+            )
+        )
+
+    def prepared():
+        return send(template.request(instance_id="nb-0"))
+
+    assert service.CreateInstanceRequest.deserialize(prepared()) == (
+        service.CreateInstanceRequest.deserialize(full())
+    )
+    print("payload: {0} bytes".format(len(full())))
+    for label, func in (("full message", full), ("template", prepared)):
+        elapsed = min(timeit.repeat(func, number=calls, repeat=5))
+        print("{0:<14} {1:>8.2f} us/request".format(label, elapsed / calls * 1e6))
+
+
+if __name__ == "__main__":
+    main()
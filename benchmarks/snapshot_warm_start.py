@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure how fast a restarted service can read a persisted snapshot.
+
+Writes INSTANCES instances to a :class:`~.snapshot.SnapshotStore` file,
+then times reopening it, the first and subsequent reads by name, a full
+listing of the parent and a sweep that changes one percent of the
+records. Usage::
+
+    python benchmarks/snapshot_warm_start.py [INSTANCES]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import snapshot
+from google.cloud.notebooks_v1beta1.types import instance
+from google.protobuf import timestamp_pb2
+
+PARENT = "projects/my-project/locations/us-central1-a"
+
+
+def fleet(count, changed=0):
+    return [
+        instance.Instance(
+            name="{0}/instances/nb-{1}".format(PARENT, i),
+            machine_type="n1-standard-4",
+            labels={"team": "ml", "owner": "user-{0}".format(i % 100)},
+            metadata={"key-{0}".format(k): "x" * 32 for k in range(8)},
+            # One in every hundred instances has a later version.
+            update_time=timestamp_pb2.Timestamp(seconds=1 + changed * (i % 100 == 0)),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    instances = fleet(count)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "snapshot.db")
+        with snapshot.SnapshotStore(path) as store:
+            store.put(instances)
+        print("{0} instances, {1:.1f} MB".format(count, os.path.getsize(path) / 1e6))
+
+        start = time.perf_counter()
+        store = snapshot.SnapshotStore(path)
+        store.get(instances[0].name)
+        print(
+            "open + first get  {0:>8.2f} ms".format((time.perf_counter() - start) * 1e3)
+        )
+
+        names = [message.name for message in instances[:1000]]
+        elapsed = timeit.timeit(lambda: [store.get(name) for name in names], number=5)
+        print("get               {0:>8.2f} us".format(elapsed / 5000 * 1e6))
+
+        start = time.perf_counter()
+        store.list(PARENT)
+        print(
+            "list parent       {0:>8.2f} ms".format((time.perf_counter() - start) * 1e3)
+        )
+
+        swept = fleet(count, changed=1)
+        start = time.perf_counter()
+        diff = store.replace(PARENT, snapshot.INSTANCE, swept)
+        print(
+            "sweep ({0} changed) {1:>7.2f} ms".format(
+                len(diff.changed), (time.perf_counter() - start) * 1e3
+            )
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
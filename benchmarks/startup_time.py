@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Guard the startup cost of the clients against regressions.
+
+Every measurement runs in a fresh interpreter. The import of the client
+modules is timed with ``python -X importtime``, which also shows the chain
+of modules importing ``pkg_resources``, if any. The script fails if one of
+the modules of this package imports it directly, or if the median import takes longer
+than ``MAX_MS``. Resolving the package version is timed both ways for
+reference. Usage::
+
+    python benchmarks/startup_time.py [RUNS] [MAX_MS]
+"""
+
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "google.cloud.notebooks"
+
+IMPORT_CLIENTS = (
+    "import google.cloud.notebooks_v1beta1.services.notebook_service.client\n"
+    "import google.cloud.notebooks_v1beta1.services.notebook_service.async_client\n"
+)
+
+VERSION_LOOKUPS = (
+    (
+        "pkg_resources",
+        "import pkg_resources\n"
+        "pkg_resources.get_distribution('google-cloud-notebooks').version\n",
+    ),
+    (
+        "importlib.metadata",
+        "from importlib import metadata\n"
+        "metadata.version('google-cloud-notebooks')\n",
+    ),
+)
+
+TIMED = (
+    "import time\nstart = time.perf_counter()\n{0}print(time.perf_counter() - start)\n"
+)
+
+
+def import_clients():
+    """Return the import time in microseconds, and the chain of modules
+    importing ``pkg_resources``, innermost first."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CLIENTS],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    total = 0
+    chain = []
+    level = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        indent = len(name) - len(name.lstrip())
+        name = name.strip()
+        if indent == 1:
+            total += int(cumulative)
+        # A module is reported after the modules it imports, which are
+        # indented one level deeper.
+        if name == "pkg_resources" and level is None and not chain:
+            level = indent
+        elif level is not None and indent < level:
+            chain.append(name)
+            level = indent
+    return total, chain
+
+
+def time_lookup(code):
+    output = subprocess.check_output(
+        [sys.executable, "-c", TIMED.format(code)], universal_newlines=True
+    )
+    return float(output) * 1e6
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    max_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 2000.0
+
+    totals = []
+    for _ in range(runs):
+        total, chain = import_clients()
+        totals.append(total)
+    median = statistics.median(totals) / 1000
+    print("import clients: {0:.1f} ms".format(median))
+    print("pkg_resources imported by: {0}".format(" < ".join(chain) or "-"))
+    for label, code in VERSION_LOOKUPS:
+        times = [time_lookup(code) for _ in range(runs)]
+        print(
+            "version via {0}: {1:.1f} ms".format(label, statistics.median(times) / 1000)
+        )
+
+    failures = []
+    if chain and chain[0].startswith(PACKAGE):
+        failures.append("{0} imports pkg_resources".format(chain[0]))
+    if median > max_ms:
+        failures.append("import took {0:.1f} ms > {1:.1f} ms".format(median, max_ms))
+    for failure in failures:
+        print("FAIL: " + failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
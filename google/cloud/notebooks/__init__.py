@@ -15,39 +15,105 @@
 # limitations under the License.
 #
 
-from google.cloud.notebooks_v1beta1.services.notebook_service.async_client import (
-    NotebookServiceAsyncClient,
-)
-from google.cloud.notebooks_v1beta1.services.notebook_service.client import (
-    NotebookServiceClient,
-)
-from google.cloud.notebooks_v1beta1.types.environment import ContainerImage
-from google.cloud.notebooks_v1beta1.types.environment import Environment
-from google.cloud.notebooks_v1beta1.types.environment import VmImage
-from google.cloud.notebooks_v1beta1.types.instance import Instance
-from google.cloud.notebooks_v1beta1.types.service import CreateEnvironmentRequest
-from google.cloud.notebooks_v1beta1.types.service import CreateInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import DeleteEnvironmentRequest
-from google.cloud.notebooks_v1beta1.types.service import DeleteInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import GetEnvironmentRequest
-from google.cloud.notebooks_v1beta1.types.service import GetInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import IsInstanceUpgradeableRequest
-from google.cloud.notebooks_v1beta1.types.service import IsInstanceUpgradeableResponse
-from google.cloud.notebooks_v1beta1.types.service import ListEnvironmentsRequest
-from google.cloud.notebooks_v1beta1.types.service import ListEnvironmentsResponse
-from google.cloud.notebooks_v1beta1.types.service import ListInstancesRequest
-from google.cloud.notebooks_v1beta1.types.service import ListInstancesResponse
-from google.cloud.notebooks_v1beta1.types.service import OperationMetadata
-from google.cloud.notebooks_v1beta1.types.service import RegisterInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import ReportInstanceInfoRequest
-from google.cloud.notebooks_v1beta1.types.service import ResetInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import SetInstanceAcceleratorRequest
-from google.cloud.notebooks_v1beta1.types.service import SetInstanceLabelsRequest
-from google.cloud.notebooks_v1beta1.types.service import SetInstanceMachineTypeRequest
-from google.cloud.notebooks_v1beta1.types.service import StartInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import StopInstanceRequest
-from google.cloud.notebooks_v1beta1.types.service import UpgradeInstanceInternalRequest
-from google.cloud.notebooks_v1beta1.types.service import UpgradeInstanceRequest
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+# Exported names are imported on first access, so that importing this
+# package does not load the clients, transports and grpc until needed.
+_EXPORTS = {
+    "ContainerImage": "google.cloud.notebooks_v1beta1.types.environment",
+    "CreateEnvironmentRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "CreateInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "DeleteEnvironmentRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "DeleteInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "Environment": "google.cloud.notebooks_v1beta1.types.environment",
+    "GetEnvironmentRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "GetInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "Instance": "google.cloud.notebooks_v1beta1.types.instance",
+    "IsInstanceUpgradeableRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "IsInstanceUpgradeableResponse": "google.cloud.notebooks_v1beta1.types.service",
+    "ListEnvironmentsRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "ListEnvironmentsResponse": "google.cloud.notebooks_v1beta1.types.service",
+    "ListInstancesRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "ListInstancesResponse": "google.cloud.notebooks_v1beta1.types.service",
+    "NotebookServiceAsyncClient": "google.cloud.notebooks_v1beta1.services.notebook_service.async_client",
+    "NotebookServiceClient": "google.cloud.notebooks_v1beta1.services.notebook_service.client",
+    "OperationMetadata": "google.cloud.notebooks_v1beta1.types.service",
+    "RegisterInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "ReportInstanceInfoRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "ResetInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "SetInstanceAcceleratorRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "SetInstanceLabelsRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "SetInstanceMachineTypeRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "StartInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "StopInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "UpgradeInstanceInternalRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "UpgradeInstanceRequest": "google.cloud.notebooks_v1beta1.types.service",
+    "VmImage": "google.cloud.notebooks_v1beta1.types.environment",
+}
+
+if TYPE_CHECKING or sys.version_info < (3, 7):  # pragma: NO COVER
+    # Type checkers, and Python 3.6 which lacks module __getattr__, use the
+    # eager imports.
+    from google.cloud.notebooks_v1beta1.services.notebook_service.async_client import (
+        NotebookServiceAsyncClient,
+    )
+    from google.cloud.notebooks_v1beta1.services.notebook_service.client import (
+        NotebookServiceClient,
+    )
+    from google.cloud.notebooks_v1beta1.types.environment import ContainerImage
+    from google.cloud.notebooks_v1beta1.types.environment import Environment
+    from google.cloud.notebooks_v1beta1.types.environment import VmImage
+    from google.cloud.notebooks_v1beta1.types.instance import Instance
+    from google.cloud.notebooks_v1beta1.types.service import CreateEnvironmentRequest
+    from google.cloud.notebooks_v1beta1.types.service import CreateInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import DeleteEnvironmentRequest
+    from google.cloud.notebooks_v1beta1.types.service import DeleteInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import GetEnvironmentRequest
+    from google.cloud.notebooks_v1beta1.types.service import GetInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import (
+        IsInstanceUpgradeableRequest,
+    )
+    from google.cloud.notebooks_v1beta1.types.service import (
+        IsInstanceUpgradeableResponse,
+    )
+    from google.cloud.notebooks_v1beta1.types.service import ListEnvironmentsRequest
+    from google.cloud.notebooks_v1beta1.types.service import ListEnvironmentsResponse
+    from google.cloud.notebooks_v1beta1.types.service import ListInstancesRequest
+    from google.cloud.notebooks_v1beta1.types.service import ListInstancesResponse
+    from google.cloud.notebooks_v1beta1.types.service import OperationMetadata
+    from google.cloud.notebooks_v1beta1.types.service import RegisterInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import ReportInstanceInfoRequest
+    from google.cloud.notebooks_v1beta1.types.service import ResetInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import (
+        SetInstanceAcceleratorRequest,
+    )
+    from google.cloud.notebooks_v1beta1.types.service import SetInstanceLabelsRequest
+    from google.cloud.notebooks_v1beta1.types.service import (
+        SetInstanceMachineTypeRequest,
+    )
+    from google.cloud.notebooks_v1beta1.types.service import StartInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import StopInstanceRequest
+    from google.cloud.notebooks_v1beta1.types.service import (
+        UpgradeInstanceInternalRequest,
+    )
+    from google.cloud.notebooks_v1beta1.types.service import UpgradeInstanceRequest
+else:
+
+    def __getattr__(name):
+        module = _EXPORTS.get(name)
+        if module is None:
+            raise AttributeError(
+                "module {0!r} has no attribute {1!r}".format(__name__, name)
+            )
+        value = getattr(importlib.import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+
 
 __all__ = (
     "ContainerImage",
@@ -15,34 +15,88 @@
 # limitations under the License.
 #
 
-from .services.notebook_service import NotebookServiceClient
-from .types.environment import ContainerImage
-from .types.environment import Environment
-from .types.environment import VmImage
-from .types.instance import Instance
-from .types.service import CreateEnvironmentRequest
-from .types.service import CreateInstanceRequest
-from .types.service import DeleteEnvironmentRequest
-from .types.service import DeleteInstanceRequest
-from .types.service import GetEnvironmentRequest
-from .types.service import GetInstanceRequest
-from .types.service import IsInstanceUpgradeableRequest
-from .types.service import IsInstanceUpgradeableResponse
-from .types.service import ListEnvironmentsRequest
-from .types.service import ListEnvironmentsResponse
-from .types.service import ListInstancesRequest
-from .types.service import ListInstancesResponse
-from .types.service import OperationMetadata
-from .types.service import RegisterInstanceRequest
-from .types.service import ReportInstanceInfoRequest
-from .types.service import ResetInstanceRequest
-from .types.service import SetInstanceAcceleratorRequest
-from .types.service import SetInstanceLabelsRequest
-from .types.service import SetInstanceMachineTypeRequest
-from .types.service import StartInstanceRequest
-from .types.service import StopInstanceRequest
-from .types.service import UpgradeInstanceInternalRequest
-from .types.service import UpgradeInstanceRequest
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+# Exported names are imported on first access, so that importing this
+# package does not load the clients, transports and grpc until needed.
+_EXPORTS = {
+    "ContainerImage": ".types.environment",
+    "CreateEnvironmentRequest": ".types.service",
+    "CreateInstanceRequest": ".types.service",
+    "DeleteEnvironmentRequest": ".types.service",
+    "DeleteInstanceRequest": ".types.service",
+    "Environment": ".types.environment",
+    "GetEnvironmentRequest": ".types.service",
+    "GetInstanceRequest": ".types.service",
+    "Instance": ".types.instance",
+    "IsInstanceUpgradeableRequest": ".types.service",
+    "IsInstanceUpgradeableResponse": ".types.service",
+    "ListEnvironmentsRequest": ".types.service",
+    "ListEnvironmentsResponse": ".types.service",
+    "ListInstancesRequest": ".types.service",
+    "ListInstancesResponse": ".types.service",
+    "NotebookServiceClient": ".services.notebook_service",
+    "OperationMetadata": ".types.service",
+    "RegisterInstanceRequest": ".types.service",
+    "ReportInstanceInfoRequest": ".types.service",
+    "ResetInstanceRequest": ".types.service",
+    "SetInstanceAcceleratorRequest": ".types.service",
+    "SetInstanceLabelsRequest": ".types.service",
+    "SetInstanceMachineTypeRequest": ".types.service",
+    "StartInstanceRequest": ".types.service",
+    "StopInstanceRequest": ".types.service",
+    "UpgradeInstanceInternalRequest": ".types.service",
+    "UpgradeInstanceRequest": ".types.service",
+    "VmImage": ".types.environment",
+}
+
+if TYPE_CHECKING or sys.version_info < (3, 7):  # pragma: NO COVER
+    # Type checkers, and Python 3.6 which lacks module __getattr__, use the
+    # eager imports.
+    from .services.notebook_service import NotebookServiceClient
+    from .types.environment import ContainerImage
+    from .types.environment import Environment
+    from .types.environment import VmImage
+    from .types.instance import Instance
+    from .types.service import CreateEnvironmentRequest
+    from .types.service import CreateInstanceRequest
+    from .types.service import DeleteEnvironmentRequest
+    from .types.service import DeleteInstanceRequest
+    from .types.service import GetEnvironmentRequest
+    from .types.service import GetInstanceRequest
+    from .types.service import IsInstanceUpgradeableRequest
+    from .types.service import IsInstanceUpgradeableResponse
+    from .types.service import ListEnvironmentsRequest
+    from .types.service import ListEnvironmentsResponse
+    from .types.service import ListInstancesRequest
+    from .types.service import ListInstancesResponse
+    from .types.service import OperationMetadata
+    from .types.service import RegisterInstanceRequest
+    from .types.service import ReportInstanceInfoRequest
+    from .types.service import ResetInstanceRequest
+    from .types.service import SetInstanceAcceleratorRequest
+    from .types.service import SetInstanceLabelsRequest
+    from .types.service import SetInstanceMachineTypeRequest
+    from .types.service import StartInstanceRequest
+    from .types.service import StopInstanceRequest
+    from .types.service import UpgradeInstanceInternalRequest
+    from .types.service import UpgradeInstanceRequest
+else:
+
+    def __getattr__(name):
+        module = _EXPORTS.get(name)
+        if module is None:
+            raise AttributeError(
+                "module {0!r} has no attribute {1!r}".format(__name__, name)
+            )
+        value = getattr(importlib.import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
 
 
 __all__ = (
@@ -15,8 +15,37 @@
 # limitations under the License.
 #
 
-from .client import NotebookServiceClient
-from .async_client import NotebookServiceAsyncClient
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+# Exported names are imported on first access, so that importing this
+# package does not load the clients, transports and grpc until needed.
+_EXPORTS = {
+    "NotebookServiceAsyncClient": ".async_client",
+    "NotebookServiceClient": ".client",
+}
+
+if TYPE_CHECKING or sys.version_info < (3, 7):  # pragma: NO COVER
+    # Type checkers, and Python 3.6 which lacks module __getattr__, use the
+    # eager imports.
+    from .client import NotebookServiceClient
+    from .async_client import NotebookServiceAsyncClient
+else:
+
+    def __getattr__(name):
+        module = _EXPORTS.get(name)
+        if module is None:
+            raise AttributeError(
+                "module {0!r} has no attribute {1!r}".format(__name__, name)
+            )
+        value = getattr(importlib.import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+
 
 __all__ = (
     "NotebookServiceClient",
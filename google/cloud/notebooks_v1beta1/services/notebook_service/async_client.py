@@ -16,10 +16,10 @@
 #
 
 from collections import OrderedDict
+import asyncio
 import functools
 import re
-from typing import Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import google.api_core.client_options as ClientOptions  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -30,7 +30,18 @@ from google.oauth2 import service_account  # type: ignore
 
 from google.api_core import operation
 from google.api_core import operation_async
+from google.cloud.notebooks_v1beta1.services.notebook_service import batch
+from google.cloud.notebooks_v1beta1.services.notebook_service import budget
+from google.cloud.notebooks_v1beta1.services.notebook_service import coercion
+from google.cloud.notebooks_v1beta1.services.notebook_service import deadline
+from google.cloud.notebooks_v1beta1.services.notebook_service import limiter
+from google.cloud.notebooks_v1beta1.services.notebook_service import notfound
 from google.cloud.notebooks_v1beta1.services.notebook_service import pagers
+from google.cloud.notebooks_v1beta1.services.notebook_service import quota
+from google.cloud.notebooks_v1beta1.services.notebook_service import routing
+from google.cloud.notebooks_v1beta1.services.notebook_service import scheduling
+from google.cloud.notebooks_v1beta1.services.notebook_service import singleflight
+from google.cloud.notebooks_v1beta1.services.notebook_service import version
 from google.cloud.notebooks_v1beta1.types import environment
 from google.cloud.notebooks_v1beta1.types import instance
 from google.cloud.notebooks_v1beta1.types import service
@@ -67,6 +78,12 @@ class NotebookServiceAsyncClient:
         credentials: credentials.Credentials = None,
         transport: Union[str, NotebookServiceTransport] = "grpc_asyncio",
         client_options: ClientOptions = None,
+        coalesce_reads: bool = True,
+        concurrency_limiter: limiter.AdaptiveLimiter = None,
+        scheduler: scheduling.PriorityScheduler = None,
+        quota_manager: quota.QuotaManager = None,
+        retry_budget: budget.RetryBudget = None,
+        not_found_cache: notfound.NotFoundCache = None,
     ) -> None:
         """Instantiate the notebook service client.
 
@@ -92,6 +109,25 @@ class NotebookServiceAsyncClient:
                 (2) The ``client_cert_source`` property is used to provide client
                 SSL credentials for mutual TLS transport. If not provided, the
                 default SSL credentials will be used if present.
+            coalesce_reads (bool): Whether identical read requests issued
+                while one is already in flight share its RPC and outcome.
+            concurrency_limiter (Optional[~.limiter.AdaptiveLimiter]): A
+                limiter applied to every RPC, possibly shared with other
+                clients. By default, RPCs are not limited.
+            scheduler (Optional[~.scheduling.PriorityScheduler]): A
+                scheduler admitting every RPC by priority class, possibly
+                shared with other clients.
+            quota_manager (Optional[~.quota.QuotaManager]): Client-side
+                quotas every RPC waits for before it is sent, possibly
+                shared with other clients.
+            retry_budget (Optional[~.budget.RetryBudget]): A budget the
+                retries of every RPC, including those of the operations
+                client, are drawn from, possibly shared with other clients.
+                By default, retries are not limited.
+            not_found_cache (Optional[~.notfound.NotFoundCache]): A cache
+                of the names ``get_instance`` and ``get_environment``
+                recently found not to exist, answered without an RPC,
+                possibly shared with other clients.
 
         Raises:
             google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
@@ -102,6 +138,36 @@ class NotebookServiceAsyncClient:
             credentials=credentials, transport=transport, client_options=client_options,
         )
 
+        self._read_flights = (
+            singleflight.AsyncSingleFlight() if coalesce_reads else None
+        )
+        self._concurrency_limiter = concurrency_limiter
+        self._scheduler = scheduler
+        self._quota_manager = quota_manager
+        self._retry_budget = retry_budget
+        self._not_found_cache = not_found_cache
+
+    @property
+    def parent_sizes(self) -> batch.ParentSizeCache:
+        """~.batch.ParentSizeCache: The parent sizes batch gets are planned with.
+
+        See :attr:`NotebookServiceClient.parent_sizes`.
+        """
+        return self._client._parent_sizes
+
+    @property
+    def operations_client(self):
+        """The client of the long-running operations of this client.
+
+        See :attr:`NotebookServiceClient.operations_client`.
+        """
+        operations_client = self._client._transport.operations_client
+        if self._retry_budget is not None:
+            operations_client = budget.BudgetedOperationsClient(
+                operations_client, self._retry_budget
+            )
+        return operations_client
+
     async def list_instances(
         self,
         request: service.ListInstancesRequest = None,
@@ -134,29 +200,65 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ListInstancesRequest(request)
+        request = coercion.coerce(service.ListInstancesRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.list_instances,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("list_instances", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("list_instances", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("list_instances", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("list_instances", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("list_instances", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
+        # Let later pages share the end-to-end deadline, if one is given.
+        rpc = deadline.bind(rpc, retry, timeout)
+
         # Send the request.
         response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata,)
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__aiter__` convenience method.
+        # Remember the size of the parent once every page has been read,
+        # to plan batch gets.
         response = pagers.ListInstancesAsyncPager(
-            method=rpc, request=request, response=response, metadata=metadata,
+            method=rpc,
+            request=request,
+            response=response,
+            metadata=metadata,
+            on_complete=(
+                None
+                if request.page_token
+                else functools.partial(self._client._parent_sizes.set, request.parent)
+            ),
         )
 
         # Done; return the response.
@@ -191,20 +293,47 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.GetInstanceRequest(request)
+        request = coercion.coerce(service.GetInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.get_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("get_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("get_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("get_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("get_instance", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("get_instance", rpc)
+
+        # Answer for names recently not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_async("get_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -213,6 +342,87 @@ class NotebookServiceAsyncClient:
         # Done; return the response.
         return response
 
+    async def batch_get_instances(
+        self,
+        names: Sequence[str],
+        *,
+        max_concurrency: int = 16,
+        page_size: int = 1000,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> List[Optional[instance.Instance]]:
+        r"""Gets the details of many Instances.
+
+        Names are grouped by parent. For each parent, the instances are
+        either fetched with concurrent :meth:`get_instance` calls or picked
+        out of one :meth:`list_instances` listing, whichever is estimated
+        to be cheaper given the size of the parent when it was last
+        listed.
+
+        Args:
+            names (Sequence[str]): The instance names, in the format
+                ``projects/{project_id}/locations/{location}/instances/{instance_id}``.
+            max_concurrency (int): The maximum number of concurrent
+                :meth:`get_instance` calls.
+            page_size (int): The page size to use when listing.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the requests as metadata.
+
+        Returns:
+            List[Optional[~.instance.Instance]]:
+                The instance for every name, in input order, or
+                ``None`` for names that do not exist.
+
+        Raises:
+            ValueError: If a name is not an instance resource name.
+        """
+        found = {}  # type: Dict[str, instance.Instance]
+        gets = []  # type: List[str]
+        plan = batch.plan_batch_get(
+            names,
+            NotebookServiceClient.parse_instance_path,
+            self._client._parent_sizes,
+            max_concurrency,
+            page_size,
+        )
+        for parent, strategy, wanted in plan:
+            if strategy == batch.GET:
+                gets.extend(wanted)
+                continue
+            # The pager remembers the new size of the parent.
+            wanted = set(wanted)
+            pager = await self.list_instances(
+                request={"parent": parent, "page_size": page_size},
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+            async for item in pager:
+                if item.name in wanted:
+                    found[item.name] = item
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get(name):
+            async with semaphore:
+                try:
+                    found[name] = await self.get_instance(
+                        request={"name": name},
+                        retry=retry,
+                        timeout=timeout,
+                        metadata=metadata,
+                    )
+                except exceptions.NotFound:
+                    pass
+
+        await asyncio.gather(*[get(name) for name in gets])
+
+        return [found.get(name) for name in names]
+
     async def create_instance(
         self,
         request: service.CreateInstanceRequest = None,
@@ -246,20 +456,45 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.CreateInstanceRequest(request)
+        request = coercion.coerce(service.CreateInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.create_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("create_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("create_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("create_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("create_instance", rpc)
+
+        # Forget that the created name was not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_create_async(
+                "create_instance", rpc, "instances", "instance_id"
+            )
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
         # Send the request.
@@ -268,11 +503,15 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
 
+        # Remember NotFound answers for the name again once it is created.
+        if self._not_found_cache is not None:
+            self._not_found_cache.watch(response)
+
         # Done; return the response.
         return response
 
@@ -313,20 +552,45 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.RegisterInstanceRequest(request)
+        request = coercion.coerce(service.RegisterInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.register_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("register_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("register_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("register_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("register_instance", rpc)
+
+        # Forget that the created name was not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_create_async(
+                "register_instance", rpc, "instances", "instance_id"
+            )
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
         # Send the request.
@@ -335,11 +599,15 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
 
+        # Remember NotFound answers for the name again once it is created.
+        if self._not_found_cache is not None:
+            self._not_found_cache.watch(response)
+
         # Done; return the response.
         return response
 
@@ -375,20 +643,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.SetInstanceAcceleratorRequest(request)
+        request = coercion.coerce(service.SetInstanceAcceleratorRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.set_instance_accelerator,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("set_instance_accelerator", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("set_instance_accelerator", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("set_instance_accelerator", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("set_instance_accelerator", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -397,7 +684,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -437,20 +724,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.SetInstanceMachineTypeRequest(request)
+        request = coercion.coerce(service.SetInstanceMachineTypeRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.set_instance_machine_type,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("set_instance_machine_type", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("set_instance_machine_type", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("set_instance_machine_type", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("set_instance_machine_type", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -459,7 +765,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -498,20 +804,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.SetInstanceLabelsRequest(request)
+        request = coercion.coerce(service.SetInstanceLabelsRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.set_instance_labels,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("set_instance_labels", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("set_instance_labels", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("set_instance_labels", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("set_instance_labels", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -520,7 +845,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -572,20 +897,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.DeleteInstanceRequest(request)
+        request = coercion.coerce(service.DeleteInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.delete_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("delete_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("delete_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("delete_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("delete_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -594,7 +938,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             empty.Empty,
             metadata_type=service.OperationMetadata,
         )
@@ -634,20 +978,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.StartInstanceRequest(request)
+        request = coercion.coerce(service.StartInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.start_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("start_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("start_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("start_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("start_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -656,7 +1019,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -696,20 +1059,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.StopInstanceRequest(request)
+        request = coercion.coerce(service.StopInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.stop_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("stop_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("stop_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("stop_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("stop_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -718,7 +1100,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -758,20 +1140,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ResetInstanceRequest(request)
+        request = coercion.coerce(service.ResetInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.reset_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("reset_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("reset_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("reset_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("reset_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -780,7 +1181,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -824,20 +1225,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ReportInstanceInfoRequest(request)
+        request = coercion.coerce(service.ReportInstanceInfoRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.report_instance_info,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("report_instance_info", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("report_instance_info", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("report_instance_info", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("report_instance_info", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -846,7 +1266,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -883,22 +1303,43 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.IsInstanceUpgradeableRequest(request)
+        request = coercion.coerce(service.IsInstanceUpgradeableRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.is_instance_upgradeable,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("is_instance_upgradeable", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("is_instance_upgradeable", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("is_instance_upgradeable", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("is_instance_upgradeable", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("is_instance_upgradeable", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata(
-                (("notebook_instance", request.notebook_instance),)
-            ),
+            routing.routing_metadata("notebook_instance", request.notebook_instance),
         )
 
         # Send the request.
@@ -939,20 +1380,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.UpgradeInstanceRequest(request)
+        request = coercion.coerce(service.UpgradeInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.upgrade_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("upgrade_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("upgrade_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("upgrade_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("upgrade_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -961,7 +1421,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -1003,20 +1463,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.UpgradeInstanceInternalRequest(request)
+        request = coercion.coerce(service.UpgradeInstanceInternalRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.upgrade_instance_internal,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("upgrade_instance_internal", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("upgrade_instance_internal", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("upgrade_instance_internal", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("upgrade_instance_internal", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1025,7 +1504,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -1063,22 +1542,48 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ListEnvironmentsRequest(request)
+        request = coercion.coerce(service.ListEnvironmentsRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.list_environments,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("list_environments", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("list_environments", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("list_environments", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("list_environments", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("list_environments", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
+        # Let later pages share the end-to-end deadline, if one is given.
+        rpc = deadline.bind(rpc, retry, timeout)
+
         # Send the request.
         response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata,)
 
@@ -1121,20 +1626,47 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.GetEnvironmentRequest(request)
+        request = coercion.coerce(service.GetEnvironmentRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.get_environment,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("get_environment", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("get_environment", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("get_environment", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("get_environment", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("get_environment", rpc)
+
+        # Answer for names recently not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_async("get_environment", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1176,20 +1708,45 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.CreateEnvironmentRequest(request)
+        request = coercion.coerce(service.CreateEnvironmentRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.create_environment,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("create_environment", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("create_environment", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("create_environment", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("create_environment", rpc)
+
+        # Forget that the created name was not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_create_async(
+                "create_environment", rpc, "environments", "environment_id"
+            )
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
         # Send the request.
@@ -1198,11 +1755,15 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             environment.Environment,
             metadata_type=service.OperationMetadata,
         )
 
+        # Remember NotFound answers for the name again once it is created.
+        if self._not_found_cache is not None:
+            self._not_found_cache.watch(response)
+
         # Done; return the response.
         return response
 
@@ -1250,20 +1811,39 @@ class NotebookServiceAsyncClient:
         """
         # Create or coerce a protobuf request object.
 
-        request = service.DeleteEnvironmentRequest(request)
+        request = coercion.coerce(service.DeleteEnvironmentRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method_async.wrap_method(
             self._client._transport.delete_environment,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap_async("delete_environment", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap_async("delete_environment", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap_async("delete_environment", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap_async("delete_environment", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1272,7 +1852,7 @@ class NotebookServiceAsyncClient:
         # Wrap the response in an operation future.
         response = operation_async.from_gapic(
             response,
-            self._client._transport.operations_client,
+            self.operations_client,
             empty.Empty,
             metadata_type=service.OperationMetadata,
         )
@@ -1281,12 +1861,4 @@ class NotebookServiceAsyncClient:
         return response
 
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution("google-cloud-notebooks",).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
-
-
 __all__ = ("NotebookServiceAsyncClient",)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Query planning for ``batch_get_instances``.
+
+Fetching many instances of one parent can be done either with one
+``get_instance`` call per name, run concurrently, or with a single
+paginated ``list_instances`` whose results are filtered. The cheaper one
+depends on how many instances the parent holds, so the size of every
+parent seen in a listing is remembered in a :class:`ParentSizeCache`.
+"""
+
+import collections
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+GET = "get"
+"""Fetch the instances of a parent with concurrent ``get_instance`` calls."""
+
+LIST = "list"
+"""Fetch the instances of a parent with one paginated ``list_instances``."""
+
+LIST_PAGE_COST = 2.0
+"""The cost of one listing page, relative to one round of concurrent gets.
+
+A page carries many instances, so it takes longer to serve and transfer
+than a single instance.
+"""
+
+
+class ParentSizeCache:
+    """The number of instances in each parent, as last seen by a listing.
+
+    Args:
+        ttl (float): How long a size stays valid, in seconds.
+    """
+
+    def __init__(self, ttl: float = 600.0) -> None:
+        self._ttl = ttl
+        self._sizes = {}  # type: Dict[str, Tuple[int, float]]
+        self._lock = threading.Lock()
+
+    def get(self, parent: str) -> Optional[int]:
+        """Return the size of a parent, or ``None`` if unknown or expired."""
+        with self._lock:
+            entry = self._sizes.get(parent)
+            if entry is None:
+                return None
+            size, expires = entry
+            if expires <= time.monotonic():
+                del self._sizes[parent]
+                return None
+            return size
+
+    def set(self, parent: str, size: int) -> None:
+        """Record the size of a parent."""
+        with self._lock:
+            self._sizes[parent] = (size, time.monotonic() + self._ttl)
+
+    def clear(self) -> None:
+        """Forget every size."""
+        with self._lock:
+            self._sizes.clear()
+
+
+def choose_strategy(
+    wanted: int, parent_size: Optional[int], max_concurrency: int, page_size: int
+) -> str:
+    """Choose how to fetch ``wanted`` instances of one parent.
+
+    Args:
+        wanted (int): The number of instances to fetch.
+        parent_size (Optional[int]): The number of instances in the parent,
+            or ``None`` if unknown.
+        max_concurrency (int): The maximum number of concurrent gets.
+        page_size (int): The page size used when listing.
+
+    Returns:
+        str: :data:`GET` or :data:`LIST`. Parents of unknown size are always
+        fetched with gets, whose cost is bounded.
+    """
+    if parent_size is None:
+        return GET
+    get_rounds = math.ceil(wanted / max_concurrency)
+    list_pages = max(1, math.ceil(parent_size / page_size))
+    return LIST if list_pages * LIST_PAGE_COST <= get_rounds else GET
+
+
+def plan_batch_get(
+    names: Sequence[str],
+    parse_instance_path: Callable[[str], Dict[str, str]],
+    sizes: ParentSizeCache,
+    max_concurrency: int,
+    page_size: int,
+) -> List[Tuple[str, str, List[str]]]:
+    """Group instance names by parent and choose a strategy for each.
+
+    Args:
+        names (Sequence[str]): The instance names. Duplicates are fetched
+            once.
+        parse_instance_path (Callable[[str], Dict[str, str]]): The client's
+            ``parse_instance_path``.
+        sizes (~.ParentSizeCache): The known parent sizes.
+        max_concurrency (int): The maximum number of concurrent gets.
+        page_size (int): The page size used when listing.
+
+    Returns:
+        List[Tuple[str, str, List[str]]]: A ``(parent, strategy, names)``
+        tuple per parent, in order of first appearance.
+
+    Raises:
+        ValueError: If a name is not an instance resource name.
+    """
+    groups = collections.OrderedDict()  # type: Dict[str, List[str]]
+    seen = set()
+    for name in names:
+        if name in seen:
+            continue
+        seen.add(name)
+        parent, _, instance_id = name.rpartition("/instances/")
+        if (
+            not parse_instance_path(name)
+            or not parent.startswith("projects/")
+            or not instance_id
+            or "/" in instance_id
+            or "" in parent.split("/")
+        ):
+            raise ValueError("{0!r} is not an instance name".format(name))
+        groups.setdefault(parent, []).append(name)
+
+    return [
+        (
+            parent,
+            choose_strategy(len(wanted), sizes.get(parent), max_concurrency, page_size),
+            wanted,
+        )
+        for parent, wanted in groups.items()
+    ]
+
+
+__all__ = (
+    "GET",
+    "LIST",
+    "LIST_PAGE_COST",
+    "ParentSizeCache",
+    "choose_strategy",
+    "plan_batch_get",
+)
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A retry budget shared by every client of a process.
+
+A :class:`~google.api_core.retry.Retry` decides on its own whether to retry
+each call, so during an outage every concurrent call retries and the load
+on the struggling backend multiplies. :class:`RetryBudget` caps retries at
+a fraction of the calls that succeeded over a sliding window, plus a small
+reserve, across all the methods and clients sharing it::
+
+    shared = budget.shared_retry_budget()
+    client = NotebookServiceClient(retry_budget=shared)
+    async_client = NotebookServiceAsyncClient(retry_budget=shared)
+
+Once the budget is spent, the error of a failed attempt is raised instead
+of being retried. The errors retried are those of the budget's own
+``predicate``. The calls of the operations client, such as the polls of
+long-running operations, spend the budget too but do not add to it.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import operations_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.api_core import retry_async  # type: ignore
+
+
+# The delays and deadline of the retries of the operations client, as
+# api_core sets them by default.
+_OPERATIONS_RETRY = {
+    "initial": 0.1,
+    "maximum": 60.0,
+    "multiplier": 1.3,
+    "deadline": 600.0,
+}
+
+
+class RetryStats:
+    """Retry statistics of one method.
+
+    Attributes:
+        successes (int): The number of calls that succeeded.
+        retries (int): The number of retries allowed.
+        denied (int): The number of retries denied.
+    """
+
+    __slots__ = ("successes", "retries", "denied")
+
+    def __init__(self) -> None:
+        self.successes = 0
+        self.retries = 0
+        self.denied = 0
+
+    def _copy(self) -> "RetryStats":
+        copy = RetryStats()
+        copy.successes, copy.retries, copy.denied = (
+            self.successes,
+            self.retries,
+            self.denied,
+        )
+        return copy
+
+    def __repr__(self) -> str:
+        return "{0}<successes={1} retries={2} denied={3}>".format(
+            self.__class__.__name__, self.successes, self.retries, self.denied
+        )
+
+
+class RetryBudget:
+    """Cap retries at a fraction of recent successful calls.
+
+    Args:
+        ratio (float): The retries allowed per successful call within the
+            window.
+        min_retries_per_second (float): Retries allowed regardless of
+            successes, so that a quiet client can still retry.
+        window (float): The length of the sliding window, in seconds.
+        predicate (Callable[[Exception], bool]): Which errors are retried.
+            It replaces the predicate of the retries passed to client
+            methods, as api_core offers no way to read it.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        *,
+        min_retries_per_second: float = 10.0,
+        window: float = 10.0,
+        predicate: Callable[[Exception], bool] = retries.if_transient_error
+    ) -> None:
+        if ratio < 0 or min_retries_per_second < 0:
+            raise ValueError("ratio and min_retries_per_second must not be negative")
+        if window < 1:
+            raise ValueError("window must be at least one second")
+        self._ratio = ratio
+        self._predicate = predicate
+        self._slots = int(math.ceil(window))
+        self._reserve = min_retries_per_second * self._slots
+        self._lock = threading.Lock()
+        # One slot per second of the window, indexed by second modulo size.
+        self._successes = [0] * self._slots  # type: List[int]
+        self._retries = [0] * self._slots  # type: List[int]
+        self._second = int(time.monotonic())
+        self._stats = {}  # type: Dict[str, RetryStats]
+
+    def _advance(self) -> int:
+        # Must hold the lock. Clear the slots of the seconds that went by.
+        second = int(time.monotonic())
+        for elapsed in range(
+            self._second + 1, min(second, self._second + self._slots) + 1
+        ):
+            self._successes[elapsed % self._slots] = 0
+            self._retries[elapsed % self._slots] = 0
+        self._second = max(self._second, second)
+        return self._second % self._slots
+
+    def _method_stats(self, method: str) -> RetryStats:
+        # Must hold the lock.
+        stats = self._stats.get(method)
+        if stats is None:
+            stats = self._stats[method] = RetryStats()
+        return stats
+
+    def available(self) -> float:
+        """Return the number of retries the budget allows right now."""
+        with self._lock:
+            self._advance()
+            return self._available()
+
+    def _available(self) -> float:
+        # Must hold the lock.
+        allowed = self._reserve + self._ratio * sum(self._successes)
+        return max(0.0, allowed - sum(self._retries))
+
+    def record_success(self, method: str) -> None:
+        """Count a successful call, adding to the budget."""
+        with self._lock:
+            self._successes[self._advance()] += 1
+            self._method_stats(method).successes += 1
+
+    def try_retry(self, method: str) -> bool:
+        """Spend one retry from the budget.
+
+        Returns:
+            bool: Whether the retry is allowed.
+        """
+        with self._lock:
+            index = self._advance()
+            stats = self._method_stats(method)
+            if self._available() >= 1:
+                self._retries[index] += 1
+                stats.retries += 1
+                return True
+            stats.denied += 1
+            return False
+
+    def stats(self) -> Dict[str, RetryStats]:
+        """Return a snapshot of the retry statistics of every method."""
+        with self._lock:
+            return {method: stats._copy() for method, stats in self._stats.items()}
+
+    def predicate(self, method: str) -> Callable[[Exception], bool]:
+        """Return a retry predicate spending this budget.
+
+        Args:
+            method (str): The RPC method name.
+
+        Returns:
+            Callable[[Exception], bool]: Whether to retry an error: the
+            budget's ``predicate`` matches it and a retry is allowed.
+        """
+
+        def budgeted(exc):
+            return self._predicate(exc) and self.try_retry(method)
+
+        return budgeted
+
+    def limit(self, method: str, retry: Any) -> Any:
+        """Make a retry spend this budget.
+
+        Args:
+            method (str): The RPC method name.
+            retry (Union[google.api_core.retry.Retry,
+                google.api_core.retry_async.AsyncRetry]): The retry.
+
+        Returns:
+            The same kind of retry, with the delays and deadline of
+            ``retry``, which retries the errors of the budget's
+            ``predicate`` while the budget allows it.
+        """
+        return retry.with_predicate(self.predicate(method))
+
+    def _limit_kwargs(self, method: str, kwargs: Dict[str, Any]) -> None:
+        retry = kwargs.get("retry")
+        if retry is not None and retry is not gapic_v1.method.DEFAULT:
+            kwargs["retry"] = self.limit(method, retry)
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Make the retries of a wrapped RPC method spend this budget.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def budgeted(*args, **kwargs):
+            self._limit_kwargs(method, kwargs)
+            response = rpc(*args, **kwargs)
+            self.record_success(method)
+            return response
+
+        return budgeted
+
+    def wrap_async(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Make the retries of a wrapped async RPC method spend this budget.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Awaitable[Any]]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method_async.wrap_method`.
+
+        Returns:
+            Callable[..., Awaitable[Any]]: A callable with the same
+            signature.
+        """
+
+        async def budgeted(*args, **kwargs):
+            self._limit_kwargs(method, kwargs)
+            response = await rpc(*args, **kwargs)
+            self.record_success(method)
+            return response
+
+        return budgeted
+
+    def __repr__(self) -> str:
+        return "{0}<available={1:.1f}>".format(
+            self.__class__.__name__, self.available()
+        )
+
+
+class BudgetedOperationsClient:
+    """An operations client whose retries spend a retry budget.
+
+    Calls that would use the default retry of the client use a retry with
+    the same delays and deadline instead, and retries passed in are
+    limited with :meth:`RetryBudget.limit`. Successful calls do not add
+    to the budget, so that polling long-running operations does not
+    inflate it. Other attributes are those of the client.
+
+    Args:
+        operations_client (Union[~.operations_v1.OperationsClient,
+            ~.operations_v1.OperationsAsyncClient]): The client, usually
+            the ``operations_client`` of a transport.
+        retry_budget (~.RetryBudget): The budget to spend.
+    """
+
+    def __init__(self, operations_client: Any, retry_budget: RetryBudget) -> None:
+        self._client = operations_client
+        self._budget = retry_budget
+        self._retry_type = (
+            retry_async.AsyncRetry
+            if isinstance(operations_client, operations_v1.OperationsAsyncClient)
+            else retries.Retry
+        )
+
+    def _retry(self, method: str, retry: Any) -> Any:
+        if retry is gapic_v1.method.DEFAULT:
+            return self._retry_type(
+                predicate=self._budget.predicate(method), **_OPERATIONS_RETRY
+            )
+        if retry is None:
+            return None
+        return self._budget.limit(method, retry)
+
+    def get_operation(self, name, retry=gapic_v1.method.DEFAULT, **kwargs):
+        """See :meth:`~.operations_v1.OperationsClient.get_operation`."""
+        return self._client.get_operation(
+            name, retry=self._retry("get_operation", retry), **kwargs
+        )
+
+    def list_operations(self, name, filter_, retry=gapic_v1.method.DEFAULT, **kwargs):
+        """See :meth:`~.operations_v1.OperationsClient.list_operations`."""
+        return self._client.list_operations(
+            name, filter_, retry=self._retry("list_operations", retry), **kwargs
+        )
+
+    def cancel_operation(self, name, retry=gapic_v1.method.DEFAULT, **kwargs):
+        """See :meth:`~.operations_v1.OperationsClient.cancel_operation`."""
+        return self._client.cancel_operation(
+            name, retry=self._retry("cancel_operation", retry), **kwargs
+        )
+
+    def delete_operation(self, name, retry=gapic_v1.method.DEFAULT, **kwargs):
+        """See :meth:`~.operations_v1.OperationsClient.delete_operation`."""
+        return self._client.delete_operation(
+            name, retry=self._retry("delete_operation", retry), **kwargs
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r}>".format(self.__class__.__name__, self._client)
+
+
+_shared = None  # type: Optional[RetryBudget]
+_shared_lock = threading.Lock()
+
+
+def shared_retry_budget() -> RetryBudget:
+    """Return the process-wide retry budget, creating it on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RetryBudget()
+        return _shared
+
+
+__all__ = (
+    "BudgetedOperationsClient",
+    "RetryBudget",
+    "RetryStats",
+    "shared_retry_budget",
+)
@@ -16,10 +16,11 @@
 #
 
 from collections import OrderedDict
+import concurrent.futures
+import functools
 import os
 import re
-from typing import Callable, Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import google.api_core.client_options as ClientOptions  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -32,7 +33,18 @@ from google.oauth2 import service_account  # type: ignore
 
 from google.api_core import operation
 from google.api_core import operation_async
+from google.cloud.notebooks_v1beta1.services.notebook_service import batch
+from google.cloud.notebooks_v1beta1.services.notebook_service import budget
+from google.cloud.notebooks_v1beta1.services.notebook_service import coercion
+from google.cloud.notebooks_v1beta1.services.notebook_service import deadline
+from google.cloud.notebooks_v1beta1.services.notebook_service import limiter
+from google.cloud.notebooks_v1beta1.services.notebook_service import notfound
 from google.cloud.notebooks_v1beta1.services.notebook_service import pagers
+from google.cloud.notebooks_v1beta1.services.notebook_service import quota
+from google.cloud.notebooks_v1beta1.services.notebook_service import routing
+from google.cloud.notebooks_v1beta1.services.notebook_service import scheduling
+from google.cloud.notebooks_v1beta1.services.notebook_service import singleflight
+from google.cloud.notebooks_v1beta1.services.notebook_service import version
 from google.cloud.notebooks_v1beta1.types import environment
 from google.cloud.notebooks_v1beta1.types import instance
 from google.cloud.notebooks_v1beta1.types import service
@@ -168,6 +180,12 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         credentials: credentials.Credentials = None,
         transport: Union[str, NotebookServiceTransport] = None,
         client_options: ClientOptions = None,
+        coalesce_reads: bool = True,
+        concurrency_limiter: limiter.AdaptiveLimiter = None,
+        scheduler: scheduling.PriorityScheduler = None,
+        quota_manager: quota.QuotaManager = None,
+        retry_budget: budget.RetryBudget = None,
+        not_found_cache: notfound.NotFoundCache = None,
     ) -> None:
         """Instantiate the notebook service client.
 
@@ -193,6 +211,25 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
                 (2) The ``client_cert_source`` property is used to provide client
                 SSL credentials for mutual TLS transport. If not provided, the
                 default SSL credentials will be used if present.
+            coalesce_reads (bool): Whether identical read requests issued
+                while one is already in flight share its RPC and outcome.
+            concurrency_limiter (Optional[~.limiter.AdaptiveLimiter]): A
+                limiter applied to every RPC, possibly shared with other
+                clients. By default, RPCs are not limited.
+            scheduler (Optional[~.scheduling.PriorityScheduler]): A
+                scheduler admitting every RPC by priority class, possibly
+                shared with other clients.
+            quota_manager (Optional[~.quota.QuotaManager]): Client-side
+                quotas every RPC waits for before it is sent, possibly
+                shared with other clients.
+            retry_budget (Optional[~.budget.RetryBudget]): A budget the
+                retries of every RPC, including those of the operations
+                client, are drawn from, possibly shared with other clients.
+                By default, retries are not limited.
+            not_found_cache (Optional[~.notfound.NotFoundCache]): A cache
+                of the names ``get_instance`` and ``get_environment``
+                recently found not to exist, answered without an RPC,
+                possibly shared with other clients.
 
         Raises:
             google.auth.exceptions.MutualTLSChannelError: If mutual TLS transport
@@ -252,6 +289,41 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
                 quota_project_id=client_options.quota_project_id,
             )
 
+        # Remember parent sizes to plan batch gets.
+        self._parent_sizes = batch.ParentSizeCache()
+
+        self._read_flights = singleflight.SingleFlight() if coalesce_reads else None
+        self._concurrency_limiter = concurrency_limiter
+        self._scheduler = scheduler
+        self._quota_manager = quota_manager
+        self._retry_budget = retry_budget
+        self._not_found_cache = not_found_cache
+
+    @property
+    def parent_sizes(self) -> batch.ParentSizeCache:
+        """~.batch.ParentSizeCache: The parent sizes batch gets are planned with.
+
+        The size of a parent is recorded whenever :meth:`list_instances`
+        reads all of its pages, and can also be set directly, e.g. from an
+        inventory, so that :meth:`batch_get_instances` can list large
+        parents instead of getting every instance.
+        """
+        return self._parent_sizes
+
+    @property
+    def operations_client(self):
+        """The client of the long-running operations of this client.
+
+        Its retries spend the retry budget, if any, as
+        a :class:`~.budget.BudgetedOperationsClient`.
+        """
+        operations_client = self._transport.operations_client
+        if self._retry_budget is not None:
+            operations_client = budget.BudgetedOperationsClient(
+                operations_client, self._retry_budget
+            )
+        return operations_client
+
     def list_instances(
         self,
         request: service.ListInstancesRequest = None,
@@ -284,29 +356,65 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ListInstancesRequest(request)
+        request = coercion.coerce(service.ListInstancesRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.list_instances,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("list_instances", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("list_instances", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("list_instances", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("list_instances", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("list_instances", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
+        # Let later pages share the end-to-end deadline, if one is given.
+        rpc = deadline.bind(rpc, retry, timeout)
+
         # Send the request.
         response = rpc(request, retry=retry, timeout=timeout, metadata=metadata,)
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__iter__` convenience method.
+        # Remember the size of the parent once every page has been read,
+        # to plan batch gets.
         response = pagers.ListInstancesPager(
-            method=rpc, request=request, response=response, metadata=metadata,
+            method=rpc,
+            request=request,
+            response=response,
+            metadata=metadata,
+            on_complete=(
+                None
+                if request.page_token
+                else functools.partial(self._parent_sizes.set, request.parent)
+            ),
         )
 
         # Done; return the response.
@@ -341,20 +449,47 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.GetInstanceRequest(request)
+        request = coercion.coerce(service.GetInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.get_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("get_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("get_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("get_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("get_instance", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("get_instance", rpc)
+
+        # Answer for names recently not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap("get_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -363,6 +498,89 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Done; return the response.
         return response
 
+    def batch_get_instances(
+        self,
+        names: Sequence[str],
+        *,
+        max_concurrency: int = 16,
+        page_size: int = 1000,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> List[Optional[instance.Instance]]:
+        r"""Gets the details of many Instances.
+
+        Names are grouped by parent. For each parent, the instances are
+        either fetched with concurrent :meth:`get_instance` calls or picked
+        out of one :meth:`list_instances` listing, whichever is estimated
+        to be cheaper given the size of the parent when it was last
+        listed.
+
+        Args:
+            names (Sequence[str]): The instance names, in the format
+                ``projects/{project_id}/locations/{location}/instances/{instance_id}``.
+            max_concurrency (int): The maximum number of concurrent
+                :meth:`get_instance` calls.
+            page_size (int): The page size to use when listing.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the requests as metadata.
+
+        Returns:
+            List[Optional[~.instance.Instance]]:
+                The instance for every name, in input order, or
+                ``None`` for names that do not exist.
+
+        Raises:
+            ValueError: If a name is not an instance resource name.
+        """
+        found = {}  # type: Dict[str, instance.Instance]
+        gets = []  # type: List[str]
+        plan = batch.plan_batch_get(
+            names,
+            self.parse_instance_path,
+            self._parent_sizes,
+            max_concurrency,
+            page_size,
+        )
+        for parent, strategy, wanted in plan:
+            if strategy == batch.GET:
+                gets.extend(wanted)
+                continue
+            # The pager remembers the new size of the parent.
+            wanted = set(wanted)
+            for item in self.list_instances(
+                request={"parent": parent, "page_size": page_size},
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            ):
+                if item.name in wanted:
+                    found[item.name] = item
+
+        def get(name):
+            try:
+                return self.get_instance(
+                    request={"name": name},
+                    retry=retry,
+                    timeout=timeout,
+                    metadata=metadata,
+                )
+            except exceptions.NotFound:
+                return None
+
+        if gets:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(gets))
+            ) as executor:
+                for name, item in zip(gets, executor.map(get, gets)):
+                    if item is not None:
+                        found[name] = item
+
+        return [found.get(name) for name in names]
+
     def create_instance(
         self,
         request: service.CreateInstanceRequest = None,
@@ -396,20 +614,45 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.CreateInstanceRequest(request)
+        request = coercion.coerce(service.CreateInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.create_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("create_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("create_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("create_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("create_instance", rpc)
+
+        # Forget that the created name was not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_create(
+                "create_instance", rpc, "instances", "instance_id"
+            )
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
         # Send the request.
@@ -418,11 +661,15 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
 
+        # Remember NotFound answers for the name again once it is created.
+        if self._not_found_cache is not None:
+            self._not_found_cache.watch(response)
+
         # Done; return the response.
         return response
 
@@ -463,20 +710,45 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.RegisterInstanceRequest(request)
+        request = coercion.coerce(service.RegisterInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.register_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("register_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("register_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("register_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("register_instance", rpc)
+
+        # Forget that the created name was not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_create(
+                "register_instance", rpc, "instances", "instance_id"
+            )
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
         # Send the request.
@@ -485,11 +757,15 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
 
+        # Remember NotFound answers for the name again once it is created.
+        if self._not_found_cache is not None:
+            self._not_found_cache.watch(response)
+
         # Done; return the response.
         return response
 
@@ -525,20 +801,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.SetInstanceAcceleratorRequest(request)
+        request = coercion.coerce(service.SetInstanceAcceleratorRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.set_instance_accelerator,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("set_instance_accelerator", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("set_instance_accelerator", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("set_instance_accelerator", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("set_instance_accelerator", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -547,7 +842,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -587,20 +882,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.SetInstanceMachineTypeRequest(request)
+        request = coercion.coerce(service.SetInstanceMachineTypeRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.set_instance_machine_type,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("set_instance_machine_type", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("set_instance_machine_type", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("set_instance_machine_type", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("set_instance_machine_type", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -609,7 +923,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -648,20 +962,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.SetInstanceLabelsRequest(request)
+        request = coercion.coerce(service.SetInstanceLabelsRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.set_instance_labels,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("set_instance_labels", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("set_instance_labels", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("set_instance_labels", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("set_instance_labels", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -670,7 +1003,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -722,20 +1055,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.DeleteInstanceRequest(request)
+        request = coercion.coerce(service.DeleteInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.delete_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("delete_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("delete_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("delete_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("delete_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -744,7 +1096,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             empty.Empty,
             metadata_type=service.OperationMetadata,
         )
@@ -784,20 +1136,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.StartInstanceRequest(request)
+        request = coercion.coerce(service.StartInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.start_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("start_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("start_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("start_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("start_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -806,7 +1177,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -846,20 +1217,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.StopInstanceRequest(request)
+        request = coercion.coerce(service.StopInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.stop_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("stop_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("stop_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("stop_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("stop_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -868,7 +1258,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -908,20 +1298,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ResetInstanceRequest(request)
+        request = coercion.coerce(service.ResetInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.reset_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("reset_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("reset_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("reset_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("reset_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -930,7 +1339,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -974,20 +1383,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ReportInstanceInfoRequest(request)
+        request = coercion.coerce(service.ReportInstanceInfoRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.report_instance_info,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("report_instance_info", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("report_instance_info", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("report_instance_info", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("report_instance_info", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -996,7 +1424,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -1033,22 +1461,43 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.IsInstanceUpgradeableRequest(request)
+        request = coercion.coerce(service.IsInstanceUpgradeableRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.is_instance_upgradeable,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("is_instance_upgradeable", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("is_instance_upgradeable", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("is_instance_upgradeable", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("is_instance_upgradeable", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("is_instance_upgradeable", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata(
-                (("notebook_instance", request.notebook_instance),)
-            ),
+            routing.routing_metadata("notebook_instance", request.notebook_instance),
         )
 
         # Send the request.
@@ -1089,20 +1538,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.UpgradeInstanceRequest(request)
+        request = coercion.coerce(service.UpgradeInstanceRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.upgrade_instance,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("upgrade_instance", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("upgrade_instance", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("upgrade_instance", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("upgrade_instance", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1111,7 +1579,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -1153,20 +1621,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.UpgradeInstanceInternalRequest(request)
+        request = coercion.coerce(service.UpgradeInstanceInternalRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.upgrade_instance_internal,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("upgrade_instance_internal", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("upgrade_instance_internal", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("upgrade_instance_internal", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("upgrade_instance_internal", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1175,7 +1662,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             instance.Instance,
             metadata_type=service.OperationMetadata,
         )
@@ -1213,22 +1700,48 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.ListEnvironmentsRequest(request)
+        request = coercion.coerce(service.ListEnvironmentsRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.list_environments,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("list_environments", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("list_environments", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("list_environments", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("list_environments", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("list_environments", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
+        # Let later pages share the end-to-end deadline, if one is given.
+        rpc = deadline.bind(rpc, retry, timeout)
+
         # Send the request.
         response = rpc(request, retry=retry, timeout=timeout, metadata=metadata,)
 
@@ -1271,20 +1784,47 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.GetEnvironmentRequest(request)
+        request = coercion.coerce(service.GetEnvironmentRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.get_environment,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("get_environment", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("get_environment", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("get_environment", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("get_environment", rpc)
+
+        # Share one RPC between identical requests already in flight.
+        if self._read_flights is not None:
+            rpc = self._read_flights.wrap("get_environment", rpc)
+
+        # Answer for names recently not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap("get_environment", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1326,20 +1866,45 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.CreateEnvironmentRequest(request)
+        request = coercion.coerce(service.CreateEnvironmentRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.create_environment,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("create_environment", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("create_environment", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("create_environment", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("create_environment", rpc)
+
+        # Forget that the created name was not found, if negatively cached.
+        if self._not_found_cache is not None:
+            rpc = self._not_found_cache.wrap_create(
+                "create_environment", rpc, "environments", "environment_id"
+            )
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
+            routing.routing_metadata("parent", request.parent),
         )
 
         # Send the request.
@@ -1348,11 +1913,15 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             environment.Environment,
             metadata_type=service.OperationMetadata,
         )
 
+        # Remember NotFound answers for the name again once it is created.
+        if self._not_found_cache is not None:
+            self._not_found_cache.watch(response)
+
         # Done; return the response.
         return response
 
@@ -1400,20 +1969,39 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         """
         # Create or coerce a protobuf request object.
 
-        request = service.DeleteEnvironmentRequest(request)
+        request = coercion.coerce(service.DeleteEnvironmentRequest, request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
         rpc = gapic_v1.method.wrap_method(
             self._transport.delete_environment,
             default_timeout=60.0,
-            client_info=_client_info,
+            client_info=version.client_info(),
         )
 
+        # Stop retrying at the end-to-end deadline, if one is given.
+        rpc = deadline.wrap(rpc)
+
+        # Draw retries from the shared retry budget, if any.
+        if self._retry_budget is not None:
+            rpc = self._retry_budget.wrap("delete_environment", rpc)
+
+        # Apply the adaptive concurrency limit, if any.
+        if self._concurrency_limiter is not None:
+            rpc = self._concurrency_limiter.wrap("delete_environment", rpc)
+
+        # Wait for client-side quota, if any.
+        if self._quota_manager is not None:
+            rpc = self._quota_manager.wrap("delete_environment", rpc)
+
+        # Queue behind calls of higher priority, if scheduled.
+        if self._scheduler is not None:
+            rpc = self._scheduler.wrap("delete_environment", rpc)
+
         # Certain fields should be provided within the metadata header;
         # add these here.
         metadata = tuple(metadata) + (
-            gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
+            routing.routing_metadata("name", request.name),
         )
 
         # Send the request.
@@ -1422,7 +2010,7 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         # Wrap the response in an operation future.
         response = operation.from_gapic(
             response,
-            self._transport.operations_client,
+            self.operations_client,
             empty.Empty,
             metadata_type=service.OperationMetadata,
         )
@@ -1431,12 +2019,4 @@ class NotebookServiceClient(metaclass=NotebookServiceClientMeta):
         return response
 
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution("google-cloud-notebooks",).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
-
-
 __all__ = ("NotebookServiceClient",)
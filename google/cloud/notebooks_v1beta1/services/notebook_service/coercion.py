@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Coercion of the ``request`` argument of client methods.
+
+Client methods accept their request as a message, a mapping or ``None``.
+A request of exactly the method's message type is used as-is, without the
+copy that constructing a new message makes, so prebuilt requests can be
+reused at no cost. A raw protobuf request, as returned by the ``pb()`` of
+the message type, is wrapped without a copy too::
+
+    raw = service.GetInstanceRequest.pb()(name=name)
+    client.get_instance(request=raw)
+
+Requests prepared from a :class:`~.templates.RequestTemplate` are passed
+through as well. Either way, the client does not modify the request, but
+changing it while the call is in progress affects the call.
+"""
+
+from typing import Any, Type, TypeVar
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
+from google.protobuf import message  # type: ignore
+
+_M = TypeVar("_M")
+
+
+def coerce(message_type: Type[_M], request: Any) -> _M:
+    """Return ``request`` as a ``message_type``, copying only if needed.
+
+    Args:
+        message_type (Type[proto.Message]): The request message type.
+        request (Any): A ``message_type``, its raw protobuf message, a
+            :class:`~.templates.PreparedRequest` of it, a mapping of fields,
+            or ``None``.
+
+    Returns:
+        proto.Message: ``request`` itself if it is a ``message_type`` or a
+        prepared request, a wrapper sharing a raw protobuf message, or a new
+        message.
+    """
+    if type(request) is message_type:
+        return request
+    if type(request) is templates.PreparedRequest:
+        if request.message_type is not message_type:
+            raise TypeError(
+                "Expected a prepared {0}, got {1!r}".format(
+                    message_type.__name__, request
+                )
+            )
+        return request
+    if isinstance(request, message.Message) and type(request) is message_type.pb():
+        # ``wrap`` appeared in later proto-plus releases.
+        wrap = getattr(message_type, "wrap", None)
+        if wrap is not None:
+            return wrap(request)
+    return message_type(request)
+
+
+__all__ = ("coerce",)
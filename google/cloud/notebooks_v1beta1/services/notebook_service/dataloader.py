@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Coalesce concurrent instance lookups from many coroutines.
+
+:class:`InstanceLoader` collects the names requested by all coroutines
+during one event-loop iteration, or during a short window, and resolves
+them together with a single
+:meth:`~.NotebookServiceAsyncClient.batch_get_instances` call. A name
+requested several times, or while a lookup for it is already in flight,
+is only fetched once.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+from google.api_core import exceptions  # type: ignore
+
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+class InstanceLoader:
+    """Batch and deduplicate ``get_instance`` lookups.
+
+    A loader must be used from a single event loop. It does not cache:
+    once a batch is resolved, later lookups fetch the instance again.
+
+    Args:
+        client (~.NotebookServiceAsyncClient): The client to use.
+        window (float): How long to collect names before dispatching a
+            batch, in seconds. With the default of 0, a batch holds the
+            names requested during the current event-loop iteration.
+        max_batch_size (int): Dispatch a batch as soon as it holds this
+            many names.
+        batch_kwargs: Additional arguments, such as ``max_concurrency``,
+            ``timeout`` and ``metadata``, passed to
+            :meth:`~.NotebookServiceAsyncClient.batch_get_instances`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        window: float = 0.0,
+        max_batch_size: int = 1000,
+        **batch_kwargs
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        self._client = client
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._batch_kwargs = batch_kwargs
+        self._pending = {}  # type: Dict[str, asyncio.Future]
+        self._inflight = {}  # type: Dict[str, asyncio.Future]
+        self._handle = None  # type: Optional[asyncio.Handle]
+        self._tasks = set()  # type: set
+        self.loads = 0
+        self.batches = 0
+
+    async def load(self, name: str) -> instance.Instance:
+        """Get an instance.
+
+        Args:
+            name (str): The instance name.
+
+        Returns:
+            ~.instance.Instance: The instance.
+
+        Raises:
+            google.api_core.exceptions.NotFound: If the instance does not
+                exist.
+        """
+        self.loads += 1
+        future = self._inflight.get(name) or self._pending.get(name)
+        if future is None:
+            loop = asyncio.get_event_loop()
+            future = loop.create_future()
+            self._pending[name] = future
+            if len(self._pending) >= self._max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                if self._window > 0:
+                    self._handle = loop.call_later(self._window, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+        # Shield the shared future, so that one cancelled caller does not
+        # cancel the lookup for everyone else.
+        return await asyncio.shield(future)
+
+    async def load_many(self, names: Sequence[str]) -> List[instance.Instance]:
+        """Get several instances, in order.
+
+        Raises:
+            google.api_core.exceptions.NotFound: If an instance does not
+                exist.
+        """
+        return list(await asyncio.gather(*[self.load(name) for name in names]))
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._inflight.update(batch)
+        self.batches += 1
+        task = asyncio.ensure_future(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[str, asyncio.Future]) -> None:
+        names = list(batch)
+        try:
+            results = await self._client.batch_get_instances(
+                names, **self._batch_kwargs
+            )
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for name, result in zip(names, results):
+                future = batch[name]
+                if future.done():
+                    continue
+                if result is None:
+                    future.set_exception(
+                        exceptions.NotFound("Instance {0} not found".format(name))
+                    )
+                else:
+                    future.set_result(result)
+        finally:
+            for name, future in batch.items():
+                if self._inflight.get(name) is future:
+                    del self._inflight[name]
+                # The batch itself was cancelled.
+                if not future.done():
+                    future.cancel()
+                # Nobody may be left awaiting a failed lookup; retrieve the
+                # exception so that it is not logged as unhandled.
+                if future.done() and not future.cancelled():
+                    future.exception()
+
+
+__all__ = ("InstanceLoader",)
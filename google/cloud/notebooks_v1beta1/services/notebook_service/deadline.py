@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""End-to-end deadlines spanning retries, pages and long-running operations.
+
+The ``timeout`` of a client method applies to each attempt separately, so
+retries, later pages and waiting for an operation can take much longer.
+A :class:`Deadline` passed as the ``timeout`` of any method instead bounds
+the whole call: every attempt is sent with the time remaining as its gRPC
+deadline, retries stop when it passes, and the pages of a pager share it::
+
+    budget = deadline.Deadline(30)
+    for item in client.list_instances(request={"parent": parent}, timeout=budget):
+        ...
+    op = client.start_instance(request={"name": name}, timeout=budget)
+    result = budget.result(op)
+
+Once the deadline has passed, or after :meth:`Deadline.cancel`, no new
+attempt is sent.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import time
+from typing import Any, Callable
+
+from google.api_core import exceptions  # type: ignore
+from google.api_core import gapic_v1  # type: ignore
+
+
+class Deadline:
+    """A point in time by which a call must complete.
+
+    A deadline is also a timeout decorator, as accepted by
+    :func:`google.api_core.gapic_v1.method.wrap_method`, which sends each
+    attempt with the time remaining.
+
+    Args:
+        timeout (float): The seconds from now until the deadline.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self._expires = time.monotonic() + timeout
+        self._cancelled = False
+
+    @property
+    def expires(self) -> float:
+        """float: The deadline, on the :func:`time.monotonic` clock."""
+        return self._expires
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: Whether the caller has given up."""
+        return self._cancelled
+
+    @property
+    def expired(self) -> bool:
+        """bool: Whether no time remains."""
+        return self.remaining() <= 0
+
+    def remaining(self) -> float:
+        """Return the seconds remaining, or 0 if none remain."""
+        if self._cancelled:
+            return 0.0
+        return max(0.0, self._expires - time.monotonic())
+
+    def cancel(self) -> None:
+        """Give up: calls using this deadline send no further attempts."""
+        self._cancelled = True
+
+    def check(self) -> None:
+        """Raise if no time remains.
+
+        Raises:
+            google.api_core.exceptions.Cancelled: If the deadline was
+                cancelled.
+            google.api_core.exceptions.DeadlineExceeded: If the deadline
+                has passed.
+        """
+        if self._cancelled:
+            # Not a DeadlineExceeded, which retry predicates often match.
+            raise exceptions.Cancelled("Deadline cancelled")
+        if self._expires <= time.monotonic():
+            raise exceptions.DeadlineExceeded("Deadline exceeded")
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def func_with_timeout(*args, **kwargs):
+            self.check()
+            kwargs["timeout"] = self.remaining()
+            return func(*args, **kwargs)
+
+        return func_with_timeout
+
+    def result(self, future: Any) -> Any:
+        """Wait for a long-running operation to complete within the deadline.
+
+        Args:
+            future (google.api_core.operation.Operation): The operation.
+
+        Returns:
+            Any: The result of the operation.
+
+        Raises:
+            google.api_core.exceptions.DeadlineExceeded: If the operation
+                did not complete in time.
+        """
+        self.check()
+        try:
+            return future.result(timeout=self.remaining())
+        except concurrent.futures.TimeoutError:
+            raise exceptions.DeadlineExceeded("Deadline exceeded")
+
+    async def result_async(self, future: Any) -> Any:
+        """Wait for an async long-running operation within the deadline.
+
+        See :meth:`result`.
+        """
+        self.check()
+        try:
+            return await future.result(timeout=self.remaining())
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            raise exceptions.DeadlineExceeded("Deadline exceeded")
+
+    def __repr__(self) -> str:
+        return "{0}<remaining={1:.3f}s>".format(
+            self.__class__.__name__, self.remaining()
+        )
+
+
+def wrap(rpc: Callable[..., Any]) -> Callable[..., Any]:
+    """Bound the retries of a wrapped RPC method by a :class:`Deadline`.
+
+    Calls whose ``timeout`` is a :class:`Deadline` fail without being sent
+    once it has passed, and their retry stops with it. Other calls are
+    left alone.
+
+    Args:
+        rpc (Callable[..., Any]): The method, as returned by
+            :func:`google.api_core.gapic_v1.method.wrap_method` or
+            :func:`google.api_core.gapic_v1.method_async.wrap_method`.
+
+    Returns:
+        Callable[..., Any]: A callable with the same signature.
+    """
+
+    def bounded(*args, **kwargs):
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, Deadline):
+            timeout.check()
+            retry = kwargs.get("retry")
+            if retry is not None and retry is not gapic_v1.method.DEFAULT:
+                kwargs["retry"] = retry.with_deadline(timeout.remaining())
+        return rpc(*args, **kwargs)
+
+    return bounded
+
+
+def bind(rpc: Callable[..., Any], retry: Any, timeout: Any) -> Callable[..., Any]:
+    """Make the later pages of a paged method share a :class:`Deadline`.
+
+    Args:
+        rpc (Callable[..., Any]): The paged method.
+        retry (Any): The retry of the first page.
+        timeout (Any): The timeout of the first page.
+
+    Returns:
+        Callable[..., Any]: ``rpc`` with ``retry`` and ``timeout`` bound if
+        ``timeout`` is a :class:`Deadline`, or ``rpc`` itself.
+    """
+    if isinstance(timeout, Deadline):
+        return functools.partial(rpc, retry=retry, timeout=timeout)
+    return rpc
+
+
+__all__ = (
+    "Deadline",
+    "bind",
+    "wrap",
+)
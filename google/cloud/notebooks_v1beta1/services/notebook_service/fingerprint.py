@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Stable content fingerprints for instances and environments.
+
+A fingerprint is a short digest of the deterministic serialization of a
+message, in which map entries such as ``labels`` and ``metadata`` are
+written in key order. Equal messages always have equal fingerprints, in
+any process, so two snapshots of a fleet can be compared by fingerprint
+instead of field by field.
+"""
+
+import collections
+import hashlib
+from typing import Any, Dict, Iterable, Mapping, Sequence
+
+import proto  # type: ignore
+
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+DIGEST_SIZE = 16
+"""The size of a fingerprint, in bytes."""
+
+INSTANCE_OUTPUT_ONLY_FIELDS = ("proxy_uri", "state", "create_time", "update_time")
+"""Output-only ``Instance`` fields that change without a configuration change.
+
+The output-only ``name`` is left out since it identifies the instance.
+"""
+
+ENVIRONMENT_OUTPUT_ONLY_FIELDS = ("create_time",)
+"""Output-only ``Environment`` fields, except ``name``."""
+
+_OUTPUT_ONLY_FIELDS = {
+    instance.Instance.pb(): INSTANCE_OUTPUT_ONLY_FIELDS,
+    environment.Environment.pb(): ENVIRONMENT_OUTPUT_ONLY_FIELDS,
+}
+
+SnapshotDiff = collections.namedtuple(
+    "SnapshotDiff", ["added", "removed", "changed", "unchanged"]
+)
+SnapshotDiff.__doc__ = """The difference between two fingerprint snapshots.
+
+Each attribute is a sorted list of resource names.
+"""
+
+
+def _raw(message: Any) -> Any:
+    if isinstance(message, proto.Message):
+        return type(message).pb(message)
+    return message
+
+
+def canonical_bytes(
+    message: Any, *, exclude: Sequence[str] = (), exclude_output_only: bool = False
+) -> bytes:
+    """Return the canonical serialization of a message.
+
+    Args:
+        message (Union[~.instance.Instance, ~.environment.Environment]):
+            The message. Raw protobuf messages are accepted too.
+        exclude (Sequence[str]): Names of top-level fields to leave out.
+        exclude_output_only (bool): Whether to also leave out the
+            output-only fields listed in :data:`INSTANCE_OUTPUT_ONLY_FIELDS`
+            or :data:`ENVIRONMENT_OUTPUT_ONLY_FIELDS`.
+
+    Returns:
+        bytes: The deterministic serialization, with map entries sorted.
+    """
+    pb = _raw(message)
+    fields = tuple(exclude)
+    if exclude_output_only:
+        fields += _OUTPUT_ONLY_FIELDS.get(type(pb), ())
+    if not fields:
+        return pb.SerializeToString(deterministic=True)
+
+    known = pb.DESCRIPTOR.fields_by_name
+    for field in fields:
+        if field not in known:
+            raise ValueError("{0} has no field {1!r}".format(pb.DESCRIPTOR.name, field))
+    present = {descriptor.name for descriptor, _ in pb.ListFields()}
+    fields = [field for field in fields if field in present]
+    if fields:
+        stripped = type(pb)()
+        stripped.CopyFrom(pb)
+        for field in fields:
+            stripped.ClearField(field)
+        pb = stripped
+    return pb.SerializeToString(deterministic=True)
+
+
+def fingerprint(
+    message: Any, *, exclude: Sequence[str] = (), exclude_output_only: bool = False
+) -> bytes:
+    """Return a stable fingerprint of a message.
+
+    Args:
+        message (Union[~.instance.Instance, ~.environment.Environment]):
+            The message. Raw protobuf messages are accepted too.
+        exclude (Sequence[str]): Names of top-level fields to leave out.
+        exclude_output_only (bool): Whether to also leave out the
+            output-only fields of the message type.
+
+    Returns:
+        bytes: A :data:`DIGEST_SIZE`-byte BLAKE2b digest of
+        :func:`canonical_bytes`.
+    """
+    data = canonical_bytes(
+        message, exclude=exclude, exclude_output_only=exclude_output_only
+    )
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def fingerprints(
+    messages: Iterable[Any],
+    *,
+    exclude: Sequence[str] = (),
+    exclude_output_only: bool = False
+) -> Dict[str, bytes]:
+    """Fingerprint a collection of messages, keyed by resource name.
+
+    Args:
+        messages (Iterable[Union[~.instance.Instance, ~.environment.Environment]]):
+            The messages, for example a pager or a page's ``instances``.
+        exclude (Sequence[str]): Names of top-level fields to leave out.
+        exclude_output_only (bool): Whether to also leave out the
+            output-only fields of the message type.
+
+    Returns:
+        Dict[str, bytes]: The fingerprint of every message, by ``name``.
+    """
+    result = {}
+    for message in messages:
+        pb = _raw(message)
+        result[pb.name] = fingerprint(
+            pb, exclude=exclude, exclude_output_only=exclude_output_only
+        )
+    return result
+
+
+def diff(old: Mapping[str, bytes], new: Mapping[str, bytes]) -> SnapshotDiff:
+    """Compare two snapshots produced by :func:`fingerprints`.
+
+    Args:
+        old (Mapping[str, bytes]): The previous snapshot.
+        new (Mapping[str, bytes]): The current snapshot.
+
+    Returns:
+        ~.SnapshotDiff: The names added, removed, changed and unchanged.
+    """
+    added = []
+    changed = []
+    unchanged = []
+    for name, digest in new.items():
+        previous = old.get(name)
+        if previous is None:
+            added.append(name)
+        elif previous == digest:
+            unchanged.append(name)
+        else:
+            changed.append(name)
+    removed = [name for name in old if name not in new]
+    return SnapshotDiff(
+        added=sorted(added),
+        removed=sorted(removed),
+        changed=sorted(changed),
+        unchanged=sorted(unchanged),
+    )
+
+
+__all__ = (
+    "DIGEST_SIZE",
+    "ENVIRONMENT_OUTPUT_ONLY_FIELDS",
+    "INSTANCE_OUTPUT_ONLY_FIELDS",
+    "SnapshotDiff",
+    "canonical_bytes",
+    "diff",
+    "fingerprint",
+    "fingerprints",
+)
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""String interning for bulk-decoded instances and environments.
+
+Fleets tend to repeat the same machine types, networks, service accounts,
+images and label keys across thousands of records, but every decoded page
+allocates fresh copies of those strings. An :class:`InternTable` maps each
+distinct value to one shared string object, and the helpers in this module
+rewrite decoded messages to use the shared objects.
+
+With the pure-Python protobuf runtime, messages keep references to the
+assigned strings, so interning shrinks the decoded messages themselves.
+The C++ and upb runtimes copy strings into the message on assignment; with
+those runtimes the savings apply to values read out of the messages, for
+example by passing the table as the ``intern`` function of
+:func:`~.summary.summarize`.
+"""
+
+import collections
+import threading
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Type,
+    TypeVar,
+)
+
+import proto  # type: ignore
+
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+_M = TypeVar("_M")
+
+_INSTANCE_FIELDS = (
+    "machine_type",
+    "network",
+    "subnet",
+    "service_account",
+    "post_startup_script",
+    "custom_gpu_driver_path",
+    "kms_key",
+)
+_ENVIRONMENT_FIELDS = ("post_startup_script",)
+_IMAGE_FIELDS = {
+    "vm_image": ("project", "image_family", "image_name"),
+    "container_image": ("repository", "tag"),
+}
+
+
+class InternTable:
+    """A bounded table of canonical string objects.
+
+    Calling the table with a string returns the canonical object equal to
+    it, adding the string if it has not been seen before. Once ``maxsize``
+    distinct strings are held, the least recently used one is dropped;
+    strings already handed out stay valid, they are just no longer shared
+    with later lookups.
+
+    The table is safe to share between threads and across pages.
+
+    Args:
+        maxsize (int): The maximum number of distinct strings to hold.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self._maxsize = maxsize
+        self._strings = collections.OrderedDict()  # type: collections.OrderedDict
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """int: The maximum number of distinct strings held."""
+        return self._maxsize
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._strings
+
+    def __call__(self, value: str) -> str:
+        """Return the canonical object for ``value``."""
+        with self._lock:
+            strings = self._strings
+            canonical = strings.get(value)
+            if canonical is not None:
+                strings.move_to_end(value)
+                self.hits += 1
+                return canonical
+            strings[value] = value
+            self.misses += 1
+            if len(strings) > self._maxsize:
+                strings.popitem(last=False)
+            return value
+
+    def clear(self) -> None:
+        """Drop every string held by the table."""
+        with self._lock:
+            self._strings.clear()
+
+
+def _raw(message: Any) -> Any:
+    if isinstance(message, proto.Message):
+        return type(message).pb(message)
+    return message
+
+
+def _intern_fields(pb: Any, fields: Iterable[str], table: InternTable) -> None:
+    for field in fields:
+        value = getattr(pb, field)
+        if value:
+            setattr(pb, field, table(value))
+
+
+def _intern_image(pb: Any, oneof: str, table: InternTable) -> None:
+    which = pb.WhichOneof(oneof)
+    if which:
+        _intern_fields(getattr(pb, which), _IMAGE_FIELDS[which], table)
+
+
+def _intern_map(mapping: Any, table: InternTable, values: bool) -> None:
+    if not mapping:
+        return
+    items = [
+        (table(key), table(value) if values else value)
+        for key, value in mapping.items()
+    ]
+    # Keys must be removed first: assigning to an existing key keeps the
+    # original key object.
+    mapping.clear()
+    for key, value in items:
+        mapping[key] = value
+
+
+def _intern_instance_pb(pb: Any, table: InternTable) -> None:
+    _intern_fields(pb, _INSTANCE_FIELDS, table)
+    _intern_image(pb, "environment", table)
+    _intern_map(pb.labels, table, values=True)
+    _intern_map(pb.metadata, table, values=False)
+
+
+def _intern_environment_pb(pb: Any, table: InternTable) -> None:
+    _intern_fields(pb, _ENVIRONMENT_FIELDS, table)
+    _intern_image(pb, "image_type", table)
+
+
+_INTERNERS = {
+    instance.Instance.pb(): _intern_instance_pb,
+    environment.Environment.pb(): _intern_environment_pb,
+}
+
+
+def intern_message(message: _M, table: InternTable) -> _M:
+    """Rewrite the repetitive strings of a message to use shared objects.
+
+    Args:
+        message (Union[~.instance.Instance, ~.environment.Environment, ~.service.ListInstancesResponse, ~.service.ListEnvironmentsResponse]):
+            The message to rewrite in place. Raw protobuf messages are
+            accepted too.
+        table (~.InternTable): The table holding the shared strings.
+
+    Returns:
+        The same message, for convenience.
+
+    Raises:
+        TypeError: If the message type is not supported.
+    """
+    pb = _raw(message)
+    if isinstance(pb, service.ListInstancesResponse.pb()):
+        for item in pb.instances:
+            _intern_instance_pb(item, table)
+    elif isinstance(pb, service.ListEnvironmentsResponse.pb()):
+        for item in pb.environments:
+            _intern_environment_pb(item, table)
+    else:
+        interner = _INTERNERS.get(type(pb))
+        if interner is None:
+            raise TypeError(
+                "Cannot intern strings of {0}".format(type(message).__name__)
+            )
+        interner(pb, table)
+    return message
+
+
+def deserializer(message_type: Type[_M], table: InternTable) -> Callable[[bytes], _M]:
+    """Return a deserializer that interns strings of every decoded message.
+
+    The result can be used wherever ``message_type.deserialize`` is, for
+    example as the ``response_deserializer`` of a gRPC stub.
+
+    Args:
+        message_type (Type): One of the message types accepted by
+            :func:`intern_message`.
+        table (~.InternTable): The table holding the shared strings.
+
+    Returns:
+        Callable[[bytes], Any]: The deserializer.
+    """
+
+    def deserialize(payload: bytes) -> _M:
+        return intern_message(message_type.deserialize(payload), table)
+
+    return deserialize
+
+
+def intern_pages(pages: Iterable[_M], table: InternTable) -> Iterator[_M]:
+    """Intern the strings of every page as it is fetched.
+
+    Example:
+        >>> table = interning.InternTable()
+        >>> pager = client.list_instances(request={"parent": parent})
+        >>> for page in interning.intern_pages(pager.pages, table):
+        ...     instances.extend(page.instances)
+
+    Args:
+        pages (Iterable[Union[~.service.ListInstancesResponse, ~.service.ListEnvironmentsResponse]]):
+            The pages, typically the ``pages`` of a
+            :class:`~.pagers.ListInstancesPager` or
+            :class:`~.pagers.ListEnvironmentsPager`.
+        table (~.InternTable): The table shared by all pages.
+
+    Yields:
+        The pages, with their strings interned.
+    """
+    for page in pages:
+        yield intern_message(page, table)
+
+
+async def intern_pages_async(
+    pages: AsyncIterable[_M], table: InternTable
+) -> AsyncIterator[_M]:
+    """Like :func:`intern_pages`, for the ``pages`` of an async pager."""
+    async for page in pages:
+        yield intern_message(page, table)
+
+
+__all__ = (
+    "InternTable",
+    "deserializer",
+    "intern_message",
+    "intern_pages",
+    "intern_pages_async",
+)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Coalesce label changes into one ``set_instance_labels`` per instance.
+
+``set_instance_labels`` replaces the whole label map and starts a
+long-running operation, so setting labels one at a time starts one
+operation per change, and operations on the same instance may finish out
+of order. :class:`LabelWriter` buffers the changes to each instance for a
+short delay and then sends the resulting map in one request, waiting for
+the operation to finish before sending the next request for the same
+instance::
+
+    with labels.LabelWriter(client) as writer:
+        writer.update(name, {"owner": "ml-team"})
+        writer.remove(name, "scratch")
+
+The label map a change applies to is read with ``get_instance``, unless
+the change was queued while an earlier write to the instance was in
+flight; it then applies to the map that write sent. Labels set by other
+writers between two bursts of changes are kept.
+"""
+
+import concurrent.futures
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+
+class _Pending:
+    __slots__ = ("changes", "futures", "since")
+
+    def __init__(self) -> None:
+        # Label values by key; ``None`` removes the label.
+        self.changes = {}  # type: Dict[str, Optional[str]]
+        self.futures = []  # type: List[concurrent.futures.Future]
+        self.since = time.monotonic()
+
+
+class LabelWriter:
+    """Buffer label changes and write them behind, one instance at a time.
+
+    Args:
+        client (~.NotebookServiceClient): The client to use.
+        delay (float): How long to buffer the changes to an instance after
+            the first one, in seconds.
+        max_workers (int): The maximum number of instances written
+            concurrently.
+        operation_timeout (Optional[float]): How long to wait for each
+            ``set_instance_labels`` operation to finish, in seconds.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        delay: float = 1.0,
+        max_workers: int = 8,
+        operation_timeout: Optional[float] = None
+    ) -> None:
+        if delay < 0:
+            raise ValueError("delay must not be negative")
+        self._client = client
+        self._delay = delay
+        self._operation_timeout = operation_timeout
+        self._cond = threading.Condition()
+        self._pending = {}  # type: Dict[str, _Pending]
+        self._in_flight = set()  # type: Set[str]
+        self._labels = {}  # type: Dict[str, Dict[str, str]]
+        self._flushing = 0
+        self._closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._thread = threading.Thread(
+            target=self._run, name="LabelWriter", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """int: The number of instances with changes not yet written."""
+        with self._cond:
+            return len(self._pending) + len(self._in_flight)
+
+    def update(
+        self, name: str, labels: Mapping[str, Optional[str]]
+    ) -> concurrent.futures.Future:
+        """Set labels of an instance, keeping the others.
+
+        Args:
+            name (str): The instance name.
+            labels (Mapping[str, Optional[str]]): The labels to set; a
+                value of ``None`` removes the label.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the full label map
+            written, or to the error of the write.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+        """
+        future = concurrent.futures.Future()  # type: concurrent.futures.Future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("LabelWriter is closed")
+            pending = self._pending.get(name)
+            if pending is None:
+                pending = self._pending[name] = _Pending()
+                self._cond.notify_all()
+            pending.changes.update(labels)
+            pending.futures.append(future)
+        return future
+
+    def remove(self, name: str, *keys: str) -> concurrent.futures.Future:
+        """Remove labels of an instance.
+
+        See :meth:`update`.
+        """
+        return self.update(name, dict.fromkeys(keys))
+
+    def flush(self) -> None:
+        """Write every buffered change now and wait for the writes."""
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    self._cond.wait()
+            finally:
+                self._flushing -= 1
+
+    def close(self) -> None:
+        """Write every buffered change and stop accepting new ones."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._flushing += 1
+            self._cond.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "LabelWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wakeup = None  # type: Optional[float]
+                for name, pending in list(self._pending.items()):
+                    if name in self._in_flight:
+                        # Writes to one instance are sent in order.
+                        continue
+                    due = pending.since + self._delay
+                    if self._flushing or due <= now:
+                        del self._pending[name]
+                        self._in_flight.add(name)
+                        self._executor.submit(self._write, name, pending)
+                    elif wakeup is None or due < wakeup:
+                        wakeup = due
+                if self._closed and not self._pending and not self._in_flight:
+                    return
+                self._cond.wait(None if wakeup is None else wakeup - now)
+
+    def _write(self, name: str, pending: _Pending) -> None:
+        labels = None  # type: Optional[Dict[str, str]]
+        try:
+            with self._cond:
+                base = self._labels.get(name)
+            if base is None:
+                instance = self._client.get_instance(request={"name": name})
+                base = dict(instance.labels)
+            labels = dict(base)
+            for key, value in pending.changes.items():
+                if value is None:
+                    labels.pop(key, None)
+                else:
+                    labels[key] = value
+            if labels != base:
+                op = self._client.set_instance_labels(
+                    request={"name": name, "labels": labels}
+                )
+                op.result(timeout=self._operation_timeout)
+        except Exception as exc:
+            # The labels may have changed; read them again next time.
+            labels = None
+            for future in pending.futures:
+                future.set_exception(exc)
+        else:
+            for future in pending.futures:
+                future.set_result(dict(labels))
+        finally:
+            with self._cond:
+                self._in_flight.discard(name)
+                # Only the changes queued behind this write build on it;
+                # later ones read the labels again, as other writers may
+                # have changed them meanwhile.
+                if labels is not None and name in self._pending:
+                    self._labels[name] = labels
+                else:
+                    self._labels.pop(name, None)
+                self._cond.notify_all()
+
+    def __repr__(self) -> str:
+        return "{0}<pending={1}>".format(self.__class__.__name__, self.pending)
+
+
+__all__ = ("LabelWriter",)
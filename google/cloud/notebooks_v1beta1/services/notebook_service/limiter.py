@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""An adaptive limit on the number of RPCs in flight.
+
+:class:`AdaptiveLimiter` applies additive-increase/multiplicative-decrease
+(AIMD) to the number of concurrent RPCs. Each successful RPC whose latency
+stays close to the best latency seen for its method raises the limit by
+``increase / limit``, about ``increase`` per round of RPCs. A
+``RESOURCE_EXHAUSTED`` or ``UNAVAILABLE`` error multiplies the limit by
+``backoff``. RPCs that started before the last decrease do not decrease it
+again, so a burst of errors from one round only counts once.
+
+One limiter can be shared by any number of sync and async clients, threads
+and event loops::
+
+    shared = limiter.shared_limiter()
+    client = NotebookServiceClient(concurrency_limiter=shared)
+    async_client = NotebookServiceAsyncClient(concurrency_limiter=shared)
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from google.api_core import exceptions  # type: ignore
+
+
+OVERLOAD_ERRORS = (
+    exceptions.ResourceExhausted,
+    exceptions.TooManyRequests,
+    exceptions.ServiceUnavailable,
+)
+"""Errors signalling that the service or quota is overloaded."""
+
+
+class AdaptiveLimiter:
+    """Limit concurrent RPCs with AIMD.
+
+    Args:
+        initial_limit (float): The starting limit.
+        min_limit (float): The lowest the limit can go.
+        max_limit (float): The highest the limit can go.
+        increase (float): How much a full round of healthy RPCs raises the
+            limit.
+        backoff (float): The factor applied to the limit on overload.
+        latency_tolerance (float): How many times slower than the best
+            latency seen for its method an RPC may be and still be
+            considered healthy.
+        on_limit_change (Optional[Callable[[float], None]]): Called with
+            the new limit whenever it changes, for example to export it as
+            a metric. It is called while holding the limiter's lock and
+            must not block.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 16,
+        *,
+        min_limit: float = 1,
+        max_limit: float = 1000,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        on_limit_change: Optional[Callable[[float], None]] = None
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase = increase
+        self._backoff = backoff
+        self._latency_tolerance = latency_tolerance
+        self._on_limit_change = on_limit_change
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Either ``threading.Event`` or ``(loop, future)`` items, in order.
+        self._waiters = collections.deque()  # type: collections.deque
+        self._best_latency = {}  # type: Dict[str, float]
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> float:
+        """float: The current limit on RPCs in flight."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """int: The number of RPCs in flight."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """int: The number of callers waiting for a slot."""
+        return len(self._waiters)
+
+    def _has_room(self) -> bool:
+        return self._in_flight < max(1, int(self._limit))
+
+    def _grant_waiters(self) -> None:
+        # Must hold the lock.
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                loop.call_soon_threadsafe(self._deliver, future)
+
+    def _deliver(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self._release_slot()
+        else:
+            future.set_result(None)
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._grant_waiters()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot.
+
+        Args:
+            timeout (Optional[float]): How long to wait, in seconds.
+
+        Returns:
+            bool: Whether a slot was acquired.
+        """
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self._in_flight += 1
+                return True
+            event = threading.Event()
+            self._waiters.append(event)
+        if event.wait(timeout):
+            return True
+        with self._lock:
+            try:
+                self._waiters.remove(event)
+            except ValueError:
+                # Granted just after the timeout.
+                return True
+        return False
+
+    async def acquire_async(self) -> None:
+        """Wait for a slot without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self._in_flight += 1
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = True
+            # A grant to a cancelled future is returned by ``_deliver``.
+            if granted and future.done() and not future.cancelled():
+                self._release_slot()
+            raise
+
+    def release(self, method: str, started: float, error: Any = None) -> None:
+        """Return a slot and adjust the limit.
+
+        Args:
+            method (str): The RPC method name.
+            started (float): When the RPC started, from
+                :func:`time.monotonic`.
+            error (Any): The exception raised by the RPC, if any.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            previous = self._limit
+            if isinstance(error, OVERLOAD_ERRORS):
+                if started >= self._last_decrease:
+                    self._limit = max(self._min_limit, self._limit * self._backoff)
+                    self._last_decrease = now
+            elif error is None:
+                latency = now - started
+                best = self._best_latency.get(method)
+                if best is None or latency < best:
+                    self._best_latency[method] = best = latency
+                if latency <= best * self._latency_tolerance:
+                    self._limit = min(
+                        self._max_limit, self._limit + self._increase / self._limit
+                    )
+            if self._limit != previous and self._on_limit_change is not None:
+                self._on_limit_change(self._limit)
+            self._grant_waiters()
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Limit the calls of a wrapped RPC method.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def limited(*args, **kwargs):
+            self.acquire()
+            started = time.monotonic()
+            error = None
+            try:
+                return rpc(*args, **kwargs)
+            except BaseException as exc:
+                error = exc
+                raise
+            finally:
+                self.release(method, started, error)
+
+        return limited
+
+    def wrap_async(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Limit the calls of a wrapped async RPC method.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Awaitable[Any]]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method_async.wrap_method`.
+
+        Returns:
+            Callable[..., Awaitable[Any]]: A callable with the same
+            signature.
+        """
+
+        async def limited(*args, **kwargs):
+            await self.acquire_async()
+            started = time.monotonic()
+            error = None
+            try:
+                return await rpc(*args, **kwargs)
+            except BaseException as exc:
+                error = exc
+                raise
+            finally:
+                self.release(method, started, error)
+
+        return limited
+
+    def __repr__(self) -> str:
+        return "{0}<limit={1:.1f} in_flight={2} waiting={3}>".format(
+            self.__class__.__name__, self._limit, self._in_flight, len(self._waiters)
+        )
+
+
+_shared = None  # type: Optional[AdaptiveLimiter]
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> AdaptiveLimiter:
+    """Return the process-wide limiter, creating it on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = AdaptiveLimiter()
+        return _shared
+
+
+__all__ = (
+    "AdaptiveLimiter",
+    "OVERLOAD_ERRORS",
+    "shared_limiter",
+)
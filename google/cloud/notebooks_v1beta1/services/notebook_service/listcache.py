@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Stale-while-revalidate caching of list results.
+
+Listing a slowly changing collection such as the environments of a
+parent pages through every result on each call. :class:`ListCache` and
+:class:`AsyncListCache` keep the last complete listing of each parent and
+serve it without any RPC:
+
+* younger than ``soft_ttl``, the snapshot is returned as is;
+* older than ``soft_ttl``, it is returned as is while a refresh runs in
+  the background;
+* older than ``hard_ttl``, or missing, the caller waits for a refresh.
+
+Concurrent callers share a single refresh per parent, and a snapshot is
+only replaced by a listing that went through every page. A failed
+background refresh keeps the previous snapshot::
+
+    environments = listcache.ListCache(client, soft_ttl=60, hard_ttl=3600)
+    for env in environments.get(parent):
+        ...
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    __slots__ = ("items", "fetched")
+
+    def __init__(self, items: Tuple[Any, ...]) -> None:
+        self.items = items
+        self.fetched = time.monotonic()
+
+
+class _BaseListCache:
+    def __init__(
+        self,
+        client: Any,
+        *,
+        method: str = "list_environments",
+        soft_ttl: float = 60.0,
+        hard_ttl: float = 3600.0,
+        **list_kwargs
+    ) -> None:
+        if soft_ttl < 0 or hard_ttl < soft_ttl:
+            raise ValueError("Expected 0 <= soft_ttl <= hard_ttl")
+        self._list = getattr(client, method)
+        self._method = method
+        self._soft_ttl = soft_ttl
+        self._hard_ttl = hard_ttl
+        self._list_kwargs = list_kwargs
+        self._snapshots = {}  # type: Dict[str, _Snapshot]
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _lookup(self, parent: str) -> Tuple[Optional[_Snapshot], bool]:
+        """Return the usable snapshot, if any, and whether to refresh it."""
+        snapshot = self._snapshots.get(parent)
+        if snapshot is None:
+            self.misses += 1
+            return None, True
+        age = time.monotonic() - snapshot.fetched
+        if age >= self._hard_ttl:
+            self.misses += 1
+            return None, True
+        if age >= self._soft_ttl:
+            self.stale_hits += 1
+            return snapshot, True
+        self.hits += 1
+        return snapshot, False
+
+    def _store(self, parent: str, items: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        self._snapshots[parent] = _Snapshot(items)
+        self.refreshes += 1
+        return items
+
+    def invalidate(self, parent: Optional[str] = None) -> None:
+        """Forget the snapshot of a parent, or of every parent."""
+        if parent is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(parent, None)
+
+    def __repr__(self) -> str:
+        return "{0}<{1} parents={2} hits={3} stale_hits={4} misses={5}>".format(
+            self.__class__.__name__,
+            self._method,
+            len(self._snapshots),
+            self.hits,
+            self.stale_hits,
+            self.misses,
+        )
+
+
+class ListCache(_BaseListCache):
+    """Serve list results from a snapshot refreshed in the background.
+
+    Args:
+        client (~.NotebookServiceClient): The client to use.
+        method (str): The paged client method, e.g. ``list_environments``
+            or ``list_instances``.
+        soft_ttl (float): The age after which a snapshot is refreshed in
+            the background, in seconds.
+        hard_ttl (float): The age after which a snapshot is no longer
+            served, in seconds.
+        list_kwargs: Additional arguments, such as ``timeout`` and
+            ``metadata``, passed to the client method.
+
+    Attributes:
+        hits (int): Calls served from a fresh snapshot.
+        stale_hits (int): Calls served from a snapshot being refreshed.
+        misses (int): Calls that waited for a listing.
+        refreshes (int): Complete listings stored.
+    """
+
+    def __init__(self, client: Any, **kwargs) -> None:
+        super().__init__(client, **kwargs)
+        self._lock = threading.Lock()
+        self._refreshing = {}  # type: Dict[str, concurrent.futures.Future]
+
+    def get(self, parent: str) -> Tuple[Any, ...]:
+        """Return every item of a parent.
+
+        Args:
+            parent (str): The parent, e.g. ``projects/{project_id}/locations/{location}``.
+
+        Returns:
+            Tuple[Any, ...]: The items, shared with other callers; they
+            must not be modified.
+
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: If a listing
+                had to be waited for and failed.
+        """
+        with self._lock:
+            snapshot, refresh = self._lookup(parent)
+            future = self._refresh(parent) if refresh else None
+        if snapshot is not None:
+            return snapshot.items
+        return future.result()
+
+    def _refresh(self, parent: str) -> concurrent.futures.Future:
+        # Must hold the lock.
+        future = self._refreshing.get(parent)
+        if future is None:
+            future = self._refreshing[parent] = concurrent.futures.Future()
+            threading.Thread(
+                target=self._fetch,
+                args=(parent, future),
+                name="ListCache:" + parent,
+                daemon=True,
+            ).start()
+        return future
+
+    def _fetch(self, parent: str, future: concurrent.futures.Future) -> None:
+        try:
+            items = tuple(self._list(request={"parent": parent}, **self._list_kwargs))
+        except Exception as exc:
+            _LOGGER.warning("Listing %s of %s failed: %s", self._method, parent, exc)
+            with self._lock:
+                del self._refreshing[parent]
+            future.set_exception(exc)
+        else:
+            with self._lock:
+                self._store(parent, items)
+                del self._refreshing[parent]
+            future.set_result(items)
+
+    def invalidate(self, parent: Optional[str] = None) -> None:
+        """Forget the snapshot of a parent, or of every parent."""
+        with self._lock:
+            super().invalidate(parent)
+
+
+class AsyncListCache(_BaseListCache):
+    """Serve list results from a snapshot refreshed in the background.
+
+    An async cache must be used from a single event loop. See
+    :class:`ListCache` for the arguments, with a
+    :class:`~.NotebookServiceAsyncClient` as the ``client``.
+    """
+
+    def __init__(self, client: Any, **kwargs) -> None:
+        super().__init__(client, **kwargs)
+        self._refreshing = {}  # type: Dict[str, asyncio.Future]
+
+    async def get(self, parent: str) -> Tuple[Any, ...]:
+        """Return every item of a parent.
+
+        See :meth:`ListCache.get`.
+        """
+        snapshot, refresh = self._lookup(parent)
+        future = self._refresh(parent) if refresh else None
+        if snapshot is not None:
+            return snapshot.items
+        # Shield the shared refresh, so that one cancelled caller does not
+        # cancel it for everyone else.
+        return await asyncio.shield(future)
+
+    def _refresh(self, parent: str) -> asyncio.Future:
+        future = self._refreshing.get(parent)
+        if future is None:
+            future = self._refreshing[parent] = asyncio.ensure_future(
+                self._fetch(parent)
+            )
+
+            def forget(_, parent=parent, future=future):
+                if self._refreshing.get(parent) is future:
+                    del self._refreshing[parent]
+                # Nobody may be awaiting a background refresh; retrieve the
+                # exception so that it is not logged as unhandled.
+                if not future.cancelled():
+                    future.exception()
+
+            future.add_done_callback(forget)
+        return future
+
+    async def _fetch(self, parent: str) -> Tuple[Any, ...]:
+        try:
+            pager = await self._list(request={"parent": parent}, **self._list_kwargs)
+            items = tuple([item async for item in pager])
+        except Exception as exc:
+            _LOGGER.warning("Listing %s of %s failed: %s", self._method, parent, exc)
+            raise
+        return self._store(parent, items)
+
+
+__all__ = (
+    "AsyncListCache",
+    "ListCache",
+)
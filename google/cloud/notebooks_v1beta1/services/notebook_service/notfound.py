@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Negative caching of ``NotFound`` answers by resource name.
+
+Probing the names of deleted resources costs one RPC per probe, each
+answered with ``NOT_FOUND``. A :class:`NotFoundCache` given to a client
+remembers these answers for a short time, and ``get_instance`` and
+``get_environment`` raise :class:`~google.api_core.exceptions.NotFound`
+for a remembered name without sending an RPC::
+
+    client = NotebookServiceClient(not_found_cache=notfound.NotFoundCache(ttl=10))
+
+Creating or registering a resource through the same client forgets its
+name, and its ``NotFound`` answers are not remembered until the
+long-running operation of the request is done. Resources created by
+anyone else are only seen once the TTL has passed.
+"""
+
+import collections
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from google.api_core import exceptions  # type: ignore
+
+
+class NotFoundCache:
+    """Remember which resource names were not found.
+
+    One cache can be shared by several sync and async clients.
+
+    Args:
+        ttl (float): How long a name is remembered, in seconds.
+        max_size (int): The maximum number of names remembered; the least
+            recently added are forgotten first.
+
+    Attributes:
+        hits (int): The number of lookups answered from the cache.
+    """
+
+    def __init__(self, ttl: float = 10.0, max_size: int = 10000) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self._ttl = ttl
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # Name -> (expiry, error message), oldest first.
+        self._names = collections.OrderedDict()  # type: collections.OrderedDict
+        # The names being created, with the number of creates of each.
+        self._creating = collections.Counter()  # type: collections.Counter
+        # The names created by operations not yet watched, by operation.
+        self._operations = {}  # type: Dict[str, List[str]]
+        self.hits = 0
+
+    def __len__(self) -> int:
+        """Return the number of names remembered, including expired ones."""
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return self._get(name) is not None
+
+    def _get(self, name: str) -> Any:
+        # Must hold the lock.
+        entry = self._names.get(name)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._names[name]
+            return None
+        return entry
+
+    def add(self, name: str, message: str = "") -> None:
+        """Remember that a name was not found, unless it is being created."""
+        with self._lock:
+            self._names.pop(name, None)
+            if name in self._creating:
+                return
+            self._names[name] = (time.monotonic() + self._ttl, message)
+            while len(self._names) > self._max_size:
+                self._names.popitem(last=False)
+
+    def check(self, name: str) -> None:
+        """Raise if a name is remembered as not found.
+
+        Raises:
+            google.api_core.exceptions.NotFound: If the name is remembered.
+        """
+        with self._lock:
+            entry = self._get(name)
+            if entry is None:
+                return
+            self.hits += 1
+        # A new error every time, as a raised error keeps its traceback.
+        raise exceptions.NotFound(entry[1] or "{0} not found".format(name))
+
+    def invalidate(self, name: str) -> None:
+        """Forget a name."""
+        with self._lock:
+            self._names.pop(name, None)
+
+    def clear(self) -> None:
+        """Forget every name."""
+        with self._lock:
+            self._names.clear()
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Answer the calls of a wrapped get method for remembered names.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`. Its
+                request must have a ``name``.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def cached(request, *args, **kwargs):
+            self.check(request.name)
+            try:
+                return rpc(request, *args, **kwargs)
+            except exceptions.NotFound as exc:
+                self.add(request.name, exc.message)
+                raise
+
+        return cached
+
+    def wrap_async(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Answer the calls of a wrapped async get method for remembered names.
+
+        See :meth:`wrap`.
+        """
+
+        async def cached(request, *args, **kwargs):
+            self.check(request.name)
+            try:
+                return await rpc(request, *args, **kwargs)
+            except exceptions.NotFound as exc:
+                self.add(request.name, exc.message)
+                raise
+
+        return cached
+
+    def wrap_create(
+        self, method: str, rpc: Callable[..., Any], collection: str, id_field: str
+    ) -> Callable[..., Any]:
+        """Forget the name of the resource created by a wrapped method.
+
+        ``NotFound`` answers for the name are not remembered until the
+        operation the method returns is done, as seen by :meth:`watch`.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`.
+            collection (str): The collection of the created resource, e.g.
+                ``instances``.
+            id_field (str): The request field holding the resource ID, e.g.
+                ``instance_id``.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def creating(request, *args, **kwargs):
+            name = self._begin(request, collection, id_field)
+            try:
+                response = rpc(request, *args, **kwargs)
+            except Exception:
+                self._end(name)
+                raise
+            self._started(response, name)
+            return response
+
+        return creating
+
+    def wrap_create_async(
+        self, method: str, rpc: Callable[..., Any], collection: str, id_field: str
+    ) -> Callable[..., Any]:
+        """Forget the name of the resource created by a wrapped async method.
+
+        See :meth:`wrap_create`.
+        """
+
+        async def creating(request, *args, **kwargs):
+            name = self._begin(request, collection, id_field)
+            try:
+                response = await rpc(request, *args, **kwargs)
+            except Exception:
+                self._end(name)
+                raise
+            self._started(response, name)
+            return response
+
+        return creating
+
+    def watch(self, future: Any) -> None:
+        """Remember ``NotFound`` answers again once a create is done.
+
+        Args:
+            future (Union[~.operation.Operation, ~.operation_async.AsyncOperation]):
+                The operation future of a method wrapped with
+                :meth:`wrap_create` or :meth:`wrap_create_async`. Unless the
+                operation is done, it is polled in the background.
+        """
+        with self._lock:
+            names = self._operations.get(future.operation.name)
+            if not names:
+                return
+            name = names.pop()
+            if not names:
+                del self._operations[future.operation.name]
+        future.add_done_callback(lambda _: self._end(name))
+
+    def _begin(self, request: Any, collection: str, id_field: str) -> str:
+        name = "{0}/{1}/{2}".format(
+            request.parent, collection, getattr(request, id_field)
+        )
+        with self._lock:
+            self._creating[name] += 1
+            self._names.pop(name, None)
+        return name
+
+    def _started(self, response: Any, name: str) -> None:
+        with self._lock:
+            self._operations.setdefault(response.name, []).append(name)
+
+    def _end(self, name: str) -> None:
+        with self._lock:
+            self._creating[name] -= 1
+            if self._creating[name] <= 0:
+                del self._creating[name]
+            # A probe may have raced with the end of the create.
+            self._names.pop(name, None)
+
+    def __repr__(self) -> str:
+        return "{0}<names={1} hits={2}>".format(
+            self.__class__.__name__, len(self._names), self.hits
+        )
+
+
+__all__ = ("NotFoundCache",)
@@ -15,8 +15,18 @@
 # limitations under the License.
 #
 
-from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Sequence, Tuple
-
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
 from google.cloud.notebooks_v1beta1.types import environment
 from google.cloud.notebooks_v1beta1.types import instance
 from google.cloud.notebooks_v1beta1.types import service
@@ -46,7 +56,8 @@ class ListInstancesPager:
         request: service.ListInstancesRequest,
         response: service.ListInstancesResponse,
         *,
-        metadata: Sequence[Tuple[str, str]] = ()
+        metadata: Sequence[Tuple[str, str]] = (),
+        on_complete: Optional[Callable[[int], None]] = None
     ):
         """Instantiate the pager.
 
@@ -59,22 +70,29 @@ class ListInstancesPager:
                 The initial response object.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            on_complete (Optional[Callable[[int], None]]): Called with the
+                number of instances once the last page was read.
         """
         self._method = method
-        self._request = service.ListInstancesRequest(request)
+        self._request = service.ListInstancesRequest(templates.unwrap(request))
         self._response = response
         self._metadata = metadata
+        self._on_complete = on_complete
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[service.ListInstancesResponse]:
+        count = len(self._response.instances)
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = self._method(self._request, metadata=self._metadata)
+            count += len(self._response.instances)
             yield self._response
+        if self._on_complete is not None:
+            self._on_complete(count)
 
     def __iter__(self) -> Iterable[instance.Instance]:
         for page in self.pages:
@@ -108,7 +126,8 @@ class ListInstancesAsyncPager:
         request: service.ListInstancesRequest,
         response: service.ListInstancesResponse,
         *,
-        metadata: Sequence[Tuple[str, str]] = ()
+        metadata: Sequence[Tuple[str, str]] = (),
+        on_complete: Optional[Callable[[int], None]] = None
     ):
         """Instantiate the pager.
 
@@ -121,22 +140,29 @@ class ListInstancesAsyncPager:
                 The initial response object.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            on_complete (Optional[Callable[[int], None]]): Called with the
+                number of instances once the last page was read.
         """
         self._method = method
-        self._request = service.ListInstancesRequest(request)
+        self._request = service.ListInstancesRequest(templates.unwrap(request))
         self._response = response
         self._metadata = metadata
+        self._on_complete = on_complete
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     async def pages(self) -> AsyncIterable[service.ListInstancesResponse]:
+        count = len(self._response.instances)
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = await self._method(self._request, metadata=self._metadata)
+            count += len(self._response.instances)
             yield self._response
+        if self._on_complete is not None:
+            self._on_complete(count)
 
     def __aiter__(self) -> AsyncIterable[instance.Instance]:
         async def async_generator():
@@ -189,7 +215,7 @@ class ListEnvironmentsPager:
                 sent along with the request as metadata.
         """
         self._method = method
-        self._request = service.ListEnvironmentsRequest(request)
+        self._request = service.ListEnvironmentsRequest(templates.unwrap(request))
         self._response = response
         self._metadata = metadata
 
@@ -251,7 +277,7 @@ class ListEnvironmentsAsyncPager:
                 sent along with the request as metadata.
         """
         self._method = method
-        self._request = service.ListEnvironmentsRequest(request)
+        self._request = service.ListEnvironmentsRequest(templates.unwrap(request))
         self._response = response
         self._metadata = metadata
 
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Plan the minimal set of updates bringing an instance to a desired state.
+
+Only three fields of an existing instance can be changed through the API,
+each with its own long-running method: ``labels``
+(:meth:`~.NotebookServiceClient.set_instance_labels`), ``machine_type``
+(:meth:`~.NotebookServiceClient.set_instance_machine_type`) and
+``accelerator_config``
+(:meth:`~.NotebookServiceClient.set_instance_accelerator`).
+:func:`plan_updates` compares an instance with a desired configuration and
+returns only the requests needed for the fields that actually differ.
+"""
+
+import collections
+from typing import Any, List, Optional, Sequence
+
+import proto  # type: ignore
+
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+MUTABLE_FIELDS = ("machine_type", "accelerator_config", "labels")
+"""Fields that can be updated in place, in the order updates are issued."""
+
+IMMUTABLE_FIELDS = (
+    "vm_image",
+    "container_image",
+    "post_startup_script",
+    "service_account",
+    "install_gpu_driver",
+    "custom_gpu_driver_path",
+    "no_public_ip",
+    "no_proxy_access",
+    "network",
+    "subnet",
+    "metadata",
+)
+"""Fields that are reported by the server but can only be set at creation.
+
+Input-only fields are not listed: the server never returns them, so they
+cannot be compared.
+"""
+
+UPDATE_METHODS = {
+    service.SetInstanceLabelsRequest: "set_instance_labels",
+    service.SetInstanceMachineTypeRequest: "set_instance_machine_type",
+    service.SetInstanceAcceleratorRequest: "set_instance_accelerator",
+}
+"""The client method sending each type of update request."""
+
+InstanceDiff = collections.namedtuple("InstanceDiff", ["mutable", "immutable"])
+InstanceDiff.__doc__ = """The fields of an instance that differ from a desired state.
+
+Attributes:
+    mutable (List[str]): Differing fields that can be updated in place, in
+        :data:`MUTABLE_FIELDS` order.
+    immutable (List[str]): Differing fields that can only be changed by
+        recreating the instance.
+"""
+
+
+def _raw(message: Any) -> Any:
+    if isinstance(message, proto.Message):
+        return type(message).pb(message)
+    return message
+
+
+def _populated(pb: Any) -> List[str]:
+    names = [descriptor.name for descriptor, _ in pb.ListFields()]
+    return [name for name in MUTABLE_FIELDS + IMMUTABLE_FIELDS if name in names]
+
+
+def _differs(actual: Any, desired: Any, field: str) -> bool:
+    if field in ("labels", "metadata"):
+        return dict(getattr(actual, field)) != dict(getattr(desired, field))
+    if field in ("vm_image", "container_image"):
+        # Both belong to the ``environment`` oneof.
+        if desired.WhichOneof("environment") != actual.WhichOneof("environment"):
+            return True
+    return getattr(actual, field) != getattr(desired, field)
+
+
+def diff_instances(
+    actual: instance.Instance,
+    desired: instance.Instance,
+    *,
+    fields: Optional[Sequence[str]] = None
+) -> InstanceDiff:
+    """Compute which fields of an instance differ from a desired state.
+
+    Args:
+        actual (~.instance.Instance): The instance as returned by the server.
+        desired (~.instance.Instance): The desired configuration.
+        fields (Optional[Sequence[str]]): The fields to compare. By default,
+            the fields populated in ``desired`` are compared, so that unset
+            fields mean "don't care". Pass the field explicitly to manage it
+            even when it is empty, for example ``["labels"]`` to remove all
+            labels.
+
+    Returns:
+        ~.InstanceDiff: The differing fields.
+
+    Raises:
+        ValueError: If ``fields`` names a field that cannot be compared.
+    """
+    actual_pb = _raw(actual)
+    desired_pb = _raw(desired)
+    if fields is None:
+        fields = _populated(desired_pb)
+    for field in fields:
+        if field not in MUTABLE_FIELDS and field not in IMMUTABLE_FIELDS:
+            raise ValueError("Cannot compare field {0!r}".format(field))
+
+    changed = {field for field in fields if _differs(actual_pb, desired_pb, field)}
+    return InstanceDiff(
+        mutable=[field for field in MUTABLE_FIELDS if field in changed],
+        immutable=[field for field in IMMUTABLE_FIELDS if field in changed],
+    )
+
+
+class UpdatePlan:
+    """The requests needed to bring one instance to its desired state.
+
+    A plan is falsy when there is nothing to do.
+
+    Attributes:
+        name (str): The instance resource name.
+        requests (List[Union[~.service.SetInstanceMachineTypeRequest, ~.service.SetInstanceAcceleratorRequest, ~.service.SetInstanceLabelsRequest]]):
+            The requests to send, in order.
+        immutable_changes (List[str]): Differing fields that cannot be
+            updated in place and are left untouched by the plan.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests: Sequence[Any] = (),
+        immutable_changes: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.requests = list(requests)
+        self.immutable_changes = list(immutable_changes)
+
+    def __bool__(self) -> bool:
+        return bool(self.requests)
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def __iter__(self):
+        return iter(self.requests)
+
+    def execute(self, client: Any, *, wait: bool = True, **kwargs) -> List[Any]:
+        """Send the requests with a :class:`~.NotebookServiceClient`.
+
+        Each request starts a long-running operation. Requests are sent
+        one at a time, since updates of the same instance must not
+        overlap.
+
+        Args:
+            client (~.NotebookServiceClient): The client to use.
+            wait (bool): Whether to wait for each operation to finish
+                before sending the next request. If ``False``, all requests
+                are sent back to back.
+            kwargs: Additional arguments, such as ``retry``, ``timeout`` and
+                ``metadata``, passed to every client method.
+
+        Returns:
+            List[~.operation.Operation]: The operation for every request.
+        """
+        operations = []
+        for request in self.requests:
+            method = getattr(client, UPDATE_METHODS[type(request)])
+            op = method(request, **kwargs)
+            if wait:
+                op.result()
+            operations.append(op)
+        return operations
+
+    async def execute_async(
+        self, client: Any, *, wait: bool = True, **kwargs
+    ) -> List[Any]:
+        """Like :meth:`execute`, with a :class:`~.NotebookServiceAsyncClient`."""
+        operations = []
+        for request in self.requests:
+            method = getattr(client, UPDATE_METHODS[type(request)])
+            op = await method(request, **kwargs)
+            if wait:
+                await op.result()
+            operations.append(op)
+        return operations
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r} {2}>".format(
+            self.__class__.__name__,
+            self.name,
+            [UPDATE_METHODS[type(request)] for request in self.requests],
+        )
+
+
+def plan_updates(
+    actual: instance.Instance,
+    desired: instance.Instance,
+    *,
+    fields: Optional[Sequence[str]] = None
+) -> UpdatePlan:
+    """Plan the minimal requests bringing ``actual`` to ``desired``.
+
+    Fields that already match are skipped, so an up-to-date instance gets
+    an empty plan.
+
+    Args:
+        actual (~.instance.Instance): The instance as returned by the server.
+        desired (~.instance.Instance): The desired configuration.
+        fields (Optional[Sequence[str]]): The fields to manage; see
+            :func:`diff_instances`.
+
+    Returns:
+        ~.UpdatePlan: The plan.
+    """
+    changes = diff_instances(actual, desired, fields=fields)
+    name = actual.name
+    requests = []
+    for field in changes.mutable:
+        if field == "machine_type":
+            requests.append(
+                service.SetInstanceMachineTypeRequest(
+                    name=name, machine_type=desired.machine_type
+                )
+            )
+        elif field == "accelerator_config":
+            requests.append(
+                service.SetInstanceAcceleratorRequest(
+                    name=name,
+                    type=desired.accelerator_config.type,
+                    core_count=desired.accelerator_config.core_count,
+                )
+            )
+        elif field == "labels":
+            requests.append(
+                service.SetInstanceLabelsRequest(name=name, labels=dict(desired.labels))
+            )
+    return UpdatePlan(name, requests, changes.immutable)
+
+
+__all__ = (
+    "IMMUTABLE_FIELDS",
+    "InstanceDiff",
+    "MUTABLE_FIELDS",
+    "UPDATE_METHODS",
+    "UpdatePlan",
+    "diff_instances",
+    "plan_updates",
+)
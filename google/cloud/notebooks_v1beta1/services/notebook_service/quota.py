@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Client-side token buckets mirroring the per-project API quotas.
+
+The Notebooks API enforces separate quotas for reads and for mutations in
+every project. :class:`QuotaManager` keeps one token bucket per
+``(project, method class)`` and makes RPCs wait for a token before they
+are sent, instead of spending the server-side quota and failing with
+``RESOURCE_EXHAUSTED``.
+
+Callers waiting on the same bucket are served round-robin by tenant, so
+one busy tenant cannot starve the others. The tenant of the calls made in
+a block of code is set with :func:`tenant`::
+
+    with quota.tenant("team-a"):
+        client.list_instances(request={"parent": parent})
+"""
+
+import asyncio
+import collections
+import contextlib
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from google.api_core import exceptions  # type: ignore
+
+try:
+    import contextvars
+except ImportError:  # pragma: NO COVER
+    # Python 3.6: tenants are tracked per thread only.
+    contextvars = None  # type: ignore
+
+
+READ = "read"
+"""The method class of methods that only read state."""
+
+MUTATE = "mutate"
+"""The method class of methods that change state."""
+
+READ_METHODS = frozenset(
+    (
+        "list_instances",
+        "get_instance",
+        "is_instance_upgradeable",
+        "list_environments",
+        "get_environment",
+    )
+)
+"""The methods in the :data:`READ` class; every other method is in
+:data:`MUTATE`."""
+
+DEFAULT_TENANT = ""
+"""The tenant of calls made outside of :func:`tenant`."""
+
+_PROJECT = re.compile(r"^projects/([^/]+)")
+
+if contextvars is not None:
+    _tenant = contextvars.ContextVar("notebooks_quota_tenant", default=DEFAULT_TENANT)
+else:  # pragma: NO COVER
+    _tenant = None
+    _local = threading.local()
+
+
+def current_tenant() -> str:
+    """Return the tenant set by the innermost :func:`tenant` block."""
+    if _tenant is not None:
+        return _tenant.get()
+    return getattr(_local, "tenant", DEFAULT_TENANT)  # pragma: NO COVER
+
+
+@contextlib.contextmanager
+def tenant(name: str) -> Iterator[None]:
+    """Attribute the calls made within the block to a tenant."""
+    if _tenant is not None:
+        token = _tenant.set(name)
+        try:
+            yield
+        finally:
+            _tenant.reset(token)
+    else:  # pragma: NO COVER
+        previous = current_tenant()
+        _local.tenant = name
+        try:
+            yield
+        finally:
+            _local.tenant = previous
+
+
+def method_class(method: str) -> str:
+    """Return :data:`READ` or :data:`MUTATE` for a method name."""
+    return READ if method in READ_METHODS else MUTATE
+
+
+def request_project(request: Any) -> str:
+    """Return the project a request is addressed to.
+
+    The project is parsed from the ``name``, ``parent`` or
+    ``notebook_instance`` field. Requests without any return ``""``.
+    """
+    for field in ("name", "parent", "notebook_instance"):
+        value = getattr(request, field, None)
+        if value:
+            match = _PROJECT.match(value)
+            if match:
+                return match.group(1)
+    return ""
+
+
+class _Bucket:
+    """A token bucket with a round-robin line of waiting tenants.
+
+    All state is guarded by the manager's lock.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        # tenant -> tickets of its waiting callers, in arrival order. The
+        # first tenant's first ticket is served next.
+        self.line = collections.OrderedDict()  # type: Dict[str, collections.deque]
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def join(self, tenant: str, ticket: object) -> None:
+        self.line.setdefault(tenant, collections.deque()).append(ticket)
+
+    def leave(self, tenant: str, ticket: object) -> None:
+        tickets = self.line.get(tenant)
+        if tickets is not None and ticket in tickets:
+            tickets.remove(ticket)
+            if not tickets:
+                del self.line[tenant]
+
+    def take(self, tenant: str, ticket: object, now: float) -> float:
+        """Take a token for ``ticket`` if it is its turn.
+
+        Returns:
+            float: 0 if a token was taken, or an estimate of how long to
+            wait before trying again.
+        """
+        self.refill(now)
+        head_tenant = next(iter(self.line), None)
+        if head_tenant is None or (
+            head_tenant == tenant and self.line[tenant][0] is ticket
+        ):
+            if self.tokens >= 1:
+                self.tokens -= 1
+                if head_tenant is not None:
+                    tickets = self.line[tenant]
+                    tickets.popleft()
+                    if tickets:
+                        # Serve the other tenants before this one again.
+                        self.line.move_to_end(tenant)
+                    else:
+                        del self.line[tenant]
+                return 0.0
+            return (1 - self.tokens) / self.rate
+        # Not this caller's turn: it will be at least one token away.
+        return max(1 - self.tokens, 0) / self.rate + 1 / self.rate
+
+
+class QuotaManager:
+    """Rate-limit RPCs per project and method class.
+
+    Args:
+        read_rate (float): The tokens per second of :data:`READ` buckets.
+        mutate_rate (float): The tokens per second of :data:`MUTATE`
+            buckets.
+        burst (Optional[float]): The capacity of every bucket, in seconds
+            of its rate. Defaults to one second.
+        max_wait (Optional[float]): The longest a call may wait for a
+            token, in seconds. Calls that would wait longer fail with
+            :class:`~google.api_core.exceptions.ResourceExhausted` without
+            being sent. By default, calls wait as long as needed.
+    """
+
+    def __init__(
+        self,
+        read_rate: float = 10.0,
+        mutate_rate: float = 1.0,
+        *,
+        burst: Optional[float] = None,
+        max_wait: Optional[float] = None
+    ) -> None:
+        if read_rate <= 0 or mutate_rate <= 0:
+            raise ValueError("Rates must be positive")
+        self._rates = {READ: read_rate, MUTATE: mutate_rate}
+        self._burst = 1.0 if burst is None else burst
+        self._overrides = {}  # type: Dict[Tuple[str, str], Tuple[float, float]]
+        self._max_wait = max_wait
+        self._buckets = {}  # type: Dict[Tuple[str, str], _Bucket]
+        self._lock = threading.Condition()
+
+    def set_rate(
+        self,
+        project: str,
+        method_class: str,
+        rate: float,
+        burst: Optional[float] = None,
+    ) -> None:
+        """Override the rate of one project's bucket.
+
+        Args:
+            project (str): The project ID.
+            method_class (str): :data:`READ` or :data:`MUTATE`.
+            rate (float): The tokens per second.
+            burst (Optional[float]): The capacity, in seconds of ``rate``.
+        """
+        if method_class not in self._rates:
+            raise ValueError("Unknown method class {0!r}".format(method_class))
+        if rate <= 0:
+            raise ValueError("Rates must be positive")
+        capacity = max(1.0, rate * (self._burst if burst is None else burst))
+        key = (project, method_class)
+        with self._lock:
+            self._overrides[key] = (rate, capacity)
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.refill(time.monotonic())
+                bucket.rate = rate
+                bucket.burst = capacity
+                bucket.tokens = min(bucket.tokens, capacity)
+
+    def _bucket(self, key: Tuple[str, str]) -> _Bucket:
+        # Must hold the lock.
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, capacity = self._overrides.get(
+                key, (self._rates[key[1]], max(1.0, self._rates[key[1]] * self._burst))
+            )
+            bucket = self._buckets[key] = _Bucket(rate, capacity)
+        return bucket
+
+    def available(self, project: str, method_class: str) -> float:
+        """Return the tokens currently available in a bucket."""
+        with self._lock:
+            bucket = self._bucket((project, method_class))
+            bucket.refill(time.monotonic())
+            return bucket.tokens
+
+    def acquire(
+        self, project: str, method: str, timeout: Optional[float] = None
+    ) -> bool:
+        """Wait for a token, blocking the current thread.
+
+        Args:
+            project (str): The project of the call.
+            method (str): The RPC method name.
+            timeout (Optional[float]): How long to wait, in seconds.
+
+        Returns:
+            bool: Whether a token was acquired.
+        """
+        key = (project, method_class(method))
+        who = current_tenant()
+        ticket = object()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket.join(who, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = bucket.take(who, ticket, now)
+                    if not delay:
+                        # Let the next caller in line check its turn.
+                        self._lock.notify_all()
+                        return True
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        delay = min(delay, deadline - now)
+                    self._lock.wait(delay)
+            finally:
+                bucket.leave(who, ticket)
+                self._lock.notify_all()
+
+    async def acquire_async(
+        self, project: str, method: str, timeout: Optional[float] = None
+    ) -> bool:
+        """Wait for a token without blocking the event loop.
+
+        See :meth:`acquire`.
+        """
+        key = (project, method_class(method))
+        who = current_tenant()
+        ticket = object()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket.join(who, ticket)
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    delay = bucket.take(who, ticket, now)
+                    if not delay:
+                        self._lock.notify_all()
+                        return True
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    delay = min(delay, deadline - now)
+                await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                bucket.leave(who, ticket)
+                self._lock.notify_all()
+
+    def _exhausted(self, project: str, method: str) -> exceptions.ResourceExhausted:
+        return exceptions.ResourceExhausted(
+            "Client-side {0} quota of project {1!r} exhausted".format(
+                method_class(method), project
+            )
+        )
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Make a wrapped RPC method wait for quota.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def throttled(request, *args, **kwargs):
+            project = request_project(request)
+            if not self.acquire(project, method, self._max_wait):
+                raise self._exhausted(project, method)
+            return rpc(request, *args, **kwargs)
+
+        return throttled
+
+    def wrap_async(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Make a wrapped async RPC method wait for quota.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Awaitable[Any]]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method_async.wrap_method`.
+
+        Returns:
+            Callable[..., Awaitable[Any]]: A callable with the same
+            signature.
+        """
+
+        async def throttled(request, *args, **kwargs):
+            project = request_project(request)
+            if not await self.acquire_async(project, method, self._max_wait):
+                raise self._exhausted(project, method)
+            return await rpc(request, *args, **kwargs)
+
+        return throttled
+
+
+__all__ = (
+    "DEFAULT_TENANT",
+    "MUTATE",
+    "QuotaManager",
+    "READ",
+    "READ_METHODS",
+    "current_tenant",
+    "method_class",
+    "request_project",
+    "tenant",
+)
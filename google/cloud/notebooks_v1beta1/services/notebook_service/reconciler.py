@@ -0,0 +1,484 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Converge a fleet of notebook instances to a declared state.
+
+The desired state is a JSON or YAML document mapping instance IDs to
+:class:`~.instance.Instance` fields::
+
+    instances:
+      training-1:
+        machine_type: n1-standard-8
+        vm_image: {project: deeplearning-platform-release, image_family: tf2-latest-cpu}
+        labels: {team: ml}
+
+:class:`FleetReconciler` lists the parent once, plans the creates, in-place
+updates and deletes needed, and runs independent steps concurrently while
+keeping the steps of each instance in order. Every started operation is
+recorded in an optional journal so that an interrupted run can be resumed
+without starting the same operation twice.
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from google.api_core import operation  # type: ignore
+from google.protobuf import json_format  # type: ignore
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import planner
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf import empty_pb2 as empty  # type: ignore
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_desired_state(path: str) -> Dict[str, instance.Instance]:
+    """Load a desired-state document.
+
+    Files ending in ``.yaml`` or ``.yml`` are parsed with PyYAML, which must
+    be installed; anything else is parsed as JSON. Field names may use
+    either ``snake_case`` or ``lowerCamelCase``, and enum values are given
+    by name.
+
+    Args:
+        path (str): The path of the document.
+
+    Returns:
+        Dict[str, ~.instance.Instance]: The desired instances, by ID.
+
+    Raises:
+        ValueError: If the document is malformed.
+    """
+    with open(path, "r") as fh:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # type: ignore
+
+            document = yaml.safe_load(fh)
+        else:
+            document = json.load(fh)
+    return parse_desired_state(document)
+
+
+def parse_desired_state(document: Mapping[str, Any]) -> Dict[str, instance.Instance]:
+    """Parse an already loaded desired-state document.
+
+    See :func:`load_desired_state`.
+    """
+    if not isinstance(document, Mapping) or not isinstance(
+        document.get("instances"), Mapping
+    ):
+        raise ValueError("The desired state must have an 'instances' mapping.")
+
+    desired = {}
+    for instance_id, spec in document["instances"].items():
+        pb = json_format.ParseDict(spec or {}, instance.Instance.pb()())
+        desired[instance_id] = instance.Instance(pb)
+    return desired
+
+
+class Step:
+    """A single API call of a reconciliation plan.
+
+    Attributes:
+        key (str): A stable identifier, e.g. ``"update:nb-1:set_instance_labels"``.
+        method (str): The client method to call.
+        request (Any): The request message.
+        depends_on (Tuple[str, ...]): Keys of the steps that must succeed
+            before this one starts.
+    """
+
+    def __init__(
+        self, key: str, method: str, request: Any, depends_on: Sequence[str] = ()
+    ) -> None:
+        self.key = key
+        self.method = method
+        self.request = request
+        self.depends_on = tuple(depends_on)
+
+    def __repr__(self) -> str:
+        return "{0}<{1}>".format(self.__class__.__name__, self.key)
+
+
+class ReconcilePlan:
+    """The steps needed to converge a fleet.
+
+    A plan is falsy when the fleet already matches the desired state.
+
+    Attributes:
+        steps (List[~.Step]): Every step, in dependency order.
+        drift (Dict[str, List[str]]): For instances that are not
+            recreated, the fields that differ but cannot be updated in
+            place.
+    """
+
+    def __init__(
+        self, steps: Sequence[Step] = (), drift: Optional[Dict[str, List[str]]] = None
+    ) -> None:
+        self.steps = list(steps)
+        self.drift = drift or {}
+
+    def __bool__(self) -> bool:
+        return bool(self.steps)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def describe(self) -> List[str]:
+        """Return a human-readable line per step, for dry runs."""
+        lines = []
+        for step in self.steps:
+            line = "{0} {1}".format(step.method, step.key.split(":", 2)[1])
+            if step.depends_on:
+                line += " (after {0})".format(", ".join(step.depends_on))
+            lines.append(line)
+        for instance_id, fields in sorted(self.drift.items()):
+            lines.append(
+                "# {0}: cannot update {1} in place".format(
+                    instance_id, ", ".join(fields)
+                )
+            )
+        return lines
+
+
+class ReconcileResult:
+    """The outcome of applying a plan.
+
+    Attributes:
+        succeeded (List[str]): Keys of the steps that finished.
+        failed (Dict[str, Exception]): The error of every failed step.
+        skipped (List[str]): Keys of the steps not run because a
+            dependency failed.
+    """
+
+    def __init__(self) -> None:
+        self.succeeded = []  # type: List[str]
+        self.failed = {}  # type: Dict[str, Exception]
+        self.skipped = []  # type: List[str]
+
+    @property
+    def ok(self) -> bool:
+        """bool: Whether every step succeeded."""
+        return not self.failed and not self.skipped
+
+    def __repr__(self) -> str:
+        return "{0}<succeeded={1} failed={2} skipped={3}>".format(
+            self.__class__.__name__,
+            len(self.succeeded),
+            len(self.failed),
+            len(self.skipped),
+        )
+
+
+class _Journal:
+    """An append-only record of started and finished steps."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def pending(self) -> Dict[str, str]:
+        """Return the operation name of every started, unfinished step."""
+        pending = {}  # type: Dict[str, str]
+        if not os.path.exists(self._path):
+            return pending
+        with open(self._path, "r") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write.
+                    continue
+                if entry.get("done"):
+                    pending.pop(entry["step"], None)
+                else:
+                    pending[entry["step"]] = entry["operation"]
+        return pending
+
+    def record(self, step: str, **fields: Any) -> None:
+        entry = dict(fields, step=step)
+        with self._lock:
+            with open(self._path, "a") as fh:
+                fh.write(json.dumps(entry, sort_keys=True) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def clear(self) -> None:
+        with self._lock:
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+
+class FleetReconciler:
+    """Converge the instances under a parent to a desired state.
+
+    Args:
+        client (~.NotebookServiceClient): The client to use.
+        parent (str): The parent holding the fleet, in the format
+            ``projects/{project_id}/locations/{location}``.
+        max_concurrent_operations (int): The maximum number of steps, and
+            so of long-running operations, in flight at once.
+        operation_timeout (Optional[float]): How long to wait for each
+            operation to finish, in seconds.
+        prune (bool): Whether to delete instances that are not part of
+            the desired state.
+        recreate (bool): Whether to delete and recreate instances whose
+            differences cannot be updated in place. Otherwise those
+            differences are only reported in :attr:`ReconcilePlan.drift`.
+        journal_path (Optional[str]): A file recording started operations,
+            used to resume an interrupted run.
+        on_progress (Optional[Callable[[~.Step, Optional[Exception]], None]]):
+            Called from a worker thread when a step finishes.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        parent: str,
+        *,
+        max_concurrent_operations: int = 16,
+        operation_timeout: Optional[float] = None,
+        prune: bool = False,
+        recreate: bool = False,
+        journal_path: Optional[str] = None,
+        on_progress: Optional[Callable[[Step, Optional[Exception]], None]] = None
+    ) -> None:
+        if max_concurrent_operations < 1:
+            raise ValueError("max_concurrent_operations must be positive")
+        self._client = client
+        self._parent = parent
+        self._max_concurrent_operations = max_concurrent_operations
+        self._operation_timeout = operation_timeout
+        self._prune = prune
+        self._recreate = recreate
+        self._journal = _Journal(journal_path) if journal_path else None
+        self._on_progress = on_progress
+
+    def _instance_name(self, instance_id: str) -> str:
+        return "{0}/instances/{1}".format(self._parent, instance_id)
+
+    def plan(
+        self,
+        desired: Mapping[str, instance.Instance],
+        actual: Optional[Iterable[instance.Instance]] = None,
+    ) -> ReconcilePlan:
+        """Compute the steps converging the fleet.
+
+        Args:
+            desired (Mapping[str, ~.instance.Instance]): The desired
+                instances, by ID.
+            actual (Optional[Iterable[~.instance.Instance]]): The current
+                instances. If omitted, they are listed once.
+
+        Returns:
+            ~.ReconcilePlan: The plan.
+        """
+        if actual is None:
+            actual = self._client.list_instances(request={"parent": self._parent})
+        current = {item.name.rsplit("/", 1)[-1]: item for item in actual}
+
+        steps = []
+        drift = {}
+        for instance_id in sorted(desired):
+            spec = desired[instance_id]
+            name = self._instance_name(instance_id)
+            existing = current.get(instance_id)
+            if existing is not None:
+                update = planner.plan_updates(existing, spec)
+                if update.immutable_changes and self._recreate:
+                    delete_key = "delete:{0}".format(instance_id)
+                    steps.append(
+                        Step(
+                            delete_key,
+                            "delete_instance",
+                            service.DeleteInstanceRequest(name=name),
+                        )
+                    )
+                    steps.append(self._create_step(instance_id, spec, (delete_key,)))
+                    continue
+                if update.immutable_changes:
+                    drift[instance_id] = update.immutable_changes
+                previous = ()  # type: Sequence[str]
+                for request in update.requests:
+                    method = planner.UPDATE_METHODS[type(request)]
+                    key = "update:{0}:{1}".format(instance_id, method)
+                    steps.append(Step(key, method, request, previous))
+                    previous = (key,)
+            else:
+                steps.append(self._create_step(instance_id, spec))
+
+        if self._prune:
+            for instance_id in sorted(set(current) - set(desired)):
+                steps.append(
+                    Step(
+                        "delete:{0}".format(instance_id),
+                        "delete_instance",
+                        service.DeleteInstanceRequest(name=current[instance_id].name),
+                    )
+                )
+        return ReconcilePlan(steps, drift)
+
+    def _create_step(
+        self, instance_id: str, spec: instance.Instance, depends_on: Sequence[str] = ()
+    ) -> Step:
+        return Step(
+            "create:{0}".format(instance_id),
+            "create_instance",
+            service.CreateInstanceRequest(
+                parent=self._parent, instance_id=instance_id, instance=spec
+            ),
+            depends_on,
+        )
+
+    def resume(self) -> ReconcileResult:
+        """Wait for the operations an interrupted run left in flight.
+
+        Returns:
+            ~.ReconcileResult: The outcome of the resumed operations.
+        """
+        result = ReconcileResult()
+        if self._journal is None:
+            return result
+        operations_client = self._client.operations_client
+        for key, name in sorted(self._journal.pending().items()):
+            method = key.split(":", 1)[0]
+            result_type = empty.Empty if method == "delete" else instance.Instance
+            try:
+                op = operation.from_gapic(
+                    operations_client.get_operation(name),
+                    operations_client,
+                    result_type,
+                    metadata_type=service.OperationMetadata,
+                )
+                op.result(timeout=self._operation_timeout)
+            except Exception as exc:
+                result.failed[key] = exc
+            else:
+                result.succeeded.append(key)
+            self._journal.record(key, done=True)
+        return result
+
+    def _run(self, step: Step) -> None:
+        op = getattr(self._client, step.method)(step.request)
+        if self._journal is not None:
+            self._journal.record(step.key, operation=op.operation.name)
+        op.result(timeout=self._operation_timeout)
+        if self._journal is not None:
+            self._journal.record(step.key, done=True)
+
+    def apply(self, plan: ReconcilePlan, *, dry_run: bool = False) -> ReconcileResult:
+        """Run the steps of a plan.
+
+        Steps whose dependencies have succeeded run concurrently, up to
+        ``max_concurrent_operations`` at a time. When a step fails, the
+        steps depending on it are skipped; unrelated steps carry on.
+
+        Args:
+            plan (~.ReconcilePlan): The plan to run.
+            dry_run (bool): If ``True``, only log the plan.
+
+        Returns:
+            ~.ReconcileResult: The outcome of every step.
+        """
+        result = ReconcileResult()
+        if dry_run:
+            for line in plan.describe():
+                _LOGGER.info("Would run %s", line)
+            return result
+
+        waiting = list(plan.steps)
+        succeeded = set()
+        broken = set()
+        running = {}  # type: Dict[concurrent.futures.Future, Step]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrent_operations
+        ) as executor:
+            while waiting or running:
+                still_waiting = []
+                for step in waiting:
+                    if any(dep in broken for dep in step.depends_on):
+                        broken.add(step.key)
+                        result.skipped.append(step.key)
+                    elif all(dep in succeeded for dep in step.depends_on):
+                        running[executor.submit(self._run, step)] = step
+                    else:
+                        still_waiting.append(step)
+                waiting = still_waiting
+                if not running:
+                    break
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    step = running.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        succeeded.add(step.key)
+                        result.succeeded.append(step.key)
+                    else:
+                        broken.add(step.key)
+                        result.failed[step.key] = exc
+                        _LOGGER.warning("Step %s failed: %s", step.key, exc)
+                    if self._on_progress is not None:
+                        self._on_progress(step, exc)
+
+        if self._journal is not None and result.ok:
+            self._journal.clear()
+        return result
+
+    def reconcile(
+        self, desired: Mapping[str, instance.Instance], *, dry_run: bool = False
+    ) -> ReconcileResult:
+        """Resume any interrupted run, then plan and apply.
+
+        Args:
+            desired (Mapping[str, ~.instance.Instance]): The desired
+                instances, by ID.
+            dry_run (bool): If ``True``, only log the plan.
+
+        Returns:
+            ~.ReconcileResult: The outcome of the resumed operations,
+            followed by that of the new plan.
+        """
+        result = ReconcileResult() if dry_run else self.resume()
+        applied = self.apply(self.plan(desired), dry_run=dry_run)
+        result.succeeded.extend(applied.succeeded)
+        result.failed.update(applied.failed)
+        result.skipped.extend(applied.skipped)
+        return result
+
+
+__all__ = (
+    "FleetReconciler",
+    "ReconcilePlan",
+    "ReconcileResult",
+    "Step",
+    "load_desired_state",
+    "parse_desired_state",
+)
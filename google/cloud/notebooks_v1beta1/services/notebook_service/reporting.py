@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Report instance information from the VM only when it changes.
+
+An agent on a notebook VM reports its metadata with
+``report_instance_info``, and every call starts a long-running operation.
+:class:`InstanceReporter` aggregates the metadata set between reports and
+sends it only when its content differs from the last report, or when a
+heartbeat is due, and at most once per ``min_interval``::
+
+    reporter = reporting.InstanceReporter(client, name, vm_id)
+    reporter.update({"jupyter_version": "2.2.9"})
+    reporter.run(stop)  # Report until ``stop`` is set.
+
+The returned operations are not waited for unless ``wait`` is set.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import fingerprint
+from google.cloud.notebooks_v1beta1.types import service
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InstanceReporter:
+    """Send ``report_instance_info`` for one instance when needed.
+
+    Args:
+        client (~.NotebookServiceClient): The client to use.
+        name (str): The instance name.
+        vm_id (str): The VM hardware token authenticating the VM.
+        min_interval (float): The shortest time between two reports of
+            changed metadata, in seconds; must be positive.
+        heartbeat (float): The longest time between two reports, in
+            seconds; the metadata is reported again after it even if
+            unchanged.
+        wait (bool): Whether to wait for the operation of every report to
+            finish.
+        operation_timeout (Optional[float]): How long to wait for an
+            operation when ``wait`` is set, in seconds.
+
+    Attributes:
+        sent (int): The number of reports sent.
+        skipped (int): The number of reports skipped.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        name: str,
+        vm_id: str,
+        *,
+        min_interval: float = 5.0,
+        heartbeat: float = 300.0,
+        wait: bool = False,
+        operation_timeout: Optional[float] = None
+    ) -> None:
+        if min_interval <= 0 or heartbeat < min_interval:
+            raise ValueError("Expected 0 < min_interval <= heartbeat")
+        self._client = client
+        self._name = name
+        self._vm_id = vm_id
+        self._min_interval = min_interval
+        self._heartbeat = heartbeat
+        self._wait = wait
+        self._operation_timeout = operation_timeout
+        self._lock = threading.Lock()
+        self._metadata = {}  # type: Dict[str, str]
+        self._dirty = False
+        self._digest = None  # type: Optional[bytes]
+        self._last_sent = None  # type: Optional[float]
+        self.sent = 0
+        self.skipped = 0
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        """Dict[str, str]: A copy of the metadata to report."""
+        with self._lock:
+            return dict(self._metadata)
+
+    def update(self, metadata: Mapping[str, str]) -> None:
+        """Set metadata entries, to be sent with the next report."""
+        with self._lock:
+            for key, value in metadata.items():
+                if self._metadata.get(key) != value:
+                    self._metadata[key] = value
+                    self._dirty = True
+
+    def report(self, force: bool = False) -> Optional[Any]:
+        """Report the metadata if it changed or a heartbeat is due.
+
+        Args:
+            force (bool): Whether to report even if nothing is due.
+
+        Returns:
+            Optional[google.api_core.operation.Operation]: The operation
+            started by the report, or ``None`` if it was skipped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            heartbeat = (
+                force
+                or self._last_sent is None
+                or now - self._last_sent >= self._heartbeat
+            )
+            if not heartbeat and (
+                not self._dirty or now - self._last_sent < self._min_interval
+            ):
+                self.skipped += 1
+                return None
+            request = service.ReportInstanceInfoRequest.pb()(
+                name=self._name, vm_id=self._vm_id, metadata=self._metadata
+            )
+            self._dirty = False
+
+        digest = fingerprint.fingerprint(request)
+        if not heartbeat and digest == self._digest:
+            # Changed and changed back since the last report.
+            self.skipped += 1
+            return None
+        try:
+            op = self._client.report_instance_info(request=request)
+        except Exception:
+            with self._lock:
+                self._dirty = True
+            raise
+        self._digest = digest
+        self._last_sent = now
+        self.sent += 1
+        if self._wait:
+            op.result(timeout=self._operation_timeout)
+        return op
+
+    def run(self, stop: threading.Event, interval: Optional[float] = None) -> None:
+        """Report periodically until ``stop`` is set.
+
+        Errors are logged, and the report is tried again on the next tick.
+
+        Args:
+            stop (threading.Event): Set to stop reporting.
+            interval (Optional[float]): How often to check whether a report
+                is due, in seconds; must be positive. Defaults to
+                ``min_interval``.
+        """
+        interval = self._min_interval if interval is None else interval
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        while True:
+            try:
+                self.report()
+            except Exception as exc:
+                _LOGGER.warning("Reporting %s failed: %s", self._name, exc)
+            if stop.wait(interval):
+                return
+
+    def __repr__(self) -> str:
+        return "{0}<{1} sent={2} skipped={3}>".format(
+            self.__class__.__name__, self._name, self.sent, self.skipped
+        )
+
+
+__all__ = ("InstanceReporter",)
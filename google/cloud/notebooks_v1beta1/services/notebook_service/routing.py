@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Memoized routing headers.
+
+Every RPC carries an ``x-goog-request-params`` header with its URL-encoded
+resource name. Callers tend to address the same few resources over and
+over, so the headers are kept in a bounded LRU cache instead of being
+encoded on every call.
+"""
+
+import functools
+from typing import Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+
+
+CACHE_SIZE = 4096
+"""The number of routing headers kept."""
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def routing_metadata(field: str, value: str) -> Tuple[str, str]:
+    """Return the routing header metadata for one request field.
+
+    Args:
+        field (str): The name of the request field, e.g. ``"name"``.
+        value (str): Its value.
+
+    Returns:
+        Tuple[str, str]: The same as
+        :func:`google.api_core.gapic_v1.routing_header.to_grpc_metadata`
+        for ``((field, value),)``.
+    """
+    return gapic_v1.routing_header.to_grpc_metadata(((field, value),))
+
+
+__all__ = (
+    "CACHE_SIZE",
+    "routing_metadata",
+)
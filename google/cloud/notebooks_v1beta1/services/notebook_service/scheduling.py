@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Weighted fair scheduling of RPCs by priority class.
+
+:class:`PriorityScheduler` admits a bounded number of RPCs at a time.
+When RPCs queue up, the next one to be sent is chosen by weighted fair
+queueing across the :data:`INTERACTIVE`, :data:`NORMAL` and :data:`BATCH`
+classes: with the default weights, interactive calls get eight times the
+share of batch calls, but batch calls are never starved. The class of the
+calls made in a block of code is set with :func:`priority`::
+
+    with scheduling.priority(scheduling.BATCH):
+        for item in client.list_instances(request={"parent": parent}):
+            ...
+
+Calls made outside of any block are :data:`NORMAL`.
+"""
+
+import asyncio
+import collections
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+try:
+    import contextvars
+except ImportError:  # pragma: NO COVER
+    # Python 3.6: priorities are tracked per thread only.
+    contextvars = None  # type: ignore
+
+
+INTERACTIVE = "interactive"
+"""The class of user-facing calls."""
+
+NORMAL = "normal"
+"""The default class."""
+
+BATCH = "batch"
+"""The class of bulk background calls."""
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 8.0, NORMAL: 4.0, BATCH: 1.0}
+"""The share of each class when all are queued."""
+
+if contextvars is not None:
+    _priority = contextvars.ContextVar("notebooks_priority", default=NORMAL)
+else:  # pragma: NO COVER
+    _priority = None
+    _local = threading.local()
+
+
+def current_priority() -> str:
+    """Return the class set by the innermost :func:`priority` block."""
+    if _priority is not None:
+        return _priority.get()
+    return getattr(_local, "priority", NORMAL)  # pragma: NO COVER
+
+
+@contextlib.contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Schedule the calls made within the block in a priority class."""
+    if _priority is not None:
+        token = _priority.set(name)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+    else:  # pragma: NO COVER
+        previous = current_priority()
+        _local.priority = name
+        try:
+            yield
+        finally:
+            _local.priority = previous
+
+
+class QueueTimeStats:
+    """Queue-time statistics of one priority class.
+
+    Attributes:
+        count (int): The number of calls admitted.
+        queued (int): How many of them had to wait.
+        total (float): The total time spent waiting, in seconds.
+        max (float): The longest wait, in seconds.
+    """
+
+    __slots__ = ("count", "queued", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.queued = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        """float: The mean wait over all admitted calls, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def _record(self, wait: float) -> None:
+        self.count += 1
+        if wait > 0:
+            self.queued += 1
+            self.total += wait
+            self.max = max(self.max, wait)
+
+    def _copy(self) -> "QueueTimeStats":
+        copy = QueueTimeStats()
+        copy.count, copy.queued = self.count, self.queued
+        copy.total, copy.max = self.total, self.max
+        return copy
+
+    def __repr__(self) -> str:
+        return "{0}<count={1} queued={2} mean={3:.4f}s max={4:.4f}s>".format(
+            self.__class__.__name__, self.count, self.queued, self.mean, self.max
+        )
+
+
+class _Waiter:
+    __slots__ = ("klass", "finish", "enqueued", "event", "loop", "future")
+
+    def __init__(self, klass, finish, loop=None, future=None):
+        self.klass = klass
+        self.finish = finish
+        self.enqueued = time.monotonic()
+        self.event = threading.Event() if future is None else None
+        self.loop = loop
+        self.future = future
+
+
+class PriorityScheduler:
+    """Admit RPCs by weighted fair queueing across priority classes.
+
+    One scheduler can be shared by sync and async clients, threads and
+    event loops.
+
+    Args:
+        max_concurrency (int): The maximum number of RPCs in flight.
+        weights (Optional[Mapping[str, float]]): The weight of every class.
+            Defaults to :data:`DEFAULT_WEIGHTS`.
+        on_queue_time (Optional[Callable[[str, float], None]]): Called with
+            the class and the time waited, in seconds, whenever a call is
+            admitted, for example to export a histogram. It must not block.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        *,
+        weights: Optional[Mapping[str, float]] = None,
+        on_queue_time: Optional[Callable[[str, float], None]] = None
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("Weights must be positive")
+        self._max_concurrency = max_concurrency
+        self._weights = weights
+        self._on_queue_time = on_queue_time
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queues = {
+            klass: collections.deque() for klass in weights
+        }  # type: Dict[str, collections.deque]
+        self._last_finish = dict.fromkeys(weights, 0.0)
+        self._virtual_time = 0.0
+        self._stats = {klass: QueueTimeStats() for klass in weights}
+
+    @property
+    def in_flight(self) -> int:
+        """int: The number of RPCs in flight."""
+        return self._in_flight
+
+    def queued(self, klass: Optional[str] = None) -> int:
+        """Return the number of queued calls, of one class or in total."""
+        if klass is not None:
+            return len(self._queues[klass])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def queue_time_stats(self) -> Dict[str, QueueTimeStats]:
+        """Return a snapshot of the queue-time statistics of every class."""
+        with self._lock:
+            return {klass: stats._copy() for klass, stats in self._stats.items()}
+
+    def _class(self, klass: Optional[str]) -> str:
+        klass = current_priority() if klass is None else klass
+        if klass not in self._queues:
+            raise ValueError("Unknown priority class {0!r}".format(klass))
+        return klass
+
+    def _admit(self, klass: str, wait: float) -> None:
+        # Must hold the lock.
+        self._in_flight += 1
+        self._stats[klass]._record(wait)
+        if self._on_queue_time is not None:
+            self._on_queue_time(klass, wait)
+
+    def _try_admit(self, klass: str, loop=None) -> Optional[_Waiter]:
+        """Admit immediately, or queue and return the waiter."""
+        with self._lock:
+            if self._in_flight < self._max_concurrency and not self.queued():
+                self._admit(klass, 0.0)
+                return None
+            finish = (
+                max(self._virtual_time, self._last_finish[klass])
+                + 1.0 / self._weights[klass]
+            )
+            self._last_finish[klass] = finish
+            future = loop.create_future() if loop is not None else None
+            waiter = _Waiter(klass, finish, loop, future)
+            self._queues[klass].append(waiter)
+            return waiter
+
+    def _dispatch(self) -> None:
+        # Must hold the lock.
+        while self._in_flight < self._max_concurrency:
+            heads = [queue[0] for queue in self._queues.values() if queue]
+            if not heads:
+                return
+            waiter = min(heads, key=lambda head: head.finish)
+            self._queues[waiter.klass].popleft()
+            self._virtual_time = waiter.finish
+            self._admit(waiter.klass, time.monotonic() - waiter.enqueued)
+            if waiter.event is not None:
+                waiter.event.set()
+            else:
+                waiter.loop.call_soon_threadsafe(self._deliver, waiter.future)
+
+    def _deliver(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def _forget(self, waiter: _Waiter) -> bool:
+        """Remove a waiter that gave up; return whether it was admitted."""
+        with self._lock:
+            try:
+                self._queues[waiter.klass].remove(waiter)
+            except ValueError:
+                return True
+            return False
+
+    def acquire(self, klass: Optional[str] = None) -> None:
+        """Wait for a slot, blocking the current thread.
+
+        Args:
+            klass (Optional[str]): The priority class. Defaults to the
+                class set with :func:`priority`.
+
+        Raises:
+            ValueError: If the class is unknown.
+        """
+        waiter = self._try_admit(self._class(klass))
+        if waiter is not None:
+            waiter.event.wait()
+
+    async def acquire_async(self, klass: Optional[str] = None) -> None:
+        """Wait for a slot without blocking the event loop.
+
+        See :meth:`acquire`.
+        """
+        waiter = self._try_admit(self._class(klass), asyncio.get_event_loop())
+        if waiter is None:
+            return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # A slot granted to a cancelled future is returned by ``_deliver``.
+            if self._forget(waiter) and not waiter.future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot."""
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Schedule the calls of a wrapped RPC method.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def scheduled(*args, **kwargs):
+            self.acquire()
+            try:
+                return rpc(*args, **kwargs)
+            finally:
+                self.release()
+
+        return scheduled
+
+    def wrap_async(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Schedule the calls of a wrapped async RPC method.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Awaitable[Any]]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method_async.wrap_method`.
+
+        Returns:
+            Callable[..., Awaitable[Any]]: A callable with the same
+            signature.
+        """
+
+        async def scheduled(*args, **kwargs):
+            await self.acquire_async()
+            try:
+                return await rpc(*args, **kwargs)
+            finally:
+                self.release()
+
+        return scheduled
+
+    def __repr__(self) -> str:
+        return "{0}<in_flight={1} queued={2}>".format(
+            self.__class__.__name__,
+            self._in_flight,
+            {klass: len(queue) for klass, queue in self._queues.items()},
+        )
+
+
+__all__ = (
+    "BATCH",
+    "DEFAULT_WEIGHTS",
+    "INTERACTIVE",
+    "NORMAL",
+    "PriorityScheduler",
+    "QueueTimeStats",
+    "current_priority",
+    "priority",
+)
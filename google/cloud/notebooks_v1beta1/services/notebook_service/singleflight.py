@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Share one in-flight RPC between identical concurrent read requests.
+
+When a read is issued while an identical one is still in flight, the
+second caller waits for the first RPC instead of sending its own, and
+receives the same outcome: a copy of the response, or the same error.
+Requests are identical when their method, serialized request and metadata,
+which includes the routing header, are equal, and they were made with the
+same retry and timeout: a caller never receives an error caused by the
+shorter timeout or weaker retry of another. Nothing is kept once the RPC
+finishes, so this is not a cache.
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
+
+
+def request_key(
+    method: str,
+    request: Any,
+    metadata: Optional[Sequence[Tuple[str, str]]],
+    retry: Any = None,
+    timeout: Any = None,
+) -> Hashable:
+    """Return the key identifying a request.
+
+    Args:
+        method (str): The RPC method name.
+        request (Any): The proto-plus request message, or a
+            :class:`~.templates.PreparedRequest`.
+        metadata (Optional[Sequence[Tuple[str, str]]]): The request metadata,
+            including the routing header.
+        retry (Any): The retry of the call. Retries are compared by
+            identity.
+        timeout (Any): The timeout of the call, in seconds, or a
+            :class:`~.deadline.Deadline`, compared by identity.
+
+    Returns:
+        Hashable: The key.
+    """
+    if type(request) is templates.PreparedRequest:
+        payload = request.payload
+    else:
+        payload = type(request).serialize(request)
+    return (method, payload, tuple(metadata or ()), retry, timeout)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+
+
+class SingleFlight:
+    """Coalesce identical calls made from several threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}  # type: Dict[Hashable, _Call]
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Call ``fn``, unless a call with the same key is in flight.
+
+        Args:
+            key (Hashable): The key identifying the call.
+            fn (Callable[[], Any]): The call to make.
+
+        Returns:
+            Any: The result of ``fn``. Callers that joined an in-flight
+            call receive a deep copy, so that no two callers share a
+            mutable response.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = fn()
+                return call.result
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Coalesce the calls of a wrapped RPC method.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Any]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method.wrap_method`.
+
+        Returns:
+            Callable[..., Any]: A callable with the same signature.
+        """
+
+        def coalesced(request, *args, **kwargs):
+            key = request_key(
+                method,
+                request,
+                kwargs.get("metadata"),
+                kwargs.get("retry"),
+                kwargs.get("timeout"),
+            )
+            return self.do(key, lambda: rpc(request, *args, **kwargs))
+
+        return coalesced
+
+
+class AsyncSingleFlight:
+    """Coalesce identical calls made from several coroutines.
+
+    The shared call runs as a task of its own, so cancelling one of the
+    waiting coroutines does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls = {}  # type: Dict[Hashable, asyncio.Future]
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Await ``fn()``, unless a call with the same key is in flight.
+
+        Args:
+            key (Hashable): The key identifying the call.
+            fn (Callable[[], Awaitable[Any]]): The call to make.
+
+        Returns:
+            Any: The result of ``fn()``. Callers that joined an in-flight
+            call receive a deep copy.
+        """
+        future = self._calls.get(key)
+        leader = future is None
+        if leader:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+
+            def forget(_, key=key, future=future):
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+                # Every waiter may have been cancelled; retrieve the error so
+                # that it is not logged as unhandled.
+                if not future.cancelled():
+                    future.exception()
+
+            future.add_done_callback(forget)
+
+        result = await asyncio.shield(future)
+        return result if leader else copy.deepcopy(result)
+
+    def wrap(self, method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+        """Coalesce the calls of a wrapped async RPC method.
+
+        Args:
+            method (str): The RPC method name.
+            rpc (Callable[..., Awaitable[Any]]): The method, as returned by
+                :func:`google.api_core.gapic_v1.method_async.wrap_method`.
+
+        Returns:
+            Callable[..., Awaitable[Any]]: A callable with the same
+            signature.
+        """
+
+        async def coalesced(request, *args, **kwargs):
+            key = request_key(
+                method,
+                request,
+                kwargs.get("metadata"),
+                kwargs.get("retry"),
+                kwargs.get("timeout"),
+            )
+            return await self.do(key, lambda: rpc(request, *args, **kwargs))
+
+        return coalesced
+
+
+__all__ = (
+    "AsyncSingleFlight",
+    "SingleFlight",
+    "request_key",
+)
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A persistent snapshot of instances and environments for warm starts.
+
+Listing a large fleet on every start of a service takes minutes. A
+:class:`SnapshotStore` keeps the serialized records in a SQLite file,
+indexed by name, parent and update time, and memory-maps it, so a
+restarted service serves reads from the previous snapshot at once while a
+background sweep brings it up to date::
+
+    store = snapshot.SnapshotStore("/var/lib/inventory/snapshot.db")
+    sweep = store.start_reconcile(client, [parent])
+    store.get(name)  # Served from the snapshot, possibly stale.
+    sweep.result()  # Up to date with the listing.
+
+A sweep writes only the records whose fingerprint changed, and deletes
+those no longer listed once every page has been read.
+"""
+
+import concurrent.futures
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import proto  # type: ignore
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import fingerprint
+from google.cloud.notebooks_v1beta1.services.notebook_service import timestamps
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+_LOGGER = logging.getLogger(__name__)
+
+INSTANCE = "instance"
+"""The kind of :class:`~.instance.Instance` records."""
+
+ENVIRONMENT = "environment"
+"""The kind of :class:`~.environment.Environment` records."""
+
+# The message type, list method and version field of every kind.
+# Environments have no update time; they are replaced, not updated.
+_KINDS = {
+    INSTANCE: (instance.Instance, "list_instances", "update_time"),
+    ENVIRONMENT: (environment.Environment, "list_environments", "create_time"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    name TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    update_time INTEGER NOT NULL,
+    fingerprint BLOB NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_parent ON records (parent, kind);
+CREATE INDEX IF NOT EXISTS records_update_time ON records (update_time);
+CREATE TABLE IF NOT EXISTS sweeps (
+    parent TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    completed REAL NOT NULL,
+    PRIMARY KEY (parent, kind)
+);
+"""
+
+# Newer records win; equal ones are not rewritten.
+_UPSERT = """
+INSERT INTO records (name, kind, parent, update_time, fingerprint, data)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    kind = excluded.kind,
+    parent = excluded.parent,
+    update_time = excluded.update_time,
+    fingerprint = excluded.fingerprint,
+    data = excluded.data
+WHERE excluded.update_time >= records.update_time
+    AND excluded.fingerprint != records.fingerprint
+"""
+
+
+def _kind(message: Any) -> str:
+    message_type = type(message)
+    for kind, (known, _, _) in _KINDS.items():
+        if message_type is known or message_type is known.pb():
+            return kind
+    raise TypeError("Cannot store a {0}".format(message_type.__name__))
+
+
+def _row(message: Any) -> tuple:
+    kind = _kind(message)
+    pb = type(message).pb(message) if isinstance(message, proto.Message) else message
+    if not pb.name:
+        raise ValueError("Cannot store a {0} without a name".format(kind))
+    field = _KINDS[kind][2]
+    if pb.HasField(field):
+        stamp = getattr(pb, field)
+        version = stamp.seconds * 1000000000 + stamp.nanos
+    else:
+        version = timestamps.NAT
+    # The canonical bytes are stored, so hash them as fingerprint() would
+    # instead of serializing twice.
+    data = pb.SerializeToString(deterministic=True)
+    digest = hashlib.blake2b(data, digest_size=fingerprint.DIGEST_SIZE).digest()
+    return (pb.name, kind, pb.name.rsplit("/", 2)[0], version, digest, data)
+
+
+class SnapshotStore:
+    """Instances and environments persisted in a SQLite file.
+
+    One store can be used from several threads. Writes are serialized
+    on one connection. Each thread reads through a connection of its own,
+    so with a file in WAL mode reads go on while a sweep writes, and see
+    the records as of the last completed write. A ``":memory:"`` store
+    has a single connection, and its reads wait for writes.
+
+    Args:
+        path (str): The path of the file, created if missing. ``":memory:"``
+            keeps the snapshot in memory only.
+        mmap_size (int): How many bytes of the file to memory-map for reads.
+    """
+
+    def __init__(self, path: str, *, mmap_size: int = 256 * 1024 * 1024) -> None:
+        self._path = path
+        self._mmap_size = mmap_size
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode = WAL")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+        # The read connection of every thread, closed once the thread has
+        # exited or with the store.
+        self._local = threading.local()
+        self._readers_lock = threading.Lock()
+        self._readers = {}  # type: Dict[threading.Thread, sqlite3.Connection]
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Not checking the thread lets close() close every connection.
+        db = sqlite3.connect(self._path, check_same_thread=False)
+        db.execute("PRAGMA mmap_size = {0:d}".format(self._mmap_size))
+        return db
+
+    def _query(self, sql: str, parameters: tuple) -> List[tuple]:
+        if self._path == ":memory:":
+            # Another connection would open another database.
+            with self._lock:
+                return self._db.execute(sql, parameters).fetchall()
+        db = getattr(self._local, "db", None)
+        if db is None:
+            with self._readers_lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError(
+                        "Cannot operate on a closed database."
+                    )
+                for thread in [t for t in self._readers if not t.is_alive()]:
+                    self._readers.pop(thread).close()
+                db = self._local.db = self._connect()
+                self._readers[threading.current_thread()] = db
+        return db.execute(sql, parameters).fetchall()
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return self._query("SELECT COUNT(*) FROM records", ())[0][0]
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return a record by name.
+
+        Returns:
+            Optional[Union[~.instance.Instance, ~.environment.Environment]]:
+            The record, or ``None`` if the snapshot has none.
+        """
+        rows = self._query("SELECT kind, data FROM records WHERE name = ?", (name,))
+        if not rows:
+            return None
+        return _KINDS[rows[0][0]][0].deserialize(rows[0][1])
+
+    def list(self, parent: str, kind: str = INSTANCE) -> List[Any]:
+        """Return the records of a parent, by name.
+
+        Args:
+            parent (str): The parent, e.g. ``projects/{project_id}/locations/{location}``.
+            kind (str): :data:`INSTANCE` or :data:`ENVIRONMENT`.
+
+        Returns:
+            List[Union[~.instance.Instance, ~.environment.Environment]]:
+            The records.
+        """
+        message_type = _KINDS[kind][0]
+        rows = self._query(
+            "SELECT data FROM records WHERE parent = ? AND kind = ? ORDER BY name",
+            (parent, kind),
+        )
+        return [message_type.deserialize(row[0]) for row in rows]
+
+    def updated_since(self, nanos: int) -> List[str]:
+        """Return the names of the records updated after a time.
+
+        Args:
+            nanos (int): The time, in nanoseconds since the epoch.
+
+        Returns:
+            List[str]: The names, oldest update first.
+        """
+        rows = self._query(
+            "SELECT name FROM records WHERE update_time > ? ORDER BY update_time",
+            (nanos,),
+        )
+        return [row[0] for row in rows]
+
+    def put(self, messages: Iterable[Any]) -> None:
+        """Store records, unless a newer version of them is stored.
+
+        Args:
+            messages (Iterable[Union[~.instance.Instance, ~.environment.Environment]]):
+                The records. Raw protobuf messages are accepted too.
+        """
+        rows = [_row(message) for message in messages]
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT, rows)
+
+    def delete(self, names: Iterable[str]) -> None:
+        """Delete records by name."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM records WHERE name = ?", [(name,) for name in names]
+            )
+
+    def last_sweep(self, parent: str, kind: str = INSTANCE) -> Optional[float]:
+        """Return when a parent was last reconciled, as a Unix time."""
+        rows = self._query(
+            "SELECT completed FROM sweeps WHERE parent = ? AND kind = ?",
+            (parent, kind),
+        )
+        return rows[0][0] if rows else None
+
+    def replace(
+        self, parent: str, kind: str, messages: Iterable[Any]
+    ) -> fingerprint.SnapshotDiff:
+        """Make the records of a parent match a complete listing.
+
+        Args:
+            parent (str): The parent.
+            kind (str): :data:`INSTANCE` or :data:`ENVIRONMENT`.
+            messages (Iterable[Union[~.instance.Instance, ~.environment.Environment]]):
+                Every record of the parent.
+
+        Returns:
+            ~.fingerprint.SnapshotDiff: The names added, removed, changed
+            and unchanged. A listed record older than the stored one is
+            not written, and counts as unchanged.
+        """
+        rows = {}  # type: Dict[str, tuple]
+        for message in messages:
+            row = _row(message)
+            if row[1] != kind:
+                raise TypeError("Expected {0} records".format(kind))
+            rows[row[0]] = row
+        with self._lock, self._db:
+            old = dict(
+                self._db.execute(
+                    "SELECT name, fingerprint FROM records WHERE parent = ? AND kind = ?",
+                    (parent, kind),
+                )
+            )
+            diff = fingerprint.diff(old, {name: row[4] for name, row in rows.items()})
+            # A stored record newer than the listed one is kept.
+            kept = {
+                name
+                for name in diff.changed
+                if not self._db.execute(_UPSERT, rows[name]).rowcount
+            }
+            if kept:
+                diff = diff._replace(
+                    changed=[name for name in diff.changed if name not in kept],
+                    unchanged=sorted(diff.unchanged + list(kept)),
+                )
+            self._db.executemany(_UPSERT, [rows[name] for name in diff.added])
+            self._db.executemany(
+                "DELETE FROM records WHERE name = ?", [(name,) for name in diff.removed]
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sweeps (parent, kind, completed) VALUES (?, ?, ?)",
+                (parent, kind, time.time()),
+            )
+        return diff
+
+    def reconcile(
+        self, client: Any, parent: str, kind: str = INSTANCE, **list_kwargs
+    ) -> fingerprint.SnapshotDiff:
+        """List a parent and make the snapshot match.
+
+        Args:
+            client (~.NotebookServiceClient): The client to use.
+            parent (str): The parent.
+            kind (str): :data:`INSTANCE` or :data:`ENVIRONMENT`.
+            list_kwargs: Additional arguments, such as ``timeout``, passed
+                to ``list_instances`` or ``list_environments``.
+
+        Returns:
+            ~.fingerprint.SnapshotDiff: The changes made.
+        """
+        list_method = getattr(client, _KINDS[kind][1])
+        pager = list_method(request={"parent": parent}, **list_kwargs)
+        # Nothing is deleted unless every page was read.
+        return self.replace(parent, kind, list(pager))
+
+    def start_reconcile(
+        self,
+        client: Any,
+        parents: Sequence[str],
+        kinds: Sequence[str] = (INSTANCE,),
+        **list_kwargs
+    ) -> concurrent.futures.Future:
+        """Reconcile parents in a background thread.
+
+        Args:
+            client (~.NotebookServiceClient): The client to use.
+            parents (Sequence[str]): The parents to list.
+            kinds (Sequence[str]): The kinds of records to list.
+            list_kwargs: Additional arguments passed to the list methods.
+
+        Returns:
+            concurrent.futures.Future: Resolves to a dict mapping every
+            ``(parent, kind)`` to its :class:`~.fingerprint.SnapshotDiff`,
+            or to the first error.
+        """
+        future = concurrent.futures.Future()  # type: concurrent.futures.Future
+
+        def sweep():
+            diffs = {}
+            try:
+                for parent in parents:
+                    for kind in kinds:
+                        diffs[parent, kind] = self.reconcile(
+                            client, parent, kind, **list_kwargs
+                        )
+            except Exception as exc:
+                _LOGGER.warning("Reconciling the snapshot failed: %s", exc)
+                future.set_exception(exc)
+            else:
+                future.set_result(diffs)
+
+        threading.Thread(target=sweep, name="SnapshotStore", daemon=True).start()
+        return future
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._readers_lock:
+            self._closed = True
+            for db in self._readers.values():
+                db.close()
+            self._readers.clear()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r}>".format(self.__class__.__name__, self._path)
+
+
+__all__ = (
+    "ENVIRONMENT",
+    "INSTANCE",
+    "SnapshotStore",
+)
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import sys
+from typing import Any, Callable, Iterable, Iterator, Tuple, Union
+
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+_ListInstancesResponsePb = service.ListInstancesResponse.pb()
+
+
+class InstanceSummary:
+    """A compact, read-only view of a notebook :class:`~.instance.Instance`.
+
+    Summaries keep only the fields needed to schedule and report on a
+    fleet. Enum fields are stored as their integer codes and strings are
+    interned, so that thousands of summaries sharing the same machine
+    type, network or label keys share a single copy of each string.
+
+    Summaries are usually built in bulk from a
+    :class:`~.service.ListInstancesResponse` with :func:`summarize`, which
+    reads the underlying protobuf messages directly and never wraps them
+    in full :class:`~.instance.Instance` objects.
+
+    Attributes:
+        name (str): The instance resource name.
+        state (int): The :class:`~.instance.Instance.State` code.
+        machine_type (str): The Compute Engine machine type.
+        accelerator_type (int): The
+            :class:`~.instance.Instance.AcceleratorType` code.
+        accelerator_core_count (int): The number of accelerator cores.
+        service_account (str): The service account of the instance.
+        network (str): The VPC the instance is in.
+        subnet (str): The subnet the instance is in.
+        image_project (str): The project of the VM image, or the
+            repository of the container image.
+        image (str): The VM image name or family, or the container image
+            tag.
+        labels (Tuple[Tuple[str, str], ...]): The instance labels as
+            ``(key, value)`` pairs, sorted by key.
+        create_time (int): The creation time in nanoseconds since the epoch.
+        update_time (int): The update time in nanoseconds since the epoch.
+    """
+
+    __slots__ = (
+        "name",
+        "state",
+        "machine_type",
+        "accelerator_type",
+        "accelerator_core_count",
+        "service_account",
+        "network",
+        "subnet",
+        "image_project",
+        "image",
+        "labels",
+        "create_time",
+        "update_time",
+    )
+
+    def __init__(
+        self,
+        name: str = "",
+        state: int = 0,
+        machine_type: str = "",
+        accelerator_type: int = 0,
+        accelerator_core_count: int = 0,
+        service_account: str = "",
+        network: str = "",
+        subnet: str = "",
+        image_project: str = "",
+        image: str = "",
+        labels: Tuple[Tuple[str, str], ...] = (),
+        create_time: int = 0,
+        update_time: int = 0,
+    ) -> None:
+        _set = object.__setattr__
+        _set(self, "name", name)
+        _set(self, "state", int(state))
+        _set(self, "machine_type", machine_type)
+        _set(self, "accelerator_type", int(accelerator_type))
+        _set(self, "accelerator_core_count", accelerator_core_count)
+        _set(self, "service_account", service_account)
+        _set(self, "network", network)
+        _set(self, "subnet", subnet)
+        _set(self, "image_project", image_project)
+        _set(self, "image", image)
+        _set(self, "labels", tuple(labels))
+        _set(self, "create_time", create_time)
+        _set(self, "update_time", update_time)
+
+    @classmethod
+    def from_pb(
+        cls, pb: Any, *, intern: Callable[[str], str] = sys.intern
+    ) -> "InstanceSummary":
+        """Build a summary from a raw ``Instance`` protobuf message.
+
+        Args:
+            pb (google.cloud.notebooks.v1beta1.Instance): The raw protobuf
+                message, as returned by :meth:`~.instance.Instance.pb`.
+            intern (Callable[[str], str]): The function used to intern
+                strings. Defaults to :func:`sys.intern`.
+
+        Returns:
+            ~.InstanceSummary: The summary.
+        """
+        which = pb.WhichOneof("environment")
+        if which == "vm_image":
+            image_project = pb.vm_image.project
+            image = pb.vm_image.image_name or pb.vm_image.image_family
+        elif which == "container_image":
+            image_project = pb.container_image.repository
+            image = pb.container_image.tag
+        else:
+            image_project = image = ""
+
+        create_time = pb.create_time
+        update_time = pb.update_time
+        return cls(
+            name=pb.name,
+            state=pb.state,
+            machine_type=intern(pb.machine_type),
+            accelerator_type=pb.accelerator_config.type,
+            accelerator_core_count=pb.accelerator_config.core_count,
+            service_account=intern(pb.service_account),
+            network=intern(pb.network),
+            subnet=intern(pb.subnet),
+            image_project=intern(image_project),
+            image=intern(image),
+            labels=tuple(
+                (intern(key), intern(value)) for key, value in sorted(pb.labels.items())
+            ),
+            create_time=create_time.seconds * 1000000000 + create_time.nanos,
+            update_time=update_time.seconds * 1000000000 + update_time.nanos,
+        )
+
+    @classmethod
+    def from_instance(
+        cls, obj: instance.Instance, *, intern: Callable[[str], str] = sys.intern
+    ) -> "InstanceSummary":
+        """Build a summary from an :class:`~.instance.Instance`.
+
+        Args:
+            obj (~.instance.Instance): The instance to summarize.
+            intern (Callable[[str], str]): The function used to intern
+                strings. Defaults to :func:`sys.intern`.
+
+        Returns:
+            ~.InstanceSummary: The summary.
+        """
+        return cls.from_pb(instance.Instance.pb(obj), intern=intern)
+
+    @property
+    def state_name(self) -> str:
+        """str: The name of the :class:`~.instance.Instance.State`."""
+        return instance.Instance.State(self.state).name
+
+    @property
+    def label_dict(self) -> dict:
+        """dict: A new dictionary holding the instance labels."""
+        return dict(self.labels)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("{0} is read-only".format(self.__class__.__name__))
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("{0} is read-only".format(self.__class__.__name__))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, InstanceSummary):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, slot) for slot in self.__slots__))
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            tuple(getattr(self, slot) for slot in self.__slots__),
+        )
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r} {2} {3!r}>".format(
+            self.__class__.__name__, self.name, self.state_name, self.machine_type
+        )
+
+
+def _instance_pbs(response: Any) -> Iterable[Any]:
+    if isinstance(response, (bytes, bytearray, memoryview)):
+        response = _ListInstancesResponsePb.FromString(bytes(response))
+    elif isinstance(response, service.ListInstancesResponse):
+        response = service.ListInstancesResponse.pb(response)
+    return response.instances
+
+
+def summarize(
+    responses: Union[
+        service.ListInstancesResponse, bytes, Iterable[service.ListInstancesResponse]
+    ],
+    *,
+    intern: Callable[[str], str] = sys.intern
+) -> Iterator[InstanceSummary]:
+    """Summarize every instance in one or more list responses.
+
+    The raw protobuf messages are read directly, so no
+    :class:`~.instance.Instance` wrapper is created for any instance.
+
+    Args:
+        responses (Union[~.service.ListInstancesResponse, bytes, Iterable[~.service.ListInstancesResponse]]):
+            A single response, its serialized bytes, or an iterable of
+            responses such as :attr:`~.pagers.ListInstancesPager.pages`.
+        intern (Callable[[str], str]): The function used to intern
+            strings. Defaults to :func:`sys.intern`.
+
+    Yields:
+        ~.InstanceSummary: A summary for each instance, in response order.
+    """
+    if isinstance(
+        responses,
+        (
+            service.ListInstancesResponse,
+            _ListInstancesResponsePb,
+            bytes,
+            bytearray,
+            memoryview,
+        ),
+    ):
+        responses = (responses,)
+
+    from_pb = InstanceSummary.from_pb
+    for response in responses:
+        for pb in _instance_pbs(response):
+            yield from_pb(pb, intern=intern)
+
+
+__all__ = (
+    "InstanceSummary",
+    "summarize",
+)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Pre-serialized request templates for bursts of similar requests.
+
+Creating many instances from one template sends the same large
+:class:`~.instance.Instance` over and over, differing only in the instance
+ID. A :class:`RequestTemplate` serializes the shared fields once; each
+:meth:`RequestTemplate.request` serializes only the fields that vary and
+appends them, and the transports send the result without serializing the
+full message again::
+
+    template = templates.RequestTemplate(
+        service.CreateInstanceRequest, parent=parent, instance=body,
+    )
+    for instance_id in instance_ids:
+        client.create_instance(request=template.request(instance_id=instance_id))
+
+The varying fields are merged into the shared ones as protobuf merges
+messages: scalar fields are replaced, message and map fields are merged
+and repeated fields are appended to.
+"""
+
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+_SCALARS = (str, bytes, int, float, bool)
+
+
+class PreparedRequest:
+    """A serialized request, as returned by :meth:`RequestTemplate.request`.
+
+    Fields can be read as attributes, like those of the request message;
+    reading a field that is not a scalar set directly decodes the request
+    first.
+
+    Attributes:
+        message_type (Type[proto.Message]): The request message type.
+        payload (bytes): The serialized request.
+    """
+
+    __slots__ = ("message_type", "payload", "_template", "_fields", "_message")
+
+    def __init__(
+        self,
+        message_type: Type[Any],
+        payload: bytes,
+        template: Any,
+        fields: Dict[str, Any],
+    ) -> None:
+        self.message_type = message_type
+        self.payload = payload
+        self._template = template
+        self._fields = fields
+        self._message = None  # type: Optional[Any]
+
+    def message(self) -> Any:
+        """Return the request, decoded from :attr:`payload`."""
+        if self._message is None:
+            self._message = self.message_type.deserialize(self.payload)
+        return self._message
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names other than the slots.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._fields:
+            value = self._fields[name]
+            if isinstance(value, _SCALARS):
+                return value
+            return getattr(self.message(), name)
+        return getattr(self._template, name)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PreparedRequest):
+            other = other.message()
+        return self.message() == other
+
+    def __repr__(self) -> str:
+        return "{0}<{1} {2} bytes>".format(
+            self.__class__.__name__, self.message_type.__name__, len(self.payload)
+        )
+
+
+class RequestTemplate:
+    """Serialize the shared fields of similar requests once.
+
+    Args:
+        message_type (Type[proto.Message]): The request message type, e.g.
+            :class:`~.service.CreateInstanceRequest`.
+        mapping (Optional[Mapping[str, Any]]): The shared fields.
+        fields: The shared fields, as keyword arguments.
+    """
+
+    def __init__(
+        self,
+        message_type: Type[Any],
+        mapping: Optional[Mapping[str, Any]] = None,
+        **fields: Any
+    ) -> None:
+        self._message_type = message_type
+        self._message = message_type(mapping, **fields)
+        self._payload = message_type.serialize(self._message)
+
+    @property
+    def message_type(self) -> Type[Any]:
+        """Type[proto.Message]: The request message type."""
+        return self._message_type
+
+    @property
+    def payload(self) -> bytes:
+        """bytes: The serialized shared fields."""
+        return self._payload
+
+    def request(self, **fields: Any) -> PreparedRequest:
+        """Return a request with some fields set or merged.
+
+        Args:
+            fields: The fields that vary, e.g. ``instance_id``.
+
+        Returns:
+            PreparedRequest: The request, which any method taking a
+            ``message_type`` accepts as its ``request``.
+        """
+        patch = self._message_type.serialize(self._message_type(**fields))
+        return PreparedRequest(
+            self._message_type, self._payload + patch, self._message, fields
+        )
+
+
+def unwrap(request: Any) -> Any:
+    """Return the message of a prepared request, or any other request as is.
+
+    For code that needs the fields of a request message, such as the
+    pagers, which copy the request to ask for later pages.
+    """
+    if type(request) is PreparedRequest:
+        return request.message()
+    return request
+
+
+def serializer(message_type: Type[Any]) -> Callable[[Any], bytes]:
+    """Return a request serializer that sends prepared requests as they are.
+
+    Args:
+        message_type (Type[proto.Message]): The request message type.
+
+    Returns:
+        Callable[[Any], bytes]: A ``request_serializer`` for a gRPC stub.
+    """
+    serialize = message_type.serialize
+
+    def serialize_request(request: Any) -> bytes:
+        if type(request) is PreparedRequest:
+            return request.payload
+        return serialize(request)
+
+    return serialize_request
+
+
+__all__ = (
+    "PreparedRequest",
+    "RequestTemplate",
+    "serializer",
+    "unwrap",
+)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Bulk conversion of timestamp fields into columnar arrays.
+
+Reading ``Instance.create_time`` through the message wrapper builds a
+``datetime`` for every record. The functions here read the raw protobuf
+``Timestamp`` values of a whole page, pager or sequence of messages in a
+single pass and store them as nanoseconds since the epoch, either in an
+``array.array`` of signed 64-bit integers or, if NumPy is installed, in a
+``datetime64[ns]`` array sharing the same buffer.
+
+Unset timestamps are stored as :data:`NAT`, which NumPy reads as
+``NaT``.
+"""
+
+import array
+import itertools
+from typing import Any, Dict, Iterable, Sequence
+
+import proto  # type: ignore
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import pagers
+from google.cloud.notebooks_v1beta1.types import service
+
+
+NAT = -(2**63)
+"""The value stored for unset timestamps."""
+
+_NANOS_PER_SECOND = 1000000000
+
+_LIST_FIELDS = {
+    service.ListInstancesResponse.pb(): "instances",
+    service.ListEnvironmentsResponse.pb(): "environments",
+}
+
+
+def _raw(message: Any) -> Any:
+    if isinstance(message, proto.Message):
+        return type(message).pb(message)
+    return message
+
+
+def _messages(source: Any) -> Iterable[Any]:
+    if isinstance(source, (pagers.ListInstancesPager, pagers.ListEnvironmentsPager)):
+        return itertools.chain.from_iterable(_messages(page) for page in source.pages)
+    raw = _raw(source)
+    field = _LIST_FIELDS.get(type(raw))
+    if field is not None:
+        return getattr(raw, field)
+    return (_raw(message) for message in source)
+
+
+def epoch_nanos_columns(
+    source: Any, fields: Sequence[str]
+) -> Dict[str, "array.array[int]"]:
+    """Extract several timestamp fields in one pass.
+
+    Args:
+        source (Any): A :class:`~.service.ListInstancesResponse` or
+            :class:`~.service.ListEnvironmentsResponse`, a sync pager over
+            either, or an iterable of messages such as
+            :class:`~.instance.Instance` or
+            :class:`~.service.OperationMetadata`. Iterating a pager fetches
+            all of its remaining pages.
+        fields (Sequence[str]): The names of ``Timestamp`` fields to read,
+            e.g. ``("create_time", "update_time")``.
+
+    Returns:
+        Dict[str, array.array]: For each field, a ``"q"`` array with one
+        value per message, in nanoseconds since the epoch.
+    """
+    columns = {field: array.array("q") for field in fields}
+    appenders = [(field, columns[field].append) for field in fields]
+    for pb in _messages(source):
+        for field, append in appenders:
+            if pb.HasField(field):
+                ts = getattr(pb, field)
+                append(ts.seconds * _NANOS_PER_SECOND + ts.nanos)
+            else:
+                append(NAT)
+    return columns
+
+
+def epoch_nanos(source: Any, field: str) -> "array.array[int]":
+    """Extract a single timestamp field.
+
+    See :func:`epoch_nanos_columns` for the accepted sources.
+
+    Returns:
+        array.array: A ``"q"`` array of nanoseconds since the epoch.
+    """
+    return epoch_nanos_columns(source, (field,))[field]
+
+
+def _numpy():
+    try:
+        import numpy  # type: ignore
+    except ImportError as exc:  # pragma: NO COVER
+        raise ImportError(
+            "NumPy is required for datetime64 conversion; "
+            "use epoch_nanos() for a dependency-free array."
+        ) from exc
+    return numpy
+
+
+def datetime64_columns(source: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Like :func:`epoch_nanos_columns`, returning ``datetime64[ns]`` arrays.
+
+    The NumPy arrays share memory with the integer arrays, so no value is
+    copied or converted after extraction.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    numpy = _numpy()
+    return {
+        field: numpy.frombuffer(column, dtype="datetime64[ns]")
+        for field, column in epoch_nanos_columns(source, fields).items()
+    }
+
+
+def datetime64(source: Any, field: str) -> Any:
+    """Like :func:`epoch_nanos`, returning a ``datetime64[ns]`` array.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    return datetime64_columns(source, (field,))[field]
+
+
+__all__ = (
+    "NAT",
+    "datetime64",
+    "datetime64_columns",
+    "epoch_nanos",
+    "epoch_nanos_columns",
+)
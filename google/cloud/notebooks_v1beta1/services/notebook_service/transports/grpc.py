@@ -26,6 +26,7 @@ from google.auth.transport.grpc import SslCredentials  # type: ignore
 
 import grpc  # type: ignore
 
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
 from google.cloud.notebooks_v1beta1.types import environment
 from google.cloud.notebooks_v1beta1.types import instance
 from google.cloud.notebooks_v1beta1.types import service
@@ -244,7 +245,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "list_instances" not in self._stubs:
             self._stubs["list_instances"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ListInstances",
-                request_serializer=service.ListInstancesRequest.serialize,
+                request_serializer=templates.serializer(service.ListInstancesRequest),
                 response_deserializer=service.ListInstancesResponse.deserialize,
             )
         return self._stubs["list_instances"]
@@ -268,7 +269,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "get_instance" not in self._stubs:
             self._stubs["get_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/GetInstance",
-                request_serializer=service.GetInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.GetInstanceRequest),
                 response_deserializer=instance.Instance.deserialize,
             )
         return self._stubs["get_instance"]
@@ -295,7 +296,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "create_instance" not in self._stubs:
             self._stubs["create_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/CreateInstance",
-                request_serializer=service.CreateInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.CreateInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["create_instance"]
@@ -326,7 +327,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "register_instance" not in self._stubs:
             self._stubs["register_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/RegisterInstance",
-                request_serializer=service.RegisterInstanceRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.RegisterInstanceRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["register_instance"]
@@ -352,7 +355,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "set_instance_accelerator" not in self._stubs:
             self._stubs["set_instance_accelerator"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/SetInstanceAccelerator",
-                request_serializer=service.SetInstanceAcceleratorRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.SetInstanceAcceleratorRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["set_instance_accelerator"]
@@ -378,7 +383,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "set_instance_machine_type" not in self._stubs:
             self._stubs["set_instance_machine_type"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/SetInstanceMachineType",
-                request_serializer=service.SetInstanceMachineTypeRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.SetInstanceMachineTypeRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["set_instance_machine_type"]
@@ -404,7 +411,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "set_instance_labels" not in self._stubs:
             self._stubs["set_instance_labels"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/SetInstanceLabels",
-                request_serializer=service.SetInstanceLabelsRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.SetInstanceLabelsRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["set_instance_labels"]
@@ -430,7 +439,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "delete_instance" not in self._stubs:
             self._stubs["delete_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/DeleteInstance",
-                request_serializer=service.DeleteInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.DeleteInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["delete_instance"]
@@ -456,7 +465,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "start_instance" not in self._stubs:
             self._stubs["start_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/StartInstance",
-                request_serializer=service.StartInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.StartInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["start_instance"]
@@ -482,7 +491,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "stop_instance" not in self._stubs:
             self._stubs["stop_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/StopInstance",
-                request_serializer=service.StopInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.StopInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["stop_instance"]
@@ -508,7 +517,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "reset_instance" not in self._stubs:
             self._stubs["reset_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ResetInstance",
-                request_serializer=service.ResetInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.ResetInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["reset_instance"]
@@ -538,7 +547,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "report_instance_info" not in self._stubs:
             self._stubs["report_instance_info"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ReportInstanceInfo",
-                request_serializer=service.ReportInstanceInfoRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.ReportInstanceInfoRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["report_instance_info"]
@@ -566,7 +577,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "is_instance_upgradeable" not in self._stubs:
             self._stubs["is_instance_upgradeable"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/IsInstanceUpgradeable",
-                request_serializer=service.IsInstanceUpgradeableRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.IsInstanceUpgradeableRequest
+                ),
                 response_deserializer=service.IsInstanceUpgradeableResponse.deserialize,
             )
         return self._stubs["is_instance_upgradeable"]
@@ -592,7 +605,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "upgrade_instance" not in self._stubs:
             self._stubs["upgrade_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/UpgradeInstance",
-                request_serializer=service.UpgradeInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.UpgradeInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["upgrade_instance"]
@@ -620,7 +633,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "upgrade_instance_internal" not in self._stubs:
             self._stubs["upgrade_instance_internal"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/UpgradeInstanceInternal",
-                request_serializer=service.UpgradeInstanceInternalRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.UpgradeInstanceInternalRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["upgrade_instance_internal"]
@@ -646,7 +661,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "list_environments" not in self._stubs:
             self._stubs["list_environments"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ListEnvironments",
-                request_serializer=service.ListEnvironmentsRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.ListEnvironmentsRequest
+                ),
                 response_deserializer=service.ListEnvironmentsResponse.deserialize,
             )
         return self._stubs["list_environments"]
@@ -672,7 +689,7 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "get_environment" not in self._stubs:
             self._stubs["get_environment"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/GetEnvironment",
-                request_serializer=service.GetEnvironmentRequest.serialize,
+                request_serializer=templates.serializer(service.GetEnvironmentRequest),
                 response_deserializer=environment.Environment.deserialize,
             )
         return self._stubs["get_environment"]
@@ -698,7 +715,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "create_environment" not in self._stubs:
             self._stubs["create_environment"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/CreateEnvironment",
-                request_serializer=service.CreateEnvironmentRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.CreateEnvironmentRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["create_environment"]
@@ -724,7 +743,9 @@ class NotebookServiceGrpcTransport(NotebookServiceTransport):
         if "delete_environment" not in self._stubs:
             self._stubs["delete_environment"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/DeleteEnvironment",
-                request_serializer=service.DeleteEnvironmentRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.DeleteEnvironmentRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["delete_environment"]
@@ -25,6 +25,7 @@ from google.auth.transport.grpc import SslCredentials  # type: ignore
 import grpc  # type: ignore
 from grpc.experimental import aio  # type: ignore
 
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
 from google.cloud.notebooks_v1beta1.types import environment
 from google.cloud.notebooks_v1beta1.types import instance
 from google.cloud.notebooks_v1beta1.types import service
@@ -239,7 +240,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "list_instances" not in self._stubs:
             self._stubs["list_instances"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ListInstances",
-                request_serializer=service.ListInstancesRequest.serialize,
+                request_serializer=templates.serializer(service.ListInstancesRequest),
                 response_deserializer=service.ListInstancesResponse.deserialize,
             )
         return self._stubs["list_instances"]
@@ -265,7 +266,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "get_instance" not in self._stubs:
             self._stubs["get_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/GetInstance",
-                request_serializer=service.GetInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.GetInstanceRequest),
                 response_deserializer=instance.Instance.deserialize,
             )
         return self._stubs["get_instance"]
@@ -292,7 +293,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "create_instance" not in self._stubs:
             self._stubs["create_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/CreateInstance",
-                request_serializer=service.CreateInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.CreateInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["create_instance"]
@@ -323,7 +324,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "register_instance" not in self._stubs:
             self._stubs["register_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/RegisterInstance",
-                request_serializer=service.RegisterInstanceRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.RegisterInstanceRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["register_instance"]
@@ -351,7 +354,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "set_instance_accelerator" not in self._stubs:
             self._stubs["set_instance_accelerator"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/SetInstanceAccelerator",
-                request_serializer=service.SetInstanceAcceleratorRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.SetInstanceAcceleratorRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["set_instance_accelerator"]
@@ -379,7 +384,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "set_instance_machine_type" not in self._stubs:
             self._stubs["set_instance_machine_type"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/SetInstanceMachineType",
-                request_serializer=service.SetInstanceMachineTypeRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.SetInstanceMachineTypeRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["set_instance_machine_type"]
@@ -405,7 +412,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "set_instance_labels" not in self._stubs:
             self._stubs["set_instance_labels"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/SetInstanceLabels",
-                request_serializer=service.SetInstanceLabelsRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.SetInstanceLabelsRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["set_instance_labels"]
@@ -431,7 +440,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "delete_instance" not in self._stubs:
             self._stubs["delete_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/DeleteInstance",
-                request_serializer=service.DeleteInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.DeleteInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["delete_instance"]
@@ -457,7 +466,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "start_instance" not in self._stubs:
             self._stubs["start_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/StartInstance",
-                request_serializer=service.StartInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.StartInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["start_instance"]
@@ -483,7 +492,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "stop_instance" not in self._stubs:
             self._stubs["stop_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/StopInstance",
-                request_serializer=service.StopInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.StopInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["stop_instance"]
@@ -509,7 +518,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "reset_instance" not in self._stubs:
             self._stubs["reset_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ResetInstance",
-                request_serializer=service.ResetInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.ResetInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["reset_instance"]
@@ -539,7 +548,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "report_instance_info" not in self._stubs:
             self._stubs["report_instance_info"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ReportInstanceInfo",
-                request_serializer=service.ReportInstanceInfoRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.ReportInstanceInfoRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["report_instance_info"]
@@ -568,7 +579,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "is_instance_upgradeable" not in self._stubs:
             self._stubs["is_instance_upgradeable"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/IsInstanceUpgradeable",
-                request_serializer=service.IsInstanceUpgradeableRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.IsInstanceUpgradeableRequest
+                ),
                 response_deserializer=service.IsInstanceUpgradeableResponse.deserialize,
             )
         return self._stubs["is_instance_upgradeable"]
@@ -594,7 +607,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "upgrade_instance" not in self._stubs:
             self._stubs["upgrade_instance"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/UpgradeInstance",
-                request_serializer=service.UpgradeInstanceRequest.serialize,
+                request_serializer=templates.serializer(service.UpgradeInstanceRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["upgrade_instance"]
@@ -624,7 +637,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "upgrade_instance_internal" not in self._stubs:
             self._stubs["upgrade_instance_internal"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/UpgradeInstanceInternal",
-                request_serializer=service.UpgradeInstanceInternalRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.UpgradeInstanceInternalRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["upgrade_instance_internal"]
@@ -652,7 +667,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "list_environments" not in self._stubs:
             self._stubs["list_environments"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/ListEnvironments",
-                request_serializer=service.ListEnvironmentsRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.ListEnvironmentsRequest
+                ),
                 response_deserializer=service.ListEnvironmentsResponse.deserialize,
             )
         return self._stubs["list_environments"]
@@ -678,7 +695,7 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "get_environment" not in self._stubs:
             self._stubs["get_environment"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/GetEnvironment",
-                request_serializer=service.GetEnvironmentRequest.serialize,
+                request_serializer=templates.serializer(service.GetEnvironmentRequest),
                 response_deserializer=environment.Environment.deserialize,
             )
         return self._stubs["get_environment"]
@@ -704,7 +721,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "create_environment" not in self._stubs:
             self._stubs["create_environment"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/CreateEnvironment",
-                request_serializer=service.CreateEnvironmentRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.CreateEnvironmentRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["create_environment"]
@@ -730,7 +749,9 @@ class NotebookServiceGrpcAsyncIOTransport(NotebookServiceTransport):
         if "delete_environment" not in self._stubs:
             self._stubs["delete_environment"] = self.grpc_channel.unary_unary(
                 "/google.cloud.notebooks.v1beta1.NotebookService/DeleteEnvironment",
-                request_serializer=service.DeleteEnvironmentRequest.serialize,
+                request_serializer=templates.serializer(
+                    service.DeleteEnvironmentRequest
+                ),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs["delete_environment"]
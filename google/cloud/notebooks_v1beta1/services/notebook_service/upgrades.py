@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Roll out upgrades across a fleet of instances in waves.
+
+:class:`UpgradeOrchestrator` splits the fleet into waves of a fixed size.
+The instances of a wave are probed with
+:meth:`~.NotebookServiceClient.is_instance_upgradeable` and the
+upgradeable ones are upgraded in parallel; meanwhile, the next wave is
+already being probed. The rollout stops after the wave in which the
+failure budget is exhausted.
+"""
+
+import concurrent.futures
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from google.cloud.notebooks_v1beta1.types import service
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WaveReport:
+    """The outcome of one wave.
+
+    Attributes:
+        index (int): The position of the wave, starting at 0.
+        upgraded (Dict[str, str]): The upgraded instances, mapped to the
+            version they were upgraded to.
+        failed (Dict[str, Exception]): The error of every instance whose
+            probe or upgrade failed.
+        not_upgradeable (List[str]): The instances without an upgrade.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.upgraded = {}  # type: Dict[str, str]
+        self.failed = {}  # type: Dict[str, Exception]
+        self.not_upgradeable = []  # type: List[str]
+
+    def __repr__(self) -> str:
+        return "{0}<{1} upgraded={2} failed={3} not_upgradeable={4}>".format(
+            self.__class__.__name__,
+            self.index,
+            len(self.upgraded),
+            len(self.failed),
+            len(self.not_upgradeable),
+        )
+
+
+class UpgradeResult:
+    """The outcome of a rollout.
+
+    Attributes:
+        waves (List[~.WaveReport]): The report of every wave that ran.
+        pending (List[str]): The instances of the waves that did not run
+            because the failure budget was exhausted.
+    """
+
+    def __init__(self) -> None:
+        self.waves = []  # type: List[WaveReport]
+        self.pending = []  # type: List[str]
+
+    @property
+    def halted(self) -> bool:
+        """bool: Whether the rollout stopped before the last wave."""
+        return bool(self.pending)
+
+    @property
+    def upgraded(self) -> Dict[str, str]:
+        """Dict[str, str]: Every upgraded instance and its new version."""
+        result = {}
+        for wave in self.waves:
+            result.update(wave.upgraded)
+        return result
+
+    @property
+    def failed(self) -> Dict[str, Exception]:
+        """Dict[str, Exception]: The error of every failed instance."""
+        result = {}
+        for wave in self.waves:
+            result.update(wave.failed)
+        return result
+
+    def __repr__(self) -> str:
+        return "{0}<waves={1} upgraded={2} failed={3} pending={4}>".format(
+            self.__class__.__name__,
+            len(self.waves),
+            len(self.upgraded),
+            len(self.failed),
+            len(self.pending),
+        )
+
+
+class UpgradeOrchestrator:
+    """Upgrade a fleet of instances in rolling waves.
+
+    Args:
+        client (~.NotebookServiceClient): The client to use.
+        wave_size (int): The number of instances per wave.
+        max_failures (int): The failure budget: the number of failed
+            instances tolerated over the whole rollout. Once exceeded, no
+            further wave is started.
+        max_concurrent_probes (int): The maximum number of
+            ``is_instance_upgradeable`` calls in flight at once.
+        operation_timeout (Optional[float]): How long to wait for each
+            upgrade to finish, in seconds.
+        poll_interval (float): How often to poll upgrade operations for
+            progress, in seconds.
+        on_progress (Optional[Callable[[str, ~.service.OperationMetadata], None]]):
+            Called from a worker thread with the instance name and the
+            latest operation metadata while an upgrade runs.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        wave_size: int = 10,
+        max_failures: int = 0,
+        max_concurrent_probes: int = 16,
+        operation_timeout: Optional[float] = None,
+        poll_interval: float = 5.0,
+        on_progress: Optional[Callable[[str, service.OperationMetadata], None]] = None
+    ) -> None:
+        if wave_size < 1:
+            raise ValueError("wave_size must be positive")
+        if max_concurrent_probes < 1:
+            raise ValueError("max_concurrent_probes must be positive")
+        self._client = client
+        self._wave_size = wave_size
+        self._max_failures = max_failures
+        self._max_concurrent_probes = max_concurrent_probes
+        self._operation_timeout = operation_timeout
+        self._poll_interval = poll_interval
+        self._on_progress = on_progress
+
+    def _probe(self, name: str) -> service.IsInstanceUpgradeableResponse:
+        return self._client.is_instance_upgradeable(request={"notebook_instance": name})
+
+    def _upgrade(self, name: str) -> None:
+        op = self._client.upgrade_instance(request={"name": name})
+        deadline = (
+            None
+            if self._operation_timeout is None
+            else time.monotonic() + self._operation_timeout
+        )
+        last = None
+        while not op.done():
+            metadata = op.metadata
+            if self._on_progress is not None and metadata is not None:
+                if metadata != last:
+                    self._on_progress(name, metadata)
+                    last = metadata
+            if deadline is not None and time.monotonic() >= deadline:
+                raise concurrent.futures.TimeoutError(
+                    "Timed out upgrading {0}".format(name)
+                )
+            time.sleep(self._poll_interval)
+        op.result()
+        if self._on_progress is not None and op.metadata is not None:
+            self._on_progress(name, op.metadata)
+
+    def _submit_probes(
+        self, executor: concurrent.futures.Executor, names: List[str]
+    ) -> Dict[str, concurrent.futures.Future]:
+        return {name: executor.submit(self._probe, name) for name in names}
+
+    def run(self, instances: Iterable[Any]) -> UpgradeResult:
+        """Upgrade every upgradeable instance.
+
+        Args:
+            instances (Iterable[Union[str, ~.instance.Instance]]): The
+                instances, by name or as returned by
+                :meth:`~.NotebookServiceClient.list_instances`.
+
+        Returns:
+            ~.UpgradeResult: The outcome of the rollout.
+        """
+        names = [getattr(item, "name", item) for item in instances]
+        waves = [
+            names[start : start + self._wave_size]
+            for start in range(0, len(names), self._wave_size)
+        ]
+        result = UpgradeResult()
+        failures = 0
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrent_probes
+        ) as probes, concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._wave_size
+        ) as upgrades:
+            probing = self._submit_probes(probes, waves[0]) if waves else {}
+            for index, wave in enumerate(waves):
+                if failures > self._max_failures:
+                    for future in probing.values():
+                        future.cancel()
+                    result.pending = [name for rest in waves[index:] for name in rest]
+                    break
+
+                report = WaveReport(index)
+                current = probing
+                # Pipeline the probes of the next wave with this wave's upgrades.
+                if index + 1 < len(waves):
+                    probing = self._submit_probes(probes, waves[index + 1])
+
+                running = {}
+                for name in wave:
+                    try:
+                        response = current[name].result()
+                    except Exception as exc:
+                        report.failed[name] = exc
+                        continue
+                    if not response.upgradeable:
+                        report.not_upgradeable.append(name)
+                        continue
+                    future = upgrades.submit(self._upgrade, name)
+                    running[future] = (name, response.upgrade_version)
+
+                for future in concurrent.futures.as_completed(running):
+                    name, version = running[future]
+                    exc = future.exception()
+                    if exc is None:
+                        report.upgraded[name] = version
+                    else:
+                        report.failed[name] = exc
+                        _LOGGER.warning("Upgrade of %s failed: %s", name, exc)
+
+                failures += len(report.failed)
+                result.waves.append(report)
+
+        return result
+
+
+__all__ = (
+    "UpgradeOrchestrator",
+    "UpgradeResult",
+    "WaveReport",
+)
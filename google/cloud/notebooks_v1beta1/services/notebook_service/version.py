@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""The package version reported to the API, resolved on first use.
+
+``pkg_resources`` scans every installed distribution when imported, so the
+version is read with :mod:`importlib.metadata` instead, and only when the
+first RPC is sent.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+
+try:
+    from importlib import metadata
+except ImportError:  # pragma: NO COVER
+    # Python < 3.8.
+    metadata = None  # type: ignore
+
+
+DISTRIBUTION = "google-cloud-notebooks"
+"""The name of the distribution providing this package."""
+
+_lock = threading.Lock()
+_client_info = None  # type: Optional[gapic_v1.client_info.ClientInfo]
+
+
+def package_version() -> Optional[str]:
+    """Return the installed version of the package, or ``None``."""
+    if metadata is not None:
+        try:
+            return metadata.version(DISTRIBUTION)
+        except metadata.PackageNotFoundError:
+            return None
+    try:  # pragma: NO COVER
+        import pkg_resources
+    except ImportError:  # pragma: NO COVER
+        return None
+    try:  # pragma: NO COVER
+        return pkg_resources.get_distribution(DISTRIBUTION).version
+    except pkg_resources.DistributionNotFound:  # pragma: NO COVER
+        return None
+
+
+class _ClientInfo(gapic_v1.client_info.ClientInfo):
+    """Client info whose ``x-goog-api-client`` header is built only once."""
+
+    _metadata = None  # type: Optional[Tuple[str, str]]
+
+    def to_grpc_metadata(self) -> Tuple[str, str]:
+        if self._metadata is None:
+            self._metadata = super().to_grpc_metadata()
+        return self._metadata
+
+
+def client_info() -> gapic_v1.client_info.ClientInfo:
+    """Return the client info sent with every RPC, creating it on first use."""
+    global _client_info
+    if _client_info is None:
+        with _lock:
+            if _client_info is None:
+                _client_info = _ClientInfo(
+                    gapic_version=package_version(),
+                )
+    return _client_info
+
+
+__all__ = (
+    "DISTRIBUTION",
+    "client_info",
+    "package_version",
+)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import batch
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+PARENT = "projects/p/locations/l"
+
+
+def _name(instance_id, parent=PARENT):
+    return "{0}/instances/{1}".format(parent, instance_id)
+
+
+def _get(request, metadata=(), timeout=None):
+    if request.name.endswith("/missing"):
+        raise exceptions.NotFound("missing")
+    return instance.Instance(name=request.name)
+
+
+def test_choose_strategy():
+    assert batch.choose_strategy(300, None, 16, 1000) == batch.GET
+    assert batch.choose_strategy(300, 2000, 16, 1000) == batch.LIST
+    assert batch.choose_strategy(5, 2000, 16, 1000) == batch.GET
+    assert batch.choose_strategy(100, 100000, 16, 1000) == batch.GET
+
+
+def test_plan_batch_get():
+    sizes = batch.ParentSizeCache()
+    sizes.set(PARENT, 10)
+    plan = batch.plan_batch_get(
+        [_name("a"), _name("b", "projects/q/locations/l"), _name("c"), _name("a")],
+        NotebookServiceClient.parse_instance_path,
+        sizes,
+        max_concurrency=1,
+        page_size=100,
+    )
+    assert plan == [
+        (PARENT, batch.LIST, [_name("a"), _name("c")]),
+        ("projects/q/locations/l", batch.GET, [_name("b", "projects/q/locations/l")]),
+    ]
+
+    for name in (
+        "nope",
+        "projects/p/locations/l/instances/",
+        "projects//locations/l/instances/a",
+        "projects/p/locations/l/instances/a/b",
+    ):
+        with pytest.raises(ValueError):
+            batch.plan_batch_get(
+                [name], NotebookServiceClient.parse_instance_path, sizes, 1, 100
+            )
+
+    # The parent does not depend on how the client parses names.
+    plan = batch.plan_batch_get(
+        [_name("a")], lambda name: {"project": "p"}, sizes, 1, 100
+    )
+    assert [parent for parent, _, _ in plan] == [PARENT]
+
+
+def test_parent_size_cache_expiry():
+    sizes = batch.ParentSizeCache(ttl=0)
+    sizes.set(PARENT, 10)
+    assert sizes.get(PARENT) is None
+
+
+def test_batch_get_instances_with_gets():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    names = [_name("b"), _name("missing"), _name("a")]
+
+    with mock.patch.object(
+        type(client._transport.get_instance), "__call__", side_effect=_get
+    ) as call:
+        results = client.batch_get_instances(names)
+
+    assert [r and r.name for r in results] == [_name("b"), None, _name("a")]
+    assert call.call_count == 3
+
+
+def test_batch_get_instances_with_list():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    client.parent_sizes.set(PARENT, 2)
+
+    pages = [
+        service.ListInstancesResponse(
+            instances=[instance.Instance(name=_name("a"))], next_page_token="t"
+        ),
+        service.ListInstancesResponse(
+            instances=[
+                instance.Instance(name=_name("b")),
+                instance.Instance(name=_name("c")),
+                instance.Instance(name=_name("d")),
+            ]
+        ),
+    ]
+
+    # All stubs share one multicallable type, so a single mock serves
+    # both methods.
+    with mock.patch.object(
+        type(client._transport.list_instances), "__call__", side_effect=pages
+    ) as call:
+        results = client.batch_get_instances(
+            [_name("c"), _name("missing"), _name("a"), _name("c")],
+            max_concurrency=1,
+            page_size=2,
+        )
+
+    assert call.call_count == 2
+    assert call.call_args_list[0][0][0].page_size == 2
+    assert [r and r.name for r in results] == [_name("c"), None, _name("a"), _name("c")]
+    # The parent grew; the new size is remembered.
+    assert client.parent_sizes.get(PARENT) == 4
+
+
+def test_listing_records_parent_size():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    listing = service.ListInstancesResponse(
+        instances=[instance.Instance(name=_name(i)) for i in "abcd"]
+    )
+
+    with mock.patch.object(
+        type(client._transport.list_instances), "__call__", return_value=listing
+    ) as call:
+        pager = client.list_instances(request={"parent": PARENT})
+        assert client.parent_sizes.get(PARENT) is None
+        list(pager)
+        assert client.parent_sizes.get(PARENT) == 4
+
+        # A listing resumed from a page token does not see every instance.
+        list(client.list_instances(request={"parent": "projects/q", "page_token": "t"}))
+        assert client.parent_sizes.get("projects/q") is None
+
+        # The recorded size makes listing cheaper than three rounds of gets.
+        results = client.batch_get_instances(
+            [_name("a"), _name("b"), _name("c")], max_concurrency=1, page_size=4
+        )
+
+    assert [r.name for r in results] == [_name("a"), _name("b"), _name("c")]
+    assert call.call_count == 3
+    assert all(
+        isinstance(args[0], service.ListInstancesRequest)
+        for args, _ in call.call_args_list
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_get_instances_async():
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+    )
+    other = "projects/q/locations/l"
+    client.parent_sizes.set(other, 1)
+
+    def call(request, metadata=(), timeout=None):
+        if isinstance(request, service.ListInstancesRequest):
+            response = service.ListInstancesResponse(
+                instances=[instance.Instance(name=_name("x", other))]
+            )
+        else:
+            response = _get(request)
+        return grpc_helpers_async.FakeUnaryUnaryCall(response)
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__", side_effect=call
+    ):
+        results = await client.batch_get_instances(
+            [_name("missing"), _name("x", other), _name("a"), _name("y", other)],
+            max_concurrency=1,
+        )
+
+    assert [r and r.name for r in results] == [
+        None,
+        _name("x", other),
+        _name("a"),
+        None,
+    ]
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.api_core import retry as retries
+from google.api_core import retry_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import budget
+from google.cloud.notebooks_v1beta1.types import instance
+from google.longrunning import operations_pb2
+
+
+def _retry():
+    return retries.Retry(
+        predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+        initial=0.001,
+        maximum=0.001,
+    )
+
+
+def test_budget_grows_with_successes():
+    retries_budget = budget.RetryBudget(0.5, min_retries_per_second=0)
+    assert retries_budget.available() == 0
+    assert not retries_budget.try_retry("get")
+
+    for _ in range(4):
+        retries_budget.record_success("get")
+    assert retries_budget.available() == 2
+    assert retries_budget.try_retry("get")
+    assert retries_budget.try_retry("list")
+    assert not retries_budget.try_retry("get")
+
+    stats = retries_budget.stats()
+    assert (stats["get"].successes, stats["get"].retries, stats["get"].denied) == (
+        4,
+        1,
+        2,
+    )
+    assert stats["list"].retries == 1
+
+
+def test_window_slides():
+    with mock.patch("time.monotonic", return_value=100.0):
+        retries_budget = budget.RetryBudget(1, min_retries_per_second=0, window=2)
+        retries_budget.record_success("get")
+        assert retries_budget.available() == 1
+    with mock.patch("time.monotonic", return_value=101.5):
+        assert retries_budget.available() == 1
+    with mock.patch("time.monotonic", return_value=102.0):
+        assert retries_budget.available() == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        budget.RetryBudget(-1)
+    with pytest.raises(ValueError):
+        budget.RetryBudget(window=0.5)
+    assert budget.shared_retry_budget() is budget.shared_retry_budget()
+
+
+def test_client_denies_retries_when_spent():
+    retries_budget = budget.RetryBudget(0, min_retries_per_second=0.2)
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        retry_budget=retries_budget,
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.side_effect = [
+            exceptions.ServiceUnavailable("x"),
+            exceptions.ServiceUnavailable("x"),
+            exceptions.ServiceUnavailable("x"),
+            exceptions.ServiceUnavailable("x"),
+        ]
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.get_instance(request={"name": "x"}, retry=_retry())
+
+    # Two retries are in the budget; the third is denied.
+    assert call.call_count == 3
+    stats = retries_budget.stats()["get_instance"]
+    assert (stats.successes, stats.retries, stats.denied) == (0, 2, 1)
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        client.get_instance(request={"name": "x"})
+    assert retries_budget.stats()["get_instance"].successes == 1
+
+
+def test_operations_client_spends_budget():
+    retries_budget = budget.RetryBudget(0, min_retries_per_second=0)
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        retry_budget=retries_budget,
+    )
+    operations_client = client.operations_client
+    assert isinstance(operations_client, budget.BudgetedOperationsClient)
+
+    with mock.patch.object(
+        type(operations_client.operations_stub.GetOperation), "__call__"
+    ) as call:
+        call.side_effect = [
+            exceptions.ServiceUnavailable("x"),
+            operations_pb2.Operation(name="op"),
+        ]
+        # The default retry of the operations client is denied.
+        with pytest.raises(exceptions.ServiceUnavailable):
+            operations_client.get_operation("op")
+
+        # Polls do not add to the budget.
+        call.side_effect = None
+        call.return_value = operations_pb2.Operation(name="op")
+        for _ in range(10):
+            operations_client.get_operation("op", retry=_retry())
+    assert retries_budget.available() == 0
+
+    stats = retries_budget.stats()["get_operation"]
+    assert (stats.successes, stats.retries, stats.denied) == (0, 0, 1)
+
+
+def test_limit_uses_budget_predicate():
+    retries_budget = budget.RetryBudget(
+        0,
+        min_retries_per_second=1,
+        predicate=retries.if_exception_type(exceptions.Aborted),
+    )
+    retry = retries_budget.limit("get", _retry())
+    calls = []
+
+    def flaky():
+        calls.append(None)
+        if len(calls) == 1:
+            raise exceptions.Aborted("x")
+        raise exceptions.ServiceUnavailable("x")
+
+    with pytest.raises(exceptions.ServiceUnavailable):
+        retry(flaky)()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_denies_retries_when_spent():
+    retries_budget = budget.RetryBudget(0, min_retries_per_second=0)
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+        retry_budget=retries_budget,
+    )
+    assert isinstance(client.operations_client, budget.BudgetedOperationsClient)
+    retry = retry_async.AsyncRetry(
+        predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+        initial=0.001,
+        maximum=0.001,
+    )
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.side_effect = exceptions.ServiceUnavailable("x")
+        with pytest.raises(exceptions.ServiceUnavailable):
+            await client.get_instance(request={"name": "x"}, retry=retry)
+
+        call.side_effect = None
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            instance.Instance(name="x")
+        )
+        await client.get_instance(request={"name": "x"})
+
+    stats = retries_budget.stats()["get_instance"]
+    assert (stats.successes, stats.retries, stats.denied) == (1, 0, 1)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import coercion
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+def test_exact_type_is_not_copied():
+    request = service.GetInstanceRequest(name="x")
+    assert coercion.coerce(service.GetInstanceRequest, request) is request
+
+
+def test_raw_pb2_is_wrapped():
+    raw = service.GetInstanceRequest.pb()(name="x")
+    request = coercion.coerce(service.GetInstanceRequest, raw)
+    assert isinstance(request, service.GetInstanceRequest)
+    assert service.GetInstanceRequest.pb(request) is raw
+
+
+def test_other_arguments_are_converted():
+    assert coercion.coerce(
+        service.GetInstanceRequest, {"name": "x"}
+    ) == service.GetInstanceRequest(name="x")
+    assert coercion.coerce(service.GetInstanceRequest, None) == (
+        service.GetInstanceRequest()
+    )
+
+
+def test_client_sends_request_as_is():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = service.GetInstanceRequest(name="x")
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        client.get_instance(request=request)
+        client.get_instance(request=service.GetInstanceRequest.pb(request))
+
+    assert call.call_args_list[0][0][0] is request
+    assert call.call_args_list[1][0][0] == request
+
+
+def test_pager_does_not_modify_request():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = service.ListInstancesRequest(parent="p")
+
+    with mock.patch.object(type(client._transport.list_instances), "__call__") as call:
+        call.side_effect = [
+            service.ListInstancesResponse(
+                instances=[instance.Instance(name="a")], next_page_token="abc"
+            ),
+            service.ListInstancesResponse(instances=[instance.Instance(name="b")]),
+        ]
+        assert [i.name for i in client.list_instances(request=request)] == ["a", "b"]
+
+    assert request.page_token == ""
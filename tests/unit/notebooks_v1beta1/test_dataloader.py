@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.notebooks_v1beta1.services.notebook_service import dataloader
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+def _client():
+    async def batch_get_instances(names, **kwargs):
+        await asyncio.sleep(0)
+        return [
+            None if name == "missing" else instance.Instance(name=name)
+            for name in names
+        ]
+
+    client = mock.Mock()
+    client.batch_get_instances = mock.AsyncMock(side_effect=batch_get_instances)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_coalesces_same_tick():
+    client = _client()
+    loader = dataloader.InstanceLoader(client, timeout=5.0)
+
+    results = await asyncio.gather(
+        loader.load("a"), loader.load("b"), loader.load("a"), loader.load("c")
+    )
+
+    assert [r.name for r in results] == ["a", "b", "a", "c"]
+    client.batch_get_instances.assert_awaited_once_with(["a", "b", "c"], timeout=5.0)
+    assert loader.loads == 4
+    assert loader.batches == 1
+
+
+@pytest.mark.asyncio
+async def test_window():
+    client = _client()
+    loader = dataloader.InstanceLoader(client, window=0.01)
+
+    first = asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(loader.load("b"))
+    await asyncio.sleep(0.02)
+    # The window has passed; "c" starts a new batch.
+    third = asyncio.ensure_future(loader.load("c"))
+
+    assert [r.name for r in await asyncio.gather(first, second, third)] == [
+        "a",
+        "b",
+        "c",
+    ]
+    assert client.batch_get_instances.await_args_list == [
+        mock.call(["a", "b"]),
+        mock.call(["c"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size():
+    client = _client()
+    loader = dataloader.InstanceLoader(client, max_batch_size=2)
+
+    await loader.load_many(["a", "b", "c"])
+
+    assert client.batch_get_instances.await_args_list == [
+        mock.call(["a", "b"]),
+        mock.call(["c"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_errors():
+    client = _client()
+    loader = dataloader.InstanceLoader(client)
+
+    results = await asyncio.gather(
+        loader.load("a"), loader.load("missing"), return_exceptions=True
+    )
+    assert results[0].name == "a"
+    assert isinstance(results[1], exceptions.NotFound)
+
+    client.batch_get_instances.side_effect = exceptions.ServiceUnavailable("down")
+    with pytest.raises(exceptions.ServiceUnavailable):
+        await loader.load("a")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    client = _client()
+    loader = dataloader.InstanceLoader(client)
+
+    first = asyncio.ensure_future(loader.load("a"))
+    second = asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert (await second).name == "a"
+
+
+@pytest.mark.asyncio
+async def test_joins_inflight_lookup():
+    release = asyncio.Event()
+
+    async def batch_get_instances(names, **kwargs):
+        await release.wait()
+        return [instance.Instance(name=name) for name in names]
+
+    client = mock.Mock()
+    client.batch_get_instances = mock.AsyncMock(side_effect=batch_get_instances)
+    loader = dataloader.InstanceLoader(client)
+
+    first = asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert (await first) is (await second)
+    assert loader.batches == 1
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import concurrent.futures
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.api_core import retry as retries
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import deadline
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+def test_remaining_and_check():
+    budget = deadline.Deadline(10)
+    assert 9 < budget.remaining() <= 10
+    assert not budget.expired
+    budget.check()
+
+    with pytest.raises(exceptions.DeadlineExceeded):
+        deadline.Deadline(0).check()
+    assert deadline.Deadline(-1).remaining() == 0
+
+    budget.cancel()
+    assert budget.cancelled and budget.expired
+    with pytest.raises(exceptions.Cancelled):
+        budget.check()
+
+
+def test_attempts_use_remaining_time():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    budget = deadline.Deadline(10)
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        client.get_instance(request={"name": "x"}, timeout=budget)
+
+    _, kwargs = call.call_args
+    assert 9 < kwargs["timeout"] <= 10
+
+
+def test_expired_deadline_is_not_sent():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        with pytest.raises(exceptions.DeadlineExceeded):
+            client.get_instance(request={"name": "x"}, timeout=deadline.Deadline(0))
+
+    assert call.call_count == 0
+
+
+def test_retries_stop_when_cancelled():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    budget = deadline.Deadline(60)
+    retry = retries.Retry(
+        predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+        initial=0.001,
+        maximum=0.001,
+    )
+
+    def get(request, metadata=(), timeout=None):
+        budget.cancel()
+        raise exceptions.ServiceUnavailable("x")
+
+    with mock.patch.object(
+        type(client._transport.get_instance), "__call__", side_effect=get
+    ) as call:
+        with pytest.raises(exceptions.Cancelled):
+            client.get_instance(request={"name": "x"}, retry=retry, timeout=budget)
+
+    assert call.call_count == 1
+
+
+def test_retries_are_capped():
+    retry = retries.Retry(deadline=600)
+    rpc = mock.Mock()
+    deadline.wrap(rpc)("request", retry=retry, timeout=deadline.Deadline(5))
+    _, kwargs = rpc.call_args
+    assert 4 < kwargs["retry"]._deadline <= 5
+
+    # Plain timeouts are left alone.
+    deadline.wrap(rpc)("request", retry=retry, timeout=5)
+    _, kwargs = rpc.call_args
+    assert kwargs["retry"] is retry
+
+
+def test_pages_share_deadline():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    budget = deadline.Deadline(60)
+
+    def list_instances(request, metadata=(), timeout=None):
+        if not request.page_token:
+            return service.ListInstancesResponse(
+                instances=[instance.Instance(name="a")], next_page_token="abc"
+            )
+        budget.cancel()
+        return service.ListInstancesResponse(
+            instances=[instance.Instance(name="b")], next_page_token="def"
+        )
+
+    with mock.patch.object(
+        type(client._transport.list_instances), "__call__", side_effect=list_instances
+    ) as call:
+        pager = client.list_instances(request={"parent": "p"}, timeout=budget)
+        with pytest.raises(exceptions.Cancelled):
+            list(pager)
+
+    assert call.call_count == 2
+    assert all(0 < c[1]["timeout"] <= 60 for c in call.call_args_list)
+
+
+def test_operation_result():
+    future = mock.Mock()
+    future.result.return_value = "done"
+    assert deadline.Deadline(5).result(future) == "done"
+    _, kwargs = future.result.call_args
+    assert 4 < kwargs["timeout"] <= 5
+
+    future.result.side_effect = concurrent.futures.TimeoutError()
+    with pytest.raises(exceptions.DeadlineExceeded):
+        deadline.Deadline(5).result(future)
+
+
+@pytest.mark.asyncio
+async def test_async_client_uses_remaining_time():
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+    )
+    budget = deadline.Deadline(10)
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            instance.Instance(name="x")
+        )
+        await client.get_instance(request={"name": "x"}, timeout=budget)
+        _, kwargs = call.call_args
+        assert 9 < kwargs["timeout"] <= 10
+
+        with pytest.raises(exceptions.DeadlineExceeded):
+            await client.get_instance(
+                request={"name": "y"}, timeout=deadline.Deadline(0)
+            )
+
+    assert call.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_operation_result():
+    future = mock.Mock()
+    future.result = mock.AsyncMock(side_effect=concurrent.futures.TimeoutError())
+    with pytest.raises(exceptions.DeadlineExceeded):
+        await deadline.Deadline(5).result_async(future)
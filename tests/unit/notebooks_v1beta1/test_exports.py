@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+
+import pytest
+
+from google.cloud import notebooks
+from google.cloud import notebooks_v1beta1
+from google.cloud.notebooks_v1beta1.services import notebook_service
+
+
+@pytest.mark.parametrize("package", [notebooks, notebooks_v1beta1, notebook_service])
+def test_all_names_resolve(package):
+    for name in package.__all__:
+        assert getattr(package, name).__name__ == name
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError):
+        package.NoSuchName
+
+
+def test_types_do_not_load_clients():
+    code = (
+        "import sys\n"
+        "from google.cloud.notebooks import Instance\n"
+        "print('grpc' in sys.modules or 'notebook_service' in str(sys.modules))\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.strip() == b"False"
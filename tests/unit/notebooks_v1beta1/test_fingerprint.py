@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import fingerprint
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+
+
+def _instance(name="projects/p/instances/a", **kwargs):
+    fields = dict(
+        name=name,
+        machine_type="n1-standard-4",
+        state=instance.Instance.State.ACTIVE,
+        update_time=timestamp.Timestamp(seconds=1),
+    )
+    fields.update(kwargs)
+    return instance.Instance(**fields)
+
+
+def test_fingerprint_is_independent_of_map_order():
+    a = _instance(labels={"a": "1", "b": "2", "c": "3"})
+    b = _instance(labels={"c": "3", "a": "1", "b": "2"})
+
+    assert fingerprint.fingerprint(a) == fingerprint.fingerprint(b)
+    assert len(fingerprint.fingerprint(a)) == fingerprint.DIGEST_SIZE
+    assert fingerprint.fingerprint(a) == fingerprint.fingerprint(
+        instance.Instance.pb(a)
+    )
+
+
+def test_fingerprint_detects_changes():
+    assert fingerprint.fingerprint(_instance()) != fingerprint.fingerprint(
+        _instance(machine_type="n1-standard-8")
+    )
+
+
+def test_fingerprint_exclude():
+    a = _instance()
+    b = _instance(update_time=timestamp.Timestamp(seconds=2))
+
+    assert fingerprint.fingerprint(a) != fingerprint.fingerprint(b)
+    assert fingerprint.fingerprint(a, exclude=["update_time"]) == (
+        fingerprint.fingerprint(b, exclude=["update_time"])
+    )
+
+    c = _instance(state=instance.Instance.State.STOPPED, proxy_uri="x")
+    assert fingerprint.fingerprint(a, exclude_output_only=True) == (
+        fingerprint.fingerprint(c, exclude_output_only=True)
+    )
+    # The message itself is left untouched.
+    assert c.proxy_uri == "x"
+
+
+def test_fingerprint_exclude_unknown_field():
+    with pytest.raises(ValueError):
+        fingerprint.canonical_bytes(_instance(), exclude=["nope"])
+
+
+def test_fingerprint_environment():
+    a = environment.Environment(name="e", create_time=timestamp.Timestamp(seconds=1))
+    b = environment.Environment(name="e")
+    assert fingerprint.fingerprint(a, exclude_output_only=True) == (
+        fingerprint.fingerprint(b)
+    )
+
+
+def test_fingerprints_and_diff():
+    old = fingerprint.fingerprints(
+        [_instance("a"), _instance("b"), _instance("c")], exclude_output_only=True
+    )
+    new = fingerprint.fingerprints(
+        [
+            _instance("a", update_time=timestamp.Timestamp(seconds=5)),
+            _instance("b", machine_type="n1-highmem-2"),
+            _instance("d"),
+        ],
+        exclude_output_only=True,
+    )
+    result = fingerprint.diff(old, new)
+
+    assert result.added == ["d"]
+    assert result.removed == ["c"]
+    assert result.changed == ["b"]
+    assert result.unchanged == ["a"]
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import interning
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf.internal import api_implementation  # type: ignore
+
+
+python_runtime_only = pytest.mark.skipif(
+    api_implementation.Type() != "python",
+    reason="only the pure-Python runtime keeps references to assigned strings",
+)
+
+
+def _page(suffix):
+    return service.ListInstancesResponse.serialize(
+        service.ListInstancesResponse(
+            instances=[
+                instance.Instance(
+                    name="projects/p/instances/" + suffix,
+                    machine_type="n1-standard-4",
+                    network="projects/p/global/networks/default",
+                    vm_image=environment.VmImage(project="deeplearning"),
+                    labels={"team": "ml"},
+                )
+            ]
+        )
+    )
+
+
+def test_intern_table():
+    table = interning.InternTable(maxsize=2)
+    a = "".join(["ab", "c"])
+    b = "".join(["a", "bc"])
+    assert a is not b
+    assert table(a) is a
+    assert table(b) is a
+    assert table.hits == 1 and table.misses == 1
+
+    table("x")
+    table("y")
+    assert len(table) == 2
+    assert "abc" not in table
+    table.clear()
+    assert len(table) == 0
+
+
+def test_intern_table_maxsize():
+    with pytest.raises(ValueError):
+        interning.InternTable(maxsize=0)
+
+
+def test_intern_message_keeps_values():
+    table = interning.InternTable()
+    response = service.ListInstancesResponse.deserialize(_page("a"))
+    assert interning.intern_message(response, table) is response
+    assert response.instances[0].machine_type == "n1-standard-4"
+    assert response.instances[0].vm_image.project == "deeplearning"
+    assert dict(response.instances[0].labels) == {"team": "ml"}
+    assert response.instances[0].container_image.repository == ""
+    assert "n1-standard-4" in table
+
+
+def test_intern_message_environment():
+    table = interning.InternTable()
+    env = environment.Environment(
+        container_image=environment.ContainerImage(repository="gcr.io/r", tag="t")
+    )
+    interning.intern_message(env, table)
+    assert "gcr.io/r" in table
+    assert env.vm_image.project == ""
+
+    interning.intern_message(
+        service.ListEnvironmentsResponse(
+            environments=[environment.Environment(post_startup_script="gs://s")]
+        ),
+        table,
+    )
+    assert "gs://s" in table
+
+
+def test_intern_message_unsupported():
+    with pytest.raises(TypeError):
+        interning.intern_message(service.GetInstanceRequest(), interning.InternTable())
+
+
+@python_runtime_only
+def test_deserializer_shares_strings_across_pages():
+    table = interning.InternTable()
+    deserialize = interning.deserializer(service.ListInstancesResponse, table)
+    first = service.ListInstancesResponse.pb(deserialize(_page("a"))).instances[0]
+    second = service.ListInstancesResponse.pb(deserialize(_page("b"))).instances[0]
+
+    assert first.machine_type is second.machine_type
+    assert first.vm_image.project is second.vm_image.project
+    assert list(first.labels)[0] is list(second.labels)[0]
+    assert first.name is not second.name
+
+
+@python_runtime_only
+def test_intern_pages():
+    table = interning.InternTable()
+    pages = [service.ListInstancesResponse.deserialize(_page(s)) for s in "ab"]
+    first, second = [
+        service.ListInstancesResponse.pb(p).instances[0]
+        for p in interning.intern_pages(pages, table)
+    ]
+    assert first.network is second.network
+
+
+@pytest.mark.asyncio
+async def test_intern_pages_async():
+    async def pages():
+        for suffix in "ab":
+            yield service.ListInstancesResponse.deserialize(_page(suffix))
+
+    table = interning.InternTable()
+    results = [p async for p in interning.intern_pages_async(pages(), table)]
+    assert len(results) == 2
+    assert table.hits > 0
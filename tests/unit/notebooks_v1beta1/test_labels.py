@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.notebooks_v1beta1.services.notebook_service import labels
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+def _client(initial=None, block=None):
+    client = mock.Mock()
+    client.writes = []
+    state = {"in_flight": 0, "max_in_flight": 0}
+    client.state = state
+
+    client.get_instance.side_effect = lambda request: instance.Instance(
+        name=request["name"], labels=initial or {}
+    )
+
+    def set_instance_labels(request):
+        client.writes.append(dict(request["labels"]))
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        op = mock.Mock()
+
+        def result(timeout=None):
+            if block is not None:
+                block.wait()
+            state["in_flight"] -= 1
+
+        op.result.side_effect = result
+        return op
+
+    client.set_instance_labels.side_effect = set_instance_labels
+    return client
+
+
+def test_changes_are_coalesced():
+    client = _client(initial={"team": "ml", "scratch": "1"})
+    with labels.LabelWriter(client, delay=60) as writer:
+        futures = [
+            writer.update("nb", {"owner": "a"}),
+            writer.update("nb", {"owner": "b", "env": "dev"}),
+            writer.remove("nb", "scratch", "env"),
+        ]
+        assert writer.pending == 1
+        writer.flush()
+        assert writer.pending == 0
+
+    expected = {"team": "ml", "owner": "b"}
+    assert client.writes == [expected]
+    assert [future.result() for future in futures] == [expected] * 3
+    client.get_instance.assert_called_once_with(request={"name": "nb"})
+
+
+def test_writes_after_delay():
+    client = _client()
+    with labels.LabelWriter(client, delay=0.01) as writer:
+        future = writer.update("nb", {"owner": "a"})
+        assert future.result(timeout=5) == {"owner": "a"}
+
+
+def test_waits_for_operation_in_flight():
+    block = threading.Event()
+    client = _client(block=block)
+    writer = labels.LabelWriter(client, delay=0)
+
+    first = writer.update("nb", {"owner": "a"})
+    while not client.writes:
+        pass
+    second = writer.update("nb", {"env": "dev"})
+    block.set()
+    writer.close()
+
+    assert first.result() == {"owner": "a"}
+    assert second.result() == {"owner": "a", "env": "dev"}
+    assert client.writes == [{"owner": "a"}, {"owner": "a", "env": "dev"}]
+    assert client.state["max_in_flight"] == 1
+    # The second write applies to the map written first.
+    assert client.get_instance.call_count == 1
+
+
+def test_labels_are_read_again_for_each_burst():
+    client = _client()
+    server = {}
+    client.get_instance.side_effect = lambda request: instance.Instance(
+        name=request["name"], labels=server
+    )
+    client.set_instance_labels.side_effect = lambda request: (
+        server.update(request["labels"]) or mock.Mock()
+    )
+    with labels.LabelWriter(client, delay=60) as writer:
+        writer.update("nb", {"owner": "a"})
+        writer.flush()
+        # Changed by another writer.
+        server["team"] = "ml"
+        future = writer.update("nb", {"env": "dev"})
+        writer.flush()
+        assert future.result() == {"owner": "a", "team": "ml", "env": "dev"}
+        assert client.get_instance.call_count == 2
+
+
+def test_unchanged_labels_are_not_written():
+    client = _client(initial={"owner": "a"})
+    with labels.LabelWriter(client, delay=60) as writer:
+        future = writer.update("nb", {"owner": "a"})
+    assert future.result() == {"owner": "a"}
+    assert client.writes == []
+
+
+def test_failed_write():
+    client = _client()
+    client.set_instance_labels.side_effect = exceptions.NotFound("gone")
+    with labels.LabelWriter(client, delay=60) as writer:
+        future = writer.update("nb", {"owner": "a"})
+        writer.flush()
+        with pytest.raises(exceptions.NotFound):
+            future.result()
+        writer.update("nb", {"owner": "b"})
+    # The labels are read again after a failure.
+    assert client.get_instance.call_count == 2
+
+
+def test_closed_writer_rejects_changes():
+    writer = labels.LabelWriter(_client())
+    writer.close()
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.update("nb", {"owner": "a"})
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+import time
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import limiter
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+def test_additive_increase():
+    changes = []
+    aimd = limiter.AdaptiveLimiter(4, on_limit_change=changes.append)
+
+    for _ in range(4):
+        assert aimd.acquire()
+        aimd.release("get", time.monotonic())
+
+    # About one more slot after a full round of healthy RPCs.
+    assert 4.9 < aimd.limit < 5
+    assert len(changes) == 4
+    assert aimd.in_flight == 0
+
+
+def test_slow_rpcs_do_not_increase():
+    aimd = limiter.AdaptiveLimiter(4, latency_tolerance=2.0)
+    now = time.monotonic()
+    aimd.acquire()
+    aimd.release("get", now - 0.01)
+    limit = aimd.limit
+    aimd.acquire()
+    aimd.release("get", now - 1.0)
+    assert aimd.limit == limit
+
+
+def test_multiplicative_decrease_once_per_round():
+    aimd = limiter.AdaptiveLimiter(16, min_limit=2)
+    started = time.monotonic()
+    for _ in range(3):
+        aimd.acquire()
+    for _ in range(3):
+        aimd.release("get", started, exceptions.ResourceExhausted("quota"))
+    assert aimd.limit == 8
+
+    for _ in range(4):
+        aimd.acquire()
+        aimd.release("get", time.monotonic(), exceptions.ServiceUnavailable("x"))
+    assert aimd.limit == 2
+
+    # Other errors leave the limit alone.
+    aimd.acquire()
+    aimd.release("get", time.monotonic(), exceptions.NotFound("x"))
+    assert aimd.limit == 2
+
+
+def test_acquire_blocks_at_limit():
+    aimd = limiter.AdaptiveLimiter(1)
+    assert aimd.acquire()
+    assert not aimd.acquire(timeout=0.01)
+    assert aimd.waiting == 0
+
+    acquired = threading.Event()
+
+    def worker():
+        aimd.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.01)
+    assert not acquired.is_set()
+    aimd.release("get", time.monotonic())
+    thread.join()
+    assert acquired.is_set()
+    assert aimd.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_and_cancellation():
+    aimd = limiter.AdaptiveLimiter(1)
+    await aimd.acquire_async()
+
+    cancelled = asyncio.ensure_future(aimd.acquire_async())
+    waiting = asyncio.ensure_future(aimd.acquire_async())
+    await asyncio.sleep(0)
+    assert aimd.waiting == 2
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert aimd.waiting == 1
+
+    aimd.release("get", time.monotonic())
+    await asyncio.wait_for(waiting, 1)
+    assert aimd.in_flight == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        limiter.AdaptiveLimiter(0)
+    with pytest.raises(ValueError):
+        limiter.AdaptiveLimiter(4, backoff=1)
+    assert limiter.shared_limiter() is limiter.shared_limiter()
+
+
+def test_client_reports_to_limiter():
+    aimd = limiter.AdaptiveLimiter(8)
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        concurrency_limiter=aimd,
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.side_effect = exceptions.ResourceExhausted("quota")
+        with pytest.raises(exceptions.ResourceExhausted):
+            client.get_instance(request={"name": "x"})
+
+    assert aimd.limit == 4
+    assert aimd.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_async_client_reports_to_limiter():
+    aimd = limiter.AdaptiveLimiter(8)
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+        concurrency_limiter=aimd,
+    )
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            instance.Instance(name="x")
+        )
+        await client.get_instance(request={"name": "x"})
+
+    assert aimd.limit > 8
+    assert aimd.in_flight == 0
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import listcache
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import service
+
+
+@pytest.fixture
+def clock():
+    now = [100.0]
+    with mock.patch("time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+def _client(block=None):
+    client = mock.Mock()
+    version = [0]
+
+    def list_environments(request, **kwargs):
+        if block is not None:
+            block.wait()
+        version[0] += 1
+        return [environment.Environment(name="env", description=str(version[0]))]
+
+    client.list_environments.side_effect = list_environments
+    return client
+
+
+def _descriptions(items):
+    return [item.description for item in items]
+
+
+def test_serves_fresh_snapshot(clock):
+    client = _client()
+    cache = listcache.ListCache(client, soft_ttl=10, hard_ttl=100, timeout=5)
+
+    assert _descriptions(cache.get("p")) == ["1"]
+    clock[0] += 5
+    assert _descriptions(cache.get("p")) == ["1"]
+
+    client.list_environments.assert_called_once_with(request={"parent": "p"}, timeout=5)
+    assert (cache.hits, cache.stale_hits, cache.misses) == (1, 0, 1)
+
+
+def test_refreshes_stale_snapshot_in_background(clock):
+    block = threading.Event()
+    block.set()
+    client = _client(block)
+    cache = listcache.ListCache(client, soft_ttl=10, hard_ttl=100)
+    cache.get("p")
+
+    block.clear()
+    clock[0] += 20
+    assert _descriptions(cache.get("p")) == ["1"]
+    assert _descriptions(cache.get("p")) == ["1"]
+    refresh = cache._refreshing["p"]
+    block.set()
+    refresh.result(timeout=5)
+
+    assert _descriptions(cache.get("p")) == ["2"]
+    assert client.list_environments.call_count == 2
+    assert cache.stale_hits == 2
+
+
+def test_waits_after_hard_ttl(clock):
+    client = _client()
+    cache = listcache.ListCache(client, soft_ttl=10, hard_ttl=100)
+    cache.get("p")
+    clock[0] += 100
+    assert _descriptions(cache.get("p")) == ["2"]
+    cache.invalidate()
+    assert _descriptions(cache.get("p")) == ["3"]
+    assert cache.misses == 3
+
+
+def test_concurrent_callers_share_refresh(clock):
+    block = threading.Event()
+    client = _client(block)
+    cache = listcache.ListCache(client)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("p")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    block.set()
+    for thread in threads:
+        thread.join()
+
+    assert client.list_environments.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_failed_refresh(clock):
+    client = _client()
+    cache = listcache.ListCache(client, soft_ttl=10, hard_ttl=100)
+    cache.get("p")
+    client.list_environments.side_effect = exceptions.ServiceUnavailable("down")
+
+    clock[0] += 20
+    assert _descriptions(cache.get("p")) == ["1"]
+    with pytest.raises(exceptions.ServiceUnavailable):
+        cache._refreshing["p"].result(timeout=5)
+    assert _descriptions(cache.get("p")) == ["1"]
+
+    with pytest.raises(exceptions.ServiceUnavailable):
+        cache.get("q")
+
+
+def test_snapshot_holds_every_page():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    cache = listcache.ListCache(client)
+
+    with mock.patch.object(
+        type(client._transport.list_environments), "__call__"
+    ) as call:
+        call.side_effect = (
+            service.ListEnvironmentsResponse(
+                environments=[environment.Environment(name="a")],
+                next_page_token="abc",
+            ),
+            service.ListEnvironmentsResponse(
+                environments=[environment.Environment(name="b")],
+            ),
+        )
+        items = cache.get("projects/p/locations/l")
+
+    assert [item.name for item in items] == ["a", "b"]
+    assert call.call_count == 2
+
+
+def test_invalid_ttls():
+    with pytest.raises(ValueError):
+        listcache.ListCache(mock.Mock(), soft_ttl=10, hard_ttl=5)
+
+
+def _async_client(release=None):
+    version = [0]
+
+    async def list_environments(request, **kwargs):
+        if release is not None:
+            await release.wait()
+        version[0] += 1
+
+        async def pager():
+            yield environment.Environment(name="env", description=str(version[0]))
+
+        return pager()
+
+    client = mock.Mock()
+    client.list_environments = mock.AsyncMock(side_effect=list_environments)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_async_stale_while_revalidate(clock):
+    client = _async_client()
+    cache = listcache.AsyncListCache(client, soft_ttl=10, hard_ttl=100)
+
+    results = await asyncio.gather(cache.get("p"), cache.get("p"))
+    assert [_descriptions(result) for result in results] == [["1"], ["1"]]
+    assert client.list_environments.await_count == 1
+
+    clock[0] += 20
+    assert _descriptions(await cache.get("p")) == ["1"]
+    await cache._refreshing["p"]
+    assert _descriptions(await cache.get("p")) == ["2"]
+
+    clock[0] += 100
+    assert _descriptions(await cache.get("p")) == ["3"]
+
+
+@pytest.mark.asyncio
+async def test_async_failed_background_refresh(clock):
+    client = _async_client()
+    cache = listcache.AsyncListCache(client, soft_ttl=10, hard_ttl=100)
+    await cache.get("p")
+    client.list_environments.side_effect = exceptions.ServiceUnavailable("down")
+
+    clock[0] += 20
+    assert _descriptions(await cache.get("p")) == ["1"]
+    with pytest.raises(exceptions.ServiceUnavailable):
+        await cache._refreshing["p"]
+    await asyncio.sleep(0)
+    assert not cache._refreshing
+    assert _descriptions(await cache.get("p")) == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_async_client_snapshot():
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+    )
+    cache = listcache.AsyncListCache(client)
+
+    with mock.patch.object(
+        type(client._client._transport.list_environments), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            service.ListEnvironmentsResponse(
+                environments=[environment.Environment(name="a")]
+            )
+        )
+        items = await cache.get("projects/p/locations/l")
+
+    assert [item.name for item in items] == ["a"]
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.api_core import operations_v1
+from google.api_core import retry
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import notfound
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.longrunning import operations_pb2
+
+PARENT = "projects/p/locations/l"
+INSTANCE = PARENT + "/instances/nb"
+ENVIRONMENT = PARENT + "/environments/env"
+
+
+def _client(cache):
+    return NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        not_found_cache=cache,
+    )
+
+
+def test_cache_expires():
+    cache = notfound.NotFoundCache(ttl=10)
+    with mock.patch("time.monotonic", return_value=100.0):
+        cache.add("a", "a is gone")
+        assert "a" in cache
+        with pytest.raises(exceptions.NotFound, match="a is gone"):
+            cache.check("a")
+        cache.check("b")
+    with mock.patch("time.monotonic", return_value=110.0):
+        assert "a" not in cache
+        cache.check("a")
+    assert cache.hits == 1
+    assert len(cache) == 0
+
+
+def test_cache_evicts_oldest():
+    cache = notfound.NotFoundCache(max_size=2)
+    cache.add("a")
+    cache.add("b")
+    cache.add("a")
+    cache.add("c")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    cache.invalidate("a")
+    assert "a" not in cache
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        notfound.NotFoundCache(ttl=0)
+    with pytest.raises(ValueError):
+        notfound.NotFoundCache(max_size=0)
+
+
+def test_get_answers_repeated_misses_locally():
+    client = _client(notfound.NotFoundCache())
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.side_effect = exceptions.NotFound("Instance not found")
+        for _ in range(3):
+            with pytest.raises(exceptions.NotFound, match="Instance not found"):
+                client.get_instance(request={"name": INSTANCE})
+
+    assert call.call_count == 1
+
+
+def test_found_names_are_not_cached():
+    cache = notfound.NotFoundCache()
+    client = _client(cache)
+
+    with mock.patch.object(type(client._transport.get_environment), "__call__") as call:
+        call.return_value = environment.Environment(name=ENVIRONMENT)
+        client.get_environment(request={"name": ENVIRONMENT})
+        client.get_environment(request={"name": ENVIRONMENT})
+
+    assert call.call_count == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "method,request_,name",
+    [
+        ("create_instance", {"parent": PARENT, "instance_id": "nb"}, INSTANCE),
+        ("register_instance", {"parent": PARENT, "instance_id": "nb"}, INSTANCE),
+        (
+            "create_environment",
+            {"parent": PARENT, "environment_id": "env"},
+            ENVIRONMENT,
+        ),
+    ],
+)
+def test_create_invalidates(method, request_, name):
+    cache = notfound.NotFoundCache()
+    cache.add(name)
+    cache.add(PARENT + "/instances/other")
+    client = _client(cache)
+
+    with mock.patch.object(
+        type(getattr(client._transport, method)), "__call__"
+    ) as call:
+        call.return_value = operations_pb2.Operation(name="operations/op", done=True)
+        getattr(client, method)(request=request_)
+
+    assert name not in cache
+    assert PARENT + "/instances/other" in cache
+
+
+def test_get_while_creating_is_not_cached():
+    cache = notfound.NotFoundCache()
+    client = _client(cache)
+    done = threading.Event()
+
+    def get_operation(self, name, *args, **kwargs):
+        op = operations_pb2.Operation(name=name, done=done.is_set())
+        if op.done:
+            op.response.Pack(instance.Instance.pb(instance.Instance(name=INSTANCE)))
+        return op
+
+    with mock.patch.object(
+        operations_v1.OperationsClient, "get_operation", get_operation
+    ):
+        with mock.patch.object(
+            type(client._transport.create_instance), "__call__"
+        ) as create:
+            create.return_value = operations_pb2.Operation(name="operations/op")
+            op = client.create_instance(request={"parent": PARENT, "instance_id": "nb"})
+
+        with mock.patch.object(type(client._transport.get_instance), "__call__") as get:
+            # Missing while it is created, but not remembered as missing.
+            get.side_effect = exceptions.NotFound("Instance not found")
+            for _ in range(2):
+                with pytest.raises(exceptions.NotFound):
+                    client.get_instance(request={"name": INSTANCE})
+            assert get.call_count == 2
+            assert INSTANCE not in cache
+
+            done.set()
+            op.result(polling=retry.Retry(initial=0.001, maximum=0.01, timeout=5))
+            get.side_effect = None
+            get.return_value = instance.Instance(name=INSTANCE)
+            assert client.get_instance(request={"name": INSTANCE}).name == INSTANCE
+
+            # Misses are remembered again once the create is done.
+            get.side_effect = exceptions.NotFound("Instance not found")
+            for _ in range(2):
+                with pytest.raises(exceptions.NotFound):
+                    client.get_instance(request={"name": INSTANCE})
+            assert get.call_count == 4
+
+
+def test_failed_create_invalidates():
+    cache = notfound.NotFoundCache()
+    cache.add(INSTANCE)
+    client = _client(cache)
+
+    with mock.patch.object(type(client._transport.create_instance), "__call__") as call:
+        call.side_effect = lambda *args, **kwargs: cache.add(INSTANCE) or 1 / 0
+        with pytest.raises(ZeroDivisionError):
+            client.create_instance(request={"parent": PARENT, "instance_id": "nb"})
+
+    assert INSTANCE not in cache
+
+
+@pytest.mark.asyncio
+async def test_async_client():
+    cache = notfound.NotFoundCache()
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        not_found_cache=cache,
+    )
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.side_effect = exceptions.NotFound("Instance not found")
+        for _ in range(2):
+            with pytest.raises(exceptions.NotFound):
+                await client.get_instance(request={"name": INSTANCE})
+    assert call.call_count == 1
+
+    with mock.patch.object(
+        type(client._client._transport.create_instance), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            operations_pb2.Operation(name="operations/op", done=True)
+        )
+        await client.create_instance(request={"parent": PARENT, "instance_id": "nb"})
+
+    assert INSTANCE not in cache
+
+    # Misses are remembered again once the done operation is seen.
+    await asyncio.sleep(0)
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.side_effect = exceptions.NotFound("Instance not found")
+        for _ in range(2):
+            with pytest.raises(exceptions.NotFound):
+                await client.get_instance(request={"name": INSTANCE})
+    assert call.call_count == 1
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+import pytest
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import planner
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+T4 = instance.Instance.AcceleratorType.NVIDIA_TESLA_T4
+
+
+def _actual(**kwargs):
+    fields = dict(
+        name="projects/p/instances/a",
+        machine_type="n1-standard-4",
+        labels={"team": "ml"},
+        network="default",
+        vm_image=environment.VmImage(project="dl"),
+        state=instance.Instance.State.ACTIVE,
+    )
+    fields.update(kwargs)
+    return instance.Instance(**fields)
+
+
+def test_no_op():
+    plan = planner.plan_updates(
+        _actual(),
+        instance.Instance(machine_type="n1-standard-4", labels={"team": "ml"}),
+    )
+    assert not plan
+    assert plan.requests == []
+    assert plan.immutable_changes == []
+
+
+def test_unset_fields_are_ignored():
+    plan = planner.plan_updates(_actual(), instance.Instance())
+    assert not plan
+
+
+def test_only_changed_fields():
+    plan = planner.plan_updates(
+        _actual(),
+        instance.Instance(
+            machine_type="n1-standard-4",
+            labels={"team": "ml", "env": "prod"},
+        ),
+    )
+    assert plan.requests == [
+        service.SetInstanceLabelsRequest(
+            name="projects/p/instances/a", labels={"team": "ml", "env": "prod"}
+        )
+    ]
+
+
+def test_all_mutable_fields_in_order():
+    plan = planner.plan_updates(
+        _actual(),
+        instance.Instance(
+            labels={"team": "infra"},
+            machine_type="n1-standard-8",
+            accelerator_config=instance.Instance.AcceleratorConfig(
+                type=T4, core_count=1
+            ),
+        ),
+    )
+    assert [type(r) for r in plan] == [
+        service.SetInstanceMachineTypeRequest,
+        service.SetInstanceAcceleratorRequest,
+        service.SetInstanceLabelsRequest,
+    ]
+    assert plan.requests[1].type == T4
+    assert plan.requests[1].core_count == 1
+    assert len(plan) == 3
+
+
+def test_explicit_fields_clear_labels():
+    assert not planner.plan_updates(_actual(), instance.Instance())
+    plan = planner.plan_updates(_actual(), instance.Instance(), fields=["labels"])
+    assert plan.requests == [
+        service.SetInstanceLabelsRequest(name="projects/p/instances/a")
+    ]
+
+
+def test_immutable_changes():
+    changes = planner.diff_instances(
+        _actual(),
+        instance.Instance(
+            network="other",
+            container_image=environment.ContainerImage(repository="r"),
+        ),
+    )
+    assert changes.mutable == []
+    assert changes.immutable == ["container_image", "network"]
+
+    with pytest.raises(ValueError):
+        planner.diff_instances(_actual(), instance.Instance(), fields=["state"])
+
+
+def test_execute():
+    plan = planner.plan_updates(
+        _actual(), instance.Instance(machine_type="m", labels={"a": "b"})
+    )
+    client = mock.Mock()
+
+    operations = plan.execute(client, metadata=[("k", "v")])
+
+    client.set_instance_machine_type.assert_called_once_with(
+        plan.requests[0], metadata=[("k", "v")]
+    )
+    client.set_instance_labels.assert_called_once_with(
+        plan.requests[1], metadata=[("k", "v")]
+    )
+    assert operations == [
+        client.set_instance_machine_type.return_value,
+        client.set_instance_labels.return_value,
+    ]
+    client.set_instance_labels.return_value.result.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_execute_async():
+    plan = planner.plan_updates(_actual(), instance.Instance(machine_type="m"))
+    op = mock.Mock()
+    op.result = mock.AsyncMock()
+    client = mock.Mock()
+    client.set_instance_machine_type = mock.AsyncMock(return_value=op)
+
+    assert await plan.execute_async(client) == [op]
+    op.result.assert_awaited_once_with()
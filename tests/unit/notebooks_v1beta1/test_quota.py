@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import quota
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+def test_request_project_and_method_class():
+    assert quota.request_project(service.GetInstanceRequest(name="projects/p/x")) == "p"
+    assert (
+        quota.request_project(service.ListInstancesRequest(parent="projects/q/l"))
+        == "q"
+    )
+    assert (
+        quota.request_project(
+            service.IsInstanceUpgradeableRequest(notebook_instance="projects/r/i")
+        )
+        == "r"
+    )
+    assert quota.request_project(service.GetInstanceRequest()) == ""
+
+    assert quota.method_class("get_instance") == quota.READ
+    assert quota.method_class("set_instance_labels") == quota.MUTATE
+
+
+def test_tenant():
+    assert quota.current_tenant() == quota.DEFAULT_TENANT
+    with quota.tenant("a"):
+        with quota.tenant("b"):
+            assert quota.current_tenant() == "b"
+        assert quota.current_tenant() == "a"
+    assert quota.current_tenant() == quota.DEFAULT_TENANT
+
+
+def test_buckets_are_per_project_and_class():
+    manager = quota.QuotaManager(read_rate=1, mutate_rate=1)
+
+    assert manager.acquire("p", "get_instance", timeout=0)
+    assert not manager.acquire("p", "list_instances", timeout=0)
+    assert manager.acquire("p", "create_instance", timeout=0)
+    assert manager.acquire("q", "get_instance", timeout=0)
+    assert manager.available("p", quota.READ) < 1
+
+
+def test_refill_and_overrides():
+    manager = quota.QuotaManager(read_rate=100, burst=0.05)
+    assert manager.available("p", quota.READ) == 5
+
+    manager.set_rate("p", quota.READ, 1000, burst=0.002)
+    assert manager.available("p", quota.READ) == 2
+    assert manager.acquire("p", "get_instance", timeout=0)
+    assert manager.acquire("p", "get_instance", timeout=0)
+    # Refilled at 1000 tokens per second.
+    assert manager.acquire("p", "get_instance", timeout=0.1)
+
+    with pytest.raises(ValueError):
+        manager.set_rate("p", "other", 1)
+
+
+def test_round_robin_between_tenants():
+    manager = quota.QuotaManager(read_rate=50, burst=0.02)
+    manager.acquire("p", "get_instance")
+    order = []
+
+    def worker(name):
+        with quota.tenant(name):
+            manager.acquire("p", "get_instance")
+            order.append(name)
+
+    threads = [threading.Thread(target=worker, args=("noisy",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.005)
+    quiet = threading.Thread(target=worker, args=("quiet",))
+    quiet.start()
+    for thread in threads + [quiet]:
+        thread.join()
+
+    # The quiet tenant does not wait behind every noisy request.
+    assert order.index("quiet") <= 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_async():
+    manager = quota.QuotaManager(read_rate=100, burst=0.01)
+    assert await manager.acquire_async("p", "get_instance")
+    assert not await manager.acquire_async("p", "get_instance", timeout=0)
+    assert await manager.acquire_async("p", "get_instance", timeout=1)
+
+
+def test_client_waits_for_quota():
+    manager = quota.QuotaManager(mutate_rate=1, max_wait=0)
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        quota_manager=manager,
+    )
+
+    with mock.patch.object(
+        type(client._transport.set_instance_labels), "__call__"
+    ) as call:
+        client.set_instance_labels(request={"name": "projects/p/instances/a"})
+        with pytest.raises(exceptions.ResourceExhausted):
+            client.set_instance_labels(request={"name": "projects/p/instances/a"})
+        client.set_instance_labels(request={"name": "projects/q/instances/a"})
+
+    assert call.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_waits_for_quota():
+    manager = quota.QuotaManager(read_rate=1, max_wait=0)
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+        quota_manager=manager,
+    )
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(instance.Instance())
+        await client.get_instance(request={"name": "projects/p/instances/a"})
+        with pytest.raises(exceptions.ResourceExhausted):
+            await client.get_instance(request={"name": "projects/p/instances/b"})
+
+    assert call.call_count == 1
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.notebooks_v1beta1.services.notebook_service import reconciler
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+PARENT = "projects/p/locations/l"
+
+
+def _existing(instance_id, **kwargs):
+    return instance.Instance(
+        name="{0}/instances/{1}".format(PARENT, instance_id), **kwargs
+    )
+
+
+def _client(actual=()):
+    client = mock.Mock()
+    client.list_instances.return_value = list(actual)
+    return client
+
+
+def test_parse_desired_state():
+    desired = reconciler.parse_desired_state(
+        {
+            "instances": {
+                "a": {
+                    "machineType": "n1-standard-4",
+                    "vm_image": {"project": "dl", "image_family": "tf"},
+                    "labels": {"team": "ml"},
+                },
+                "b": None,
+            }
+        }
+    )
+    assert desired["a"].machine_type == "n1-standard-4"
+    assert desired["a"].vm_image.image_family == "tf"
+    assert dict(desired["a"].labels) == {"team": "ml"}
+    assert desired["b"] == instance.Instance()
+
+    with pytest.raises(ValueError):
+        reconciler.parse_desired_state({"instance": {}})
+
+
+def test_load_desired_state_json(tmpdir):
+    path = tmpdir.join("fleet.json")
+    path.write(json.dumps({"instances": {"a": {"machine_type": "m"}}}))
+    assert reconciler.load_desired_state(str(path)) == {
+        "a": instance.Instance(machine_type="m")
+    }
+
+
+def test_plan():
+    client = _client(
+        [
+            _existing("keep", machine_type="m"),
+            _existing("resize", machine_type="m"),
+            _existing("extra", machine_type="m"),
+        ]
+    )
+    fleet = reconciler.FleetReconciler(client, PARENT, prune=True)
+    plan = fleet.plan(
+        {
+            "keep": instance.Instance(machine_type="m"),
+            "resize": instance.Instance(machine_type="big", labels={"a": "b"}),
+            "new": instance.Instance(machine_type="m"),
+        }
+    )
+
+    client.list_instances.assert_called_once_with(request={"parent": PARENT})
+    assert [step.key for step in plan] == [
+        "create:new",
+        "update:resize:set_instance_machine_type",
+        "update:resize:set_instance_labels",
+        "delete:extra",
+    ]
+    assert plan.steps[0].request == service.CreateInstanceRequest(
+        parent=PARENT, instance_id="new", instance=instance.Instance(machine_type="m")
+    )
+    assert plan.steps[2].depends_on == ("update:resize:set_instance_machine_type",)
+    assert plan.steps[3].request.name == PARENT + "/instances/extra"
+
+
+def test_plan_immutable_changes():
+    actual = [_existing("a", network="default")]
+    desired = {"a": instance.Instance(network="other")}
+
+    plan = reconciler.FleetReconciler(_client(), PARENT).plan(desired, actual)
+    assert not plan
+    assert plan.drift == {"a": ["network"]}
+    assert plan.describe() == ["# a: cannot update network in place"]
+
+    plan = reconciler.FleetReconciler(_client(), PARENT, recreate=True).plan(
+        desired, actual
+    )
+    assert [step.key for step in plan] == ["delete:a", "create:a"]
+    assert plan.steps[1].depends_on == ("delete:a",)
+
+
+def test_apply_dry_run():
+    client = _client()
+    fleet = reconciler.FleetReconciler(client, PARENT)
+    result = fleet.reconcile({"a": instance.Instance()}, dry_run=True)
+
+    assert result.ok
+    assert result.succeeded == []
+    client.create_instance.assert_not_called()
+
+
+def test_apply_skips_dependents_of_failures():
+    client = _client(
+        [_existing("a", machine_type="m"), _existing("b", machine_type="m")]
+    )
+    client.set_instance_machine_type.side_effect = [
+        exceptions.FailedPrecondition("busy")
+    ]
+    client.set_instance_labels.return_value.operation.name = "operations/1"
+    progress = []
+    fleet = reconciler.FleetReconciler(
+        client,
+        PARENT,
+        max_concurrent_operations=2,
+        on_progress=lambda step, exc: progress.append(step.key),
+    )
+
+    result = fleet.reconcile(
+        {
+            "a": instance.Instance(machine_type="big", labels={"x": "y"}),
+            "b": instance.Instance(labels={"x": "y"}),
+        }
+    )
+
+    assert not result.ok
+    assert list(result.failed) == ["update:a:set_instance_machine_type"]
+    assert isinstance(
+        result.failed["update:a:set_instance_machine_type"],
+        exceptions.FailedPrecondition,
+    )
+    assert result.skipped == ["update:a:set_instance_labels"]
+    assert result.succeeded == ["update:b:set_instance_labels"]
+    assert sorted(progress) == [
+        "update:a:set_instance_machine_type",
+        "update:b:set_instance_labels",
+    ]
+    client.set_instance_labels.assert_called_once_with(
+        service.SetInstanceLabelsRequest(
+            name=PARENT + "/instances/b", labels={"x": "y"}
+        )
+    )
+
+
+def test_journal_resume(tmpdir):
+    journal = str(tmpdir.join("journal"))
+    client = _client()
+    client.create_instance.return_value.operation.name = "operations/a"
+    client.create_instance.return_value.result.side_effect = TimeoutError
+    fleet = reconciler.FleetReconciler(client, PARENT, journal_path=journal)
+
+    # Gave up waiting for the operation.
+    result = fleet.reconcile({"a": instance.Instance()})
+    assert list(result.failed) == ["create:a"]
+
+    operations_client = client.operations_client
+    with mock.patch.object(reconciler.operation, "from_gapic") as from_gapic:
+        result = fleet.resume()
+
+    operations_client.get_operation.assert_called_once_with("operations/a")
+    from_gapic.return_value.result.assert_called_once_with(timeout=None)
+    assert result.succeeded == ["create:a"]
+
+    # Nothing is left to resume.
+    operations_client.get_operation.reset_mock()
+    assert fleet.resume().succeeded == []
+    operations_client.get_operation.assert_not_called()
+
+
+def test_reconcile_reports_resumed_failures(tmpdir):
+    journal = str(tmpdir.join("journal"))
+    client = _client()
+    client.create_instance.return_value.operation.name = "operations/a"
+    client.create_instance.return_value.result.side_effect = TimeoutError
+    fleet = reconciler.FleetReconciler(client, PARENT, journal_path=journal)
+    fleet.reconcile({"a": instance.Instance()})
+
+    client.list_instances.return_value = [_existing("a")]
+    client.create_instance.return_value.result.side_effect = None
+    with mock.patch.object(reconciler.operation, "from_gapic") as from_gapic:
+        from_gapic.return_value.result.side_effect = exceptions.Aborted("gone")
+        result = fleet.reconcile({"a": instance.Instance(), "b": instance.Instance()})
+
+    assert list(result.failed) == ["create:a"]
+    assert isinstance(result.failed["create:a"], exceptions.Aborted)
+    assert result.succeeded == ["create:b"]
+    assert not result.ok
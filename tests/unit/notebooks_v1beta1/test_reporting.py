@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import reporting
+from google.longrunning import operations_pb2
+
+NAME = "projects/p/locations/l/instances/nb"
+
+
+def _reporter(client=None, **kwargs):
+    kwargs.setdefault("min_interval", 5)
+    kwargs.setdefault("heartbeat", 60)
+    return reporting.InstanceReporter(client or mock.Mock(), NAME, "vm-1", **kwargs)
+
+
+def _report(reporter, now):
+    with mock.patch("time.monotonic", return_value=now):
+        return reporter.report()
+
+
+def _sent(client):
+    return [
+        dict(call[1]["request"].metadata)
+        for call in client.report_instance_info.call_args_list
+    ]
+
+
+def test_reports_only_changes_and_heartbeats():
+    client = mock.Mock()
+    reporter = _reporter(client)
+    reporter.update({"a": "1"})
+
+    assert _report(reporter, 100) is not None
+    assert _report(reporter, 101) is None
+    reporter.update({"a": "2"})
+    reporter.update({"b": "1"})
+    # Rate limited until min_interval has passed.
+    assert _report(reporter, 102) is None
+    assert _report(reporter, 106) is not None
+    assert _report(reporter, 130) is None
+    assert _report(reporter, 166) is not None
+
+    assert _sent(client) == [{"a": "1"}, {"a": "2", "b": "1"}, {"a": "2", "b": "1"}]
+    assert (reporter.sent, reporter.skipped) == (3, 3)
+    request = client.report_instance_info.call_args[1]["request"]
+    assert (request.name, request.vm_id) == (NAME, "vm-1")
+
+
+def test_reverted_change_is_not_reported():
+    client = mock.Mock()
+    reporter = _reporter(client)
+    reporter.update({"a": "1"})
+    _report(reporter, 100)
+    reporter.update({"a": "2"})
+    reporter.update({"a": "1"})
+    assert _report(reporter, 110) is None
+    assert client.report_instance_info.call_count == 1
+
+
+def test_wait_for_operation():
+    client = mock.Mock()
+    reporter = _reporter(client, wait=True, operation_timeout=3)
+    op = reporter.report()
+    op.result.assert_called_once_with(timeout=3)
+    assert not _reporter(mock.Mock()).report().result.called
+
+
+def test_failed_report_is_retried():
+    client = mock.Mock()
+    client.report_instance_info.side_effect = [exceptions.ServiceUnavailable("x"), 1]
+    reporter = _reporter(client)
+    reporter.update({"a": "1"})
+    with pytest.raises(exceptions.ServiceUnavailable):
+        _report(reporter, 100)
+    assert _report(reporter, 101) == 1
+    assert reporter.sent == 1
+
+
+def test_run_until_stopped():
+    client = mock.Mock()
+    client.report_instance_info.side_effect = exceptions.ServiceUnavailable("x")
+    stop = threading.Event()
+    stop.set()
+    _reporter(client).run(stop)
+    assert client.report_instance_info.call_count == 1
+
+
+def test_sends_through_client():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    reporter = _reporter(client)
+    reporter.update({"a": "1"})
+    with mock.patch.object(
+        type(client._transport.report_instance_info), "__call__"
+    ) as call:
+        call.return_value = operations_pb2.Operation(name="operations/op")
+        reporter.report()
+
+    request = call.call_args[0][0]
+    assert dict(request.metadata) == {"a": "1"}
+    assert ("x-goog-request-params", "name={0}".format(NAME)) in call.call_args[1][
+        "metadata"
+    ]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        _reporter(min_interval=10, heartbeat=5)
+    with pytest.raises(ValueError):
+        _reporter(min_interval=0)
+    with pytest.raises(ValueError):
+        _reporter().run(threading.Event(), interval=0)
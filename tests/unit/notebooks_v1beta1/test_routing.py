@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+
+from google.api_core import gapic_v1
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import routing
+from google.cloud.notebooks_v1beta1.services.notebook_service import version
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+def test_routing_metadata_is_memoized():
+    name = "projects/p/locations/l/instances/a b"
+    first = routing.routing_metadata("name", name)
+    assert first == gapic_v1.routing_header.to_grpc_metadata((("name", name),))
+    assert routing.routing_metadata("name", name) is first
+    assert routing.routing_metadata("parent", name) != first
+    assert routing.routing_metadata.cache_info().maxsize == routing.CACHE_SIZE
+
+
+def test_client_info_metadata_is_built_once():
+    info = version.client_info()
+    assert info.to_grpc_metadata() is info.to_grpc_metadata()
+
+
+def test_client_sends_routing_header():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        client.get_instance(request={"name": "projects/p/instances/x"})
+
+    _, kwargs = call.call_args
+    metadata = dict(kwargs["metadata"])
+    assert metadata["x-goog-request-params"] == "name=projects/p/instances/x"
+    assert "x-goog-api-client" in metadata
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+import time
+
+import mock
+import pytest
+
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import quota
+from google.cloud.notebooks_v1beta1.services.notebook_service import scheduling
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+def test_priority_context():
+    assert scheduling.current_priority() == scheduling.NORMAL
+    with scheduling.priority(scheduling.BATCH):
+        assert scheduling.current_priority() == scheduling.BATCH
+        with scheduling.priority(scheduling.INTERACTIVE):
+            assert scheduling.current_priority() == scheduling.INTERACTIVE
+        assert scheduling.current_priority() == scheduling.BATCH
+    assert scheduling.current_priority() == scheduling.NORMAL
+
+
+def _queue(scheduler, klass, admitted):
+    def worker():
+        scheduler.acquire(klass)
+        admitted.append(klass)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    while scheduler.queued(klass) == 0:
+        time.sleep(0.001)
+    return thread
+
+
+def test_weighted_fair_order():
+    scheduler = scheduling.PriorityScheduler(1)
+    scheduler.acquire()
+    admitted = []
+    threads = [_queue(scheduler, scheduling.BATCH, admitted) for _ in range(3)]
+    threads += [_queue(scheduler, scheduling.INTERACTIVE, admitted) for _ in range(16)]
+    assert scheduler.queued() == 19
+
+    for count in range(1, 20):
+        scheduler.release()
+        while len(admitted) < count:
+            time.sleep(0.001)
+
+    for thread in threads:
+        thread.join()
+    # Batch calls get one slot for every eight interactive ones.
+    interactive, batch = [scheduling.INTERACTIVE] * 8, [scheduling.BATCH]
+    assert admitted == interactive + batch + interactive + batch * 2
+
+
+def test_queue_time_stats():
+    waits = []
+    scheduler = scheduling.PriorityScheduler(
+        1, on_queue_time=lambda klass, wait: waits.append((klass, wait))
+    )
+    scheduler.acquire(scheduling.INTERACTIVE)
+    admitted = []
+    thread = _queue(scheduler, scheduling.BATCH, admitted)
+    time.sleep(0.01)
+    scheduler.release()
+    thread.join()
+
+    stats = scheduler.queue_time_stats()
+    assert stats[scheduling.INTERACTIVE].count == 1
+    assert stats[scheduling.INTERACTIVE].queued == 0
+    assert stats[scheduling.BATCH].queued == 1
+    assert stats[scheduling.BATCH].max >= 0.01
+    assert stats[scheduling.BATCH].mean == stats[scheduling.BATCH].total
+    assert stats[scheduling.NORMAL].mean == 0
+    assert [klass for klass, _ in waits] == [scheduling.INTERACTIVE, scheduling.BATCH]
+    assert scheduler.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_and_cancellation():
+    scheduler = scheduling.PriorityScheduler(1)
+    await scheduler.acquire_async()
+
+    cancelled = asyncio.ensure_future(scheduler.acquire_async())
+    waiting = asyncio.ensure_future(scheduler.acquire_async(scheduling.BATCH))
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 2
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 1
+
+    scheduler.release()
+    await asyncio.wait_for(waiting, 1)
+    assert scheduler.in_flight == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        scheduling.PriorityScheduler(0)
+    with pytest.raises(ValueError):
+        scheduling.PriorityScheduler(weights={scheduling.NORMAL: 0})
+    scheduler = scheduling.PriorityScheduler()
+    with pytest.raises(ValueError):
+        scheduler.acquire("urgent")
+
+
+def test_client_schedules_by_priority():
+    waits = []
+    scheduler = scheduling.PriorityScheduler(
+        on_queue_time=lambda klass, wait: waits.append(klass)
+    )
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        scheduler=scheduler,
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        with scheduling.priority(scheduling.INTERACTIVE):
+            client.get_instance(request={"name": "x"})
+
+    assert waits == [scheduling.INTERACTIVE]
+    assert scheduler.in_flight == 0
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_priority_applies_before_quota():
+    scheduler = scheduling.PriorityScheduler(max_concurrency=1)
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        scheduler=scheduler,
+        quota_manager=quota.QuotaManager(read_rate=10, burst=0.1),
+        coalesce_reads=False,
+    )
+    name = "projects/p/locations/l/instances/x"
+    sent = []
+
+    def get(request, **kwargs):
+        sent.append(scheduling.current_priority())
+        return instance.Instance(name=request.name)
+
+    def call(klass):
+        with scheduling.priority(klass):
+            client.get_instance(request={"name": name})
+
+    with mock.patch.object(
+        type(client._transport.get_instance), "__call__", side_effect=get
+    ):
+        # Spend the only token, so that the next call waits for quota.
+        client.get_instance(request={"name": name})
+        threads = [threading.Thread(target=call, args=(scheduling.BATCH,))]
+        threads[0].start()
+        _wait_until(lambda: scheduler.in_flight == 1)
+        for klass in (scheduling.BATCH, scheduling.BATCH, scheduling.INTERACTIVE):
+            threads.append(threading.Thread(target=call, args=(klass,)))
+            threads[-1].start()
+        # They queue for admission, not for quota.
+        _wait_until(lambda: scheduler.queued() == 3)
+        for thread in threads:
+            thread.join()
+
+    # The interactive call overtakes the batch calls queued for quota.
+    assert sent[1:] == [
+        scheduling.BATCH,
+        scheduling.INTERACTIVE,
+        scheduling.BATCH,
+        scheduling.BATCH,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_client_schedules_by_priority():
+    waits = []
+    scheduler = scheduling.PriorityScheduler(
+        on_queue_time=lambda klass, wait: waits.append(klass)
+    )
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+        scheduler=scheduler,
+    )
+
+    with mock.patch.object(
+        type(client._client._transport.get_instance), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            instance.Instance(name="x")
+        )
+        with scheduling.priority(scheduling.BATCH):
+            await client.get_instance(request={"name": "x"})
+
+    assert waits == [scheduling.BATCH]
+    assert scheduler.in_flight == 0
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceAsyncClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import singleflight
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+def test_request_key():
+    a = service.GetInstanceRequest(name="a")
+    assert singleflight.request_key("get", a, [("k", "v")]) == (
+        singleflight.request_key(
+            "get", service.GetInstanceRequest(name="a"), (("k", "v"),)
+        )
+    )
+    assert singleflight.request_key("get", a, ()) != singleflight.request_key(
+        "get", a, [("k", "v")]
+    )
+    assert singleflight.request_key("get", a, ()) != singleflight.request_key(
+        "other", a, ()
+    )
+    assert singleflight.request_key("get", a, (), timeout=1) != (
+        singleflight.request_key("get", a, (), timeout=60)
+    )
+    retry = mock.sentinel.retry
+    assert singleflight.request_key("get", a, (), retry) == (
+        singleflight.request_key("get", a, (), retry)
+    )
+    assert singleflight.request_key("get", a, (), retry) != (
+        singleflight.request_key("get", a, ())
+    )
+
+
+def _concurrently(fn, count):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(fn) for _ in range(count)]
+        return [f.result() for f in futures]
+
+
+def test_client_coalesces_identical_reads():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    release = threading.Event()
+
+    def get(request, metadata=(), timeout=None):
+        release.wait()
+        return instance.Instance(name=request.name)
+
+    with mock.patch.object(
+        type(client._transport.get_instance), "__call__", side_effect=get
+    ) as call:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(client.get_instance, request={"name": "x"})
+                for _ in range(8)
+            ]
+            # Wait for every caller to join the first one.
+            while len(client._read_flights) == 0 or call.call_count == 0:
+                time.sleep(0.001)
+            time.sleep(0.05)
+            release.set()
+            results = [f.result() for f in futures]
+
+    assert call.call_count == 1
+    assert all(r == instance.Instance(name="x") for r in results)
+    # Every caller owns its response.
+    assert len({id(r) for r in results}) == 8
+    assert len(client._read_flights) == 0
+
+
+def test_callers_with_other_timeouts_do_not_share():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    release = threading.Event()
+
+    def get(request, metadata=(), timeout=None):
+        release.wait()
+        if timeout < 1:
+            raise exceptions.DeadlineExceeded("too slow")
+        return instance.Instance(name=request.name)
+
+    with mock.patch.object(
+        type(client._transport.get_instance), "__call__", side_effect=get
+    ) as call:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            short = executor.submit(
+                client.get_instance, request={"name": "x"}, timeout=0.05
+            )
+            while call.call_count == 0:
+                time.sleep(0.001)
+            long = executor.submit(
+                client.get_instance, request={"name": "x"}, timeout=60
+            )
+            while call.call_count < 2:
+                time.sleep(0.001)
+            release.set()
+
+            with pytest.raises(exceptions.DeadlineExceeded):
+                short.result()
+            assert long.result().name == "x"
+
+
+def test_shares_errors():
+    flights = singleflight.SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        release.wait()
+        raise exceptions.NotFound("x")
+
+    def do():
+        try:
+            flights.do("k", fail)
+        except exceptions.NotFound as exc:
+            return exc
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(do) for _ in range(4)]
+        while not calls:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        errors = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(isinstance(e, exceptions.NotFound) for e in errors)
+
+
+def test_client_coalescing_disabled():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        coalesce_reads=False,
+    )
+    assert client._read_flights is None
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        _concurrently(lambda: client.get_instance(request={"name": "x"}), 2)
+
+    assert call.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_coalesces_identical_reads():
+    client = NotebookServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport="grpc_asyncio",
+    )
+
+    with mock.patch.object(
+        type(client._client._transport.list_environments), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            service.ListEnvironmentsResponse(next_page_token="")
+        )
+        pagers = await asyncio.gather(
+            client.list_environments(request={"parent": "p"}),
+            client.list_environments(request={"parent": "p"}),
+            client.list_environments(request={"parent": "q"}),
+        )
+
+    assert call.call_count == 2
+    assert pagers[0]._response == pagers[1]._response
+    assert pagers[0]._response is not pagers[1]._response
+    assert len(client._read_flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_cancelled_waiter_does_not_cancel_call():
+    flights = singleflight.AsyncSingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return instance.Instance(name="x")
+
+    first = asyncio.ensure_future(flights.do("k", call))
+    second = asyncio.ensure_future(flights.do("k", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert (await second).name == "x"
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import concurrent.futures
+import threading
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import fingerprint
+from google.cloud.notebooks_v1beta1.services.notebook_service import snapshot
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf import timestamp_pb2
+
+PARENT = "projects/p/locations/l"
+
+
+def _instance(instance_id, seconds=1, **kwargs):
+    return instance.Instance(
+        name="{0}/instances/{1}".format(PARENT, instance_id),
+        update_time=timestamp_pb2.Timestamp(seconds=seconds),
+        **kwargs
+    )
+
+
+def test_snapshot_survives_reopening(tmp_path):
+    path = str(tmp_path / "snapshot.db")
+    with snapshot.SnapshotStore(path) as store:
+        store.put(
+            [
+                _instance("a", machine_type="n1"),
+                instance.Instance.pb(_instance("b")),
+                environment.Environment(name=PARENT + "/environments/env"),
+            ]
+        )
+
+    with snapshot.SnapshotStore(path) as store:
+        assert len(store) == 3
+        assert store.get(PARENT + "/instances/a") == _instance("a", machine_type="n1")
+        assert store.get(PARENT + "/instances/missing") is None
+        assert [item.name for item in store.list(PARENT)] == [
+            PARENT + "/instances/a",
+            PARENT + "/instances/b",
+        ]
+        (env,) = store.list(PARENT, snapshot.ENVIRONMENT)
+        assert isinstance(env, environment.Environment)
+
+
+def test_newer_records_win():
+    store = snapshot.SnapshotStore(":memory:")
+    store.put([_instance("a", seconds=2, machine_type="new")])
+    store.put([_instance("a", seconds=1, machine_type="old")])
+    assert store.get(PARENT + "/instances/a").machine_type == "new"
+    store.put([_instance("a", seconds=3, machine_type="newer")])
+    assert store.get(PARENT + "/instances/a").machine_type == "newer"
+
+    store.put([_instance("b", seconds=5)])
+    assert store.updated_since(2 * 10**9) == [
+        PARENT + "/instances/a",
+        PARENT + "/instances/b",
+    ]
+    store.delete([PARENT + "/instances/a"])
+    assert len(store) == 1
+
+
+def test_put_rejects_unknown_records():
+    store = snapshot.SnapshotStore(":memory:")
+    with pytest.raises(TypeError):
+        store.put([service.GetInstanceRequest(name="x")])
+    with pytest.raises(ValueError):
+        store.put([instance.Instance()])
+
+
+def test_replace_reports_changes():
+    store = snapshot.SnapshotStore(":memory:")
+    store.put([_instance("a"), _instance("b"), _instance("c")])
+    assert store.last_sweep(PARENT) is None
+
+    diff = store.replace(
+        PARENT,
+        snapshot.INSTANCE,
+        [_instance("a"), _instance("b", seconds=2), _instance("d")],
+    )
+
+    def names(ids):
+        return [PARENT + "/instances/" + i for i in ids]
+
+    assert diff.added == names("d")
+    assert diff.removed == names("c")
+    assert diff.changed == names("b")
+    assert diff.unchanged == names("a")
+    assert [item.name for item in store.list(PARENT)] == names("abd")
+    assert store.last_sweep(PARENT) is not None
+
+
+def test_reads_do_not_wait_for_writes(tmp_path):
+    with snapshot.SnapshotStore(str(tmp_path / "snapshot.db")) as store:
+        store.put([_instance("a", machine_type="n1")])
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            # A write in progress: the lock is held and a transaction is open.
+            with store._lock, store._db:
+                store._db.execute("DELETE FROM records")
+                read = executor.submit(store.get, PARENT + "/instances/a")
+                assert read.result(timeout=5).machine_type == "n1"
+            assert executor.submit(store.get, PARENT + "/instances/a").result() is None
+
+        assert len(store) == 0
+
+
+def test_replace_keeps_newer_records():
+    store = snapshot.SnapshotStore(":memory:")
+    store.put([_instance("a", seconds=3, machine_type="n2")])
+
+    diff = store.replace(
+        PARENT, snapshot.INSTANCE, [_instance("a", seconds=2, machine_type="n1")]
+    )
+
+    assert diff.changed == []
+    assert diff.unchanged == [PARENT + "/instances/a"]
+    assert store.get(PARENT + "/instances/a").machine_type == "n2"
+
+
+def test_readers_of_exited_threads_are_closed(tmp_path):
+    with snapshot.SnapshotStore(str(tmp_path / "snapshot.db")) as store:
+        for _ in range(5):
+            thread = threading.Thread(target=len, args=(store,))
+            thread.start()
+            thread.join()
+        assert len(store._readers) == 1
+
+        assert len(store) == 0
+        assert list(store._readers) == [threading.current_thread()]
+
+
+def test_reconcile_in_background():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    store = snapshot.SnapshotStore(":memory:")
+    store.put([_instance("stale")])
+
+    with mock.patch.object(type(client._transport.list_instances), "__call__") as call:
+        call.side_effect = (
+            service.ListInstancesResponse(
+                instances=[_instance("a")],
+                next_page_token="next",
+            ),
+            service.ListInstancesResponse(instances=[_instance("b")]),
+        )
+        diffs = store.start_reconcile(client, [PARENT]).result(timeout=5)
+
+    diff = diffs[PARENT, snapshot.INSTANCE]
+    assert len(diff.added) == 2
+    assert diff.removed == [PARENT + "/instances/stale"]
+    assert len(store) == 2
+
+
+def test_failed_sweep_deletes_nothing():
+    client = mock.Mock()
+
+    def pages(request):
+        yield _instance("a")
+        raise exceptions.ServiceUnavailable("down")
+
+    client.list_instances.side_effect = pages
+    store = snapshot.SnapshotStore(":memory:")
+    store.put([_instance("a"), _instance("b")])
+
+    with pytest.raises(exceptions.ServiceUnavailable):
+        store.start_reconcile(client, [PARENT]).result(timeout=5)
+    assert len(store) == 2
+
+
+def test_stored_fingerprint_matches():
+    store = snapshot.SnapshotStore(":memory:")
+    record = _instance("a", labels={"b": "1", "a": "2"})
+    store.put([record])
+    (stored,) = store._db.execute("SELECT fingerprint FROM records").fetchone()
+    assert stored == fingerprint.fingerprint(record)
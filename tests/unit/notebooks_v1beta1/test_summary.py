@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pickle
+
+import pytest
+
+from google.cloud.notebooks_v1beta1.services.notebook_service import summary
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+
+
+def _make_instance(i):
+    return instance.Instance(
+        name="projects/p/locations/l/instances/i{0}".format(i),
+        state=instance.Instance.State.ACTIVE,
+        machine_type="n1-standard-4",
+        accelerator_config=instance.Instance.AcceleratorConfig(
+            type=instance.Instance.AcceleratorType.NVIDIA_TESLA_T4,
+            core_count=1,
+        ),
+        service_account="sa@p.iam.gserviceaccount.com",
+        network="projects/p/global/networks/default",
+        subnet="projects/p/regions/r/subnetworks/default",
+        vm_image=environment.VmImage(project="deeplearning", image_family="tf"),
+        labels={"team": "ml", "env": "prod"},
+        metadata={"k": "v" * 100},
+        create_time=timestamp.Timestamp(seconds=1600000000, nanos=5),
+        update_time=timestamp.Timestamp(seconds=1600000001),
+    )
+
+
+def test_from_instance():
+    s = summary.InstanceSummary.from_instance(_make_instance(0))
+
+    assert s.name == "projects/p/locations/l/instances/i0"
+    assert s.state == instance.Instance.State.ACTIVE
+    assert s.state_name == "ACTIVE"
+    assert s.machine_type == "n1-standard-4"
+    assert s.accelerator_type == instance.Instance.AcceleratorType.NVIDIA_TESLA_T4
+    assert s.accelerator_core_count == 1
+    assert s.image_project == "deeplearning"
+    assert s.image == "tf"
+    assert s.labels == (("env", "prod"), ("team", "ml"))
+    assert s.label_dict == {"env": "prod", "team": "ml"}
+    assert s.create_time == 1600000000 * 10**9 + 5
+    assert s.update_time == 1600000001 * 10**9
+
+
+def test_container_image():
+    s = summary.InstanceSummary.from_instance(
+        instance.Instance(
+            container_image=environment.ContainerImage(repository="gcr.io/r", tag="t")
+        )
+    )
+    assert s.image_project == "gcr.io/r"
+    assert s.image == "t"
+
+
+def test_read_only():
+    s = summary.InstanceSummary(name="n")
+    with pytest.raises(AttributeError):
+        s.name = "other"
+    with pytest.raises(AttributeError):
+        del s.name
+    with pytest.raises(AttributeError):
+        s.extra = 1
+
+
+def test_equality_and_pickle():
+    a = summary.InstanceSummary.from_instance(_make_instance(1))
+    b = pickle.loads(pickle.dumps(a))
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != summary.InstanceSummary.from_instance(_make_instance(2))
+
+
+def test_summarize_shares_strings():
+    response = service.ListInstancesResponse(
+        instances=[_make_instance(i) for i in range(3)]
+    )
+    for source in (
+        response,
+        service.ListInstancesResponse.serialize(response),
+        [response, response],
+    ):
+        results = list(summary.summarize(source))
+        assert results[0] == summary.InstanceSummary.from_instance(_make_instance(0))
+        assert results[0].machine_type is results[1].machine_type
+        assert results[0].labels[0][0] is results[2].labels[0][0]
+
+    assert len(list(summary.summarize([response, response]))) == 6
+
+
+def test_summarize_custom_intern():
+    seen = []
+
+    def intern(value):
+        seen.append(value)
+        return value
+
+    list(
+        summary.summarize(
+            service.ListInstancesResponse(instances=[_make_instance(0)]), intern=intern
+        )
+    )
+    assert "n1-standard-4" in seen
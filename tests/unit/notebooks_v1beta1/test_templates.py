@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+import pytest
+
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import coercion
+from google.cloud.notebooks_v1beta1.services.notebook_service import templates
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.longrunning import operations_pb2
+
+
+def _template():
+    return templates.RequestTemplate(
+        service.CreateInstanceRequest,
+        parent="projects/p/locations/l",
+        instance=instance.Instance(
+            machine_type="n1-standard-4",
+            vm_image=environment.VmImage(project="p", image_family="f"),
+            labels={"team": "ml", "env": "dev"},
+        ),
+    )
+
+
+def test_request_merges_varying_fields():
+    template = _template()
+    request = template.request(
+        instance_id="nb-1", instance={"labels": {"env": "prod"}, "subnet": "s"}
+    )
+
+    expected = service.CreateInstanceRequest(
+        parent="projects/p/locations/l",
+        instance_id="nb-1",
+        instance=instance.Instance(
+            machine_type="n1-standard-4",
+            vm_image=environment.VmImage(project="p", image_family="f"),
+            labels={"team": "ml", "env": "prod"},
+            subnet="s",
+        ),
+    )
+    assert request.message() == expected
+    assert request == expected
+    assert request.payload.startswith(template.payload)
+
+
+def test_request_fields_are_readable():
+    request = _template().request(instance_id="nb-1")
+    assert request.instance_id == "nb-1"
+    assert request.parent == "projects/p/locations/l"
+    assert request.instance.machine_type == "n1-standard-4"
+    assert getattr(request, "name", None) is None
+    with pytest.raises(AttributeError):
+        request._missing
+
+
+def test_serializer_sends_payload():
+    serialize = templates.serializer(service.CreateInstanceRequest)
+    request = _template().request(instance_id="nb-1")
+    assert serialize(request) is request.payload
+    message = service.CreateInstanceRequest(instance_id="x")
+    assert serialize(message) == service.CreateInstanceRequest.serialize(message)
+
+
+def test_coerce_checks_prepared_type():
+    request = _template().request(instance_id="nb-1")
+    assert coercion.coerce(service.CreateInstanceRequest, request) is request
+    with pytest.raises(TypeError):
+        coercion.coerce(service.GetInstanceRequest, request)
+
+
+def test_client_sends_prepared_request():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = _template().request(instance_id="nb-1")
+
+    with mock.patch.object(type(client._transport.create_instance), "__call__") as call:
+        call.return_value = operations_pb2.Operation(name="operations/op")
+        client.create_instance(request=request)
+
+    args, kwargs = call.call_args
+    assert args[0] is request
+    assert (
+        "x-goog-request-params",
+        "parent=projects/p/locations/l",
+    ) in kwargs["metadata"]
+
+
+def test_read_method_accepts_prepared_request():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = templates.RequestTemplate(service.GetInstanceRequest).request(
+        name="projects/p/locations/l/instances/nb"
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name=request.name)
+        response = client.get_instance(request=request)
+
+    assert response.name == request.name
+    assert call.call_args[0][0] is request
+
+
+@pytest.mark.parametrize("coalesce_reads", [True, False])
+def test_paged_method_accepts_prepared_request(coalesce_reads):
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(), coalesce_reads=coalesce_reads
+    )
+    template = templates.RequestTemplate(service.ListInstancesRequest, page_size=1)
+    request = template.request(parent="projects/p/locations/l")
+
+    with mock.patch.object(type(client._transport.list_instances), "__call__") as call:
+        call.side_effect = [
+            service.ListInstancesResponse(
+                instances=[instance.Instance(name="a")], next_page_token="t"
+            ),
+            service.ListInstancesResponse(instances=[instance.Instance(name="b")]),
+        ]
+        names = [item.name for item in client.list_instances(request=request)]
+
+    assert names == ["a", "b"]
+    later = call.call_args_list[1][0][0]
+    assert (later.parent, later.page_size, later.page_token) == (
+        "projects/p/locations/l",
+        1,
+        "t",
+    )
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+import pytest
+
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import timestamps
+from google.cloud.notebooks_v1beta1.types import environment
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+
+
+def _instance(seconds, nanos=0):
+    return instance.Instance(
+        create_time=timestamp.Timestamp(seconds=seconds, nanos=nanos),
+        update_time=timestamp.Timestamp(seconds=seconds + 1),
+    )
+
+
+def test_epoch_nanos_columns_from_page():
+    page = service.ListInstancesResponse(
+        instances=[_instance(10, 5), instance.Instance(), _instance(20)]
+    )
+    columns = timestamps.epoch_nanos_columns(page, ("create_time", "update_time"))
+
+    assert list(columns["create_time"]) == [
+        10 * 10**9 + 5,
+        timestamps.NAT,
+        20 * 10**9,
+    ]
+    assert list(columns["update_time"]) == [11 * 10**9, timestamps.NAT, 21 * 10**9]
+    assert columns["create_time"].typecode == "q"
+
+
+def test_epoch_nanos_from_messages():
+    metadata = [
+        service.OperationMetadata(end_time=timestamp.Timestamp(seconds=3)),
+        service.OperationMetadata.pb(
+            service.OperationMetadata(end_time=timestamp.Timestamp(seconds=4))
+        ),
+    ]
+    assert list(timestamps.epoch_nanos(metadata, "end_time")) == [
+        3 * 10**9,
+        4 * 10**9,
+    ]
+
+
+def test_epoch_nanos_from_environments():
+    page = service.ListEnvironmentsResponse(
+        environments=[
+            environment.Environment(create_time=timestamp.Timestamp(seconds=1))
+        ]
+    )
+    assert list(timestamps.epoch_nanos(page, "create_time")) == [10**9]
+
+
+def test_epoch_nanos_from_pager():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+    with mock.patch.object(type(client._transport.list_instances), "__call__") as call:
+        call.side_effect = (
+            service.ListInstancesResponse(
+                instances=[_instance(1)], next_page_token="abc"
+            ),
+            service.ListInstancesResponse(instances=[_instance(2), _instance(3)]),
+        )
+        pager = client.list_instances(request={})
+        values = timestamps.epoch_nanos(pager, "create_time")
+
+    assert list(values) == [10**9, 2 * 10**9, 3 * 10**9]
+
+
+def test_datetime64():
+    numpy = pytest.importorskip("numpy")
+    page = service.ListInstancesResponse(
+        instances=[_instance(10, 5), instance.Instance()]
+    )
+    values = timestamps.datetime64(page, "create_time")
+
+    assert values.dtype == numpy.dtype("datetime64[ns]")
+    assert values[0] == numpy.datetime64(10 * 10**9 + 5, "ns")
+    assert numpy.isnat(values[1])
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import concurrent.futures
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.notebooks_v1beta1.services.notebook_service import upgrades
+from google.cloud.notebooks_v1beta1.types import instance
+from google.cloud.notebooks_v1beta1.types import service
+
+
+def _client(upgradeable=(), failing=()):
+    client = mock.Mock()
+
+    def probe(request):
+        name = request["notebook_instance"]
+        return service.IsInstanceUpgradeableResponse(
+            upgradeable=name in upgradeable, upgrade_version="v2"
+        )
+
+    def upgrade(request):
+        op = mock.Mock()
+        op.done.return_value = True
+        op.metadata = service.OperationMetadata(target=request["name"], verb="update")
+        if request["name"] in failing:
+            op.result.side_effect = exceptions.InternalServerError("boom")
+        return op
+
+    client.is_instance_upgradeable.side_effect = probe
+    client.upgrade_instance.side_effect = upgrade
+    return client
+
+
+def test_run():
+    progress = []
+    client = _client(upgradeable={"a", "c", "d"})
+    orchestrator = upgrades.UpgradeOrchestrator(
+        client,
+        wave_size=2,
+        on_progress=lambda name, metadata: progress.append((name, metadata.verb)),
+    )
+
+    result = orchestrator.run(["a", "b", "c", instance.Instance(name="d"), "e"])
+
+    assert [len(wave.upgraded) for wave in result.waves] == [1, 2, 0]
+    assert result.upgraded == {"a": "v2", "c": "v2", "d": "v2"}
+    assert result.waves[0].not_upgradeable == ["b"]
+    assert result.waves[2].not_upgradeable == ["e"]
+    assert not result.halted
+    assert not result.failed
+    assert sorted(progress) == [("a", "update"), ("c", "update"), ("d", "update")]
+    assert client.is_instance_upgradeable.call_count == 5
+
+
+def test_failure_budget_halts_rollout():
+    client = _client(upgradeable={"a", "b", "c", "d"}, failing={"a"})
+    orchestrator = upgrades.UpgradeOrchestrator(client, wave_size=1)
+
+    result = orchestrator.run(["a", "b", "c"])
+
+    assert result.halted
+    assert result.pending == ["b", "c"]
+    assert list(result.failed) == ["a"]
+    assert isinstance(result.failed["a"], exceptions.InternalServerError)
+    client.upgrade_instance.assert_called_once_with(request={"name": "a"})
+
+
+def test_failure_budget_tolerates_failures():
+    client = _client(upgradeable={"a", "c"}, failing={"a"})
+    probe = client.is_instance_upgradeable.side_effect
+
+    def flaky_probe(request):
+        if request["notebook_instance"] == "b":
+            raise exceptions.ServiceUnavailable("retry later")
+        return probe(request)
+
+    client.is_instance_upgradeable.side_effect = flaky_probe
+    orchestrator = upgrades.UpgradeOrchestrator(client, wave_size=1, max_failures=2)
+
+    result = orchestrator.run(["a", "b", "c"])
+
+    assert not result.halted
+    assert sorted(result.failed) == ["a", "b"]
+    assert result.upgraded == {"c": "v2"}
+
+
+def test_progress_polling_and_timeout():
+    client = mock.Mock()
+    client.is_instance_upgradeable.return_value = service.IsInstanceUpgradeableResponse(
+        upgradeable=True
+    )
+    op = client.upgrade_instance.return_value
+    op.done.return_value = False
+    op.metadata = service.OperationMetadata(status_message="running")
+    progress = []
+    orchestrator = upgrades.UpgradeOrchestrator(
+        client,
+        operation_timeout=0.05,
+        poll_interval=0.01,
+        on_progress=lambda name, metadata: progress.append(metadata.status_message),
+    )
+
+    result = orchestrator.run(["a"])
+
+    assert isinstance(result.failed["a"], concurrent.futures.TimeoutError)
+    # Unchanged metadata is only reported once.
+    assert progress == ["running"]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        upgrades.UpgradeOrchestrator(mock.Mock(), wave_size=0)
+    assert upgrades.UpgradeOrchestrator(mock.Mock()).run([]).waves == []
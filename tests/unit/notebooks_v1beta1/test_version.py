@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+
+import mock
+
+from google.auth import credentials
+from google.cloud.notebooks_v1beta1.services.notebook_service import (
+    NotebookServiceClient,
+)
+from google.cloud.notebooks_v1beta1.services.notebook_service import version
+from google.cloud.notebooks_v1beta1.types import instance
+
+
+def test_package_version():
+    with mock.patch.object(version.metadata, "version", return_value="1.2.3") as get:
+        assert version.package_version() == "1.2.3"
+    get.assert_called_once_with("google-cloud-notebooks")
+
+    with mock.patch.object(
+        version.metadata,
+        "version",
+        side_effect=version.metadata.PackageNotFoundError("x"),
+    ):
+        assert version.package_version() is None
+
+
+def test_client_info_is_created_once():
+    with mock.patch.object(version, "_client_info", None):
+        with mock.patch.object(version, "package_version", return_value="1.2.3"):
+            info = version.client_info()
+            assert version.client_info() is info
+        assert info.gapic_version == "1.2.3"
+
+
+def test_client_info_is_lazy():
+    code = (
+        "from google.cloud.notebooks_v1beta1.services.notebook_service import client\n"
+        "from google.cloud.notebooks_v1beta1.services.notebook_service import version\n"
+        "print(version._client_info is None)\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    assert output.strip() == b"True"
+
+
+def test_rpcs_send_client_info():
+    client = NotebookServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(type(client._transport.get_instance), "__call__") as call:
+        call.return_value = instance.Instance(name="x")
+        client.get_instance(request={"name": "x"})
+
+    _, kwargs = call.call_args
+    user_agent = dict(kwargs["metadata"])["x-goog-api-client"]
+    assert user_agent == version.client_info().to_grpc_metadata()[1]